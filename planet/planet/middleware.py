@@ -4,13 +4,39 @@ from django.utils import translation
 from django.utils.cache import patch_vary_headers
 from django.conf import settings
 from django.core.cache import cache
-from google.cloud import translate_v2 as translate
+import google.auth
+from google.auth.transport.requests import Request as GoogleAuthRequest
+
+from planet_app import http_client
+
+GOOGLE_TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+GOOGLE_TRANSLATE_SCOPE = "https://www.googleapis.com/auth/cloud-translation"
+_google_credentials = None
+
+
+def _google_auth():
+    # API key if configured, else the application default credentials the translate client library used
+    global _google_credentials
+    key = getattr(settings, "GOOGLE_TRANSLATE_API_KEY", "")
+    if key:
+        return {"params": {"key": key}}
+    if _google_credentials is None:
+        # Raises DefaultCredentialsError when neither is configured
+        _google_credentials, _ = google.auth.default(scopes=[GOOGLE_TRANSLATE_SCOPE])
+    if not _google_credentials.valid:
+        _google_credentials.refresh(GoogleAuthRequest())
+    return {"headers": {"Authorization": f"Bearer {_google_credentials.token}"}}
 
 
 def google_translate(text, target_lang, source_lang="en"):
-    translate_client = translate.Client()
-    result = translate_client.translate(text, target_language=target_lang, source_language=source_lang, format_="html")
-    return result["translatedText"]
+    # Translation REST API through the shared outbound client (pooling, timeout, circuit breaker)
+    response = http_client.post(
+        GOOGLE_TRANSLATE_URL,
+        json={"q": text, "target": target_lang, "source": source_lang, "format": "html"},
+        **_google_auth(),
+    )
+    response.raise_for_status()
+    return response.json()["data"]["translations"][0]["translatedText"]
 
 LANG_COOKIE = getattr(settings, "LANGUAGE_COOKIE_NAME", "django_language")
 SOURCE_LANG = getattr(settings, "SOURCE_LANGUAGE", "en")
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'planet_app.fx.CurrencyCookieMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     # 'planet.middleware.AutoTranslateMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -116,6 +117,33 @@ DATABASES = {
 }
 
 
+# Caches
+# "shared" is visible to every worker process on the host (FX rates and other
+# cross-worker state); "default" stays per-process.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('SHARED_CACHE_DIR', os.path.join(BASE_DIR, 'cache')),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    # Rate-limit buckets: written on every allowed request, so they are kept (and culled) apart
+    # from the FX, version and blocklist keys in 'shared'. An evicted bucket is simply full again.
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('RATE_LIMIT_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'ratelimit')),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+FX_CACHE_ALIAS = 'shared'
+# Rate source; use 'planet_app.fx_providers.FileFxProvider' with FX_PROVIDER_FILE for tests/offline runs
+FX_PROVIDER = os.getenv('FX_PROVIDER', 'planet_app.fx_providers.FixerProvider')
+FX_PROVIDER_FILE = os.getenv('FX_PROVIDER_FILE', os.path.join(BASE_DIR, 'fx_rates.json'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -168,8 +196,73 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True').lower() in ('1', 'true', 'yes
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', '587'))
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+# e.g. 'django.core.mail.backends.console.EmailBackend' to point tests at a local stand-in
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '20'))
+LEAD_NOTIFY_FROM = 'info@planetsproperties.com'
+LEAD_NOTIFY_TO = ['sales@primeplanetsproperties.com']
+
+# Leadrat CRM. Point LEADRAT_URL at `manage.py leadrat_standin` for local runs.
+LEADRAT_URL = os.getenv('LEADRAT_URL', 'https://connect.leadrat.com/api/v1/integration/Website')
+LEADRAT_API_KEY = os.getenv('LEADRAT_API_KEY', 'NDdmMjA4NGItNWQzZi00ZmJhLTk5MGUtZTY1ZTQwNDc0OGU4')
+LEADRAT_TIMEOUT = 10
+
+# Outbound HTTP (planet_app.http_client): default (connect, read) timeout, pool size per
+# host, and circuit breaker (consecutive failures before opening, seconds before a trial call)
+HTTP_CLIENT_TIMEOUT = (3.05, 10)
+HTTP_CLIENT_POOL_SIZE = 10
+HTTP_CLIENT_BREAKER_THRESHOLD = 5
+HTTP_CLIENT_BREAKER_RESET = 30
+# Google Translate API key; when empty the middleware authenticates with the application
+# default credentials (GOOGLE_APPLICATION_CREDENTIALS), as the client library did
+GOOGLE_TRANSLATE_API_KEY = os.getenv('GOOGLE_TRANSLATE_API_KEY', '')
+
+# Token-bucket budgets per endpoint as (burst, seconds): `burst` requests at once, refilled
+# over `seconds`. Applied per client IP (and per submitted email for the contact form).
+RATE_LIMITS = {
+    'send_email': (5, 600),
+    'search': (30, 60),
+}
+
+# Seconds during which a repeated lead (same email, phone, property and message) is not dispatched again
+SUBMISSION_DEDUP_WINDOW = 600
+
+# Spam scoring (manage.py train_spam_model writes the model): submissions at or above this
+# spam probability are rejected before dispatch
+SPAM_MODEL_PATH = os.getenv('SPAM_MODEL_PATH', str(BASE_DIR / 'spam_model.json'))
+SPAM_REJECT_THRESHOLD = float(os.getenv('SPAM_REJECT_THRESHOLD', '0.99'))
+
+# Outbox (manage.py run_outbox): delivery attempts before a message is dead-lettered,
+# and the backoff base/cap in seconds
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE = 30
+OUTBOX_BACKOFF_MAX = 6 * 60 * 60
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Video transcoding (HLS ladder + poster frame for homepage videos)
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = os.getenv('FFPROBE_BINARY', 'ffprobe')
+
+# Static export of public pages (manage.py export_static_site). Pages are rendered per
+# language in the base currency (AED); nginx serves STATIC_EXPORT_ROOT/<lang>/<path>/index.html
+# and falls back to Django, which also handles every visitor who picked another currency
+# (CURRENCY_COOKIE_NAME is set exactly then) and every request with a query string (filtered
+# or sorted listings, which were exported unfiltered), e.g.
+#   map $http_accept_language $accept_lang { default en; ~*^ar ar; }
+#   map $cookie_django_language $lang { default $accept_lang; en en; ar ar; }
+#   map $cookie_currency $currency_dir { default /-dynamic-; "" /$lang; AED /$lang; }
+#   map $args $export_dir { default /-dynamic-; "" $currency_dir; }
+#   location / { root <STATIC_EXPORT_ROOT>; try_files $export_dir$uri/index.html @django; }
+STATIC_EXPORT_ROOT = os.getenv('STATIC_EXPORT_ROOT', os.path.join(BASE_DIR, 'static_export'))
+STATIC_EXPORT_HOST = 'primeplanetsproperties.com'
+CURRENCY_COOKIE_NAME = 'currency'
+
+# Client IP resolution. X-Forwarded-For is only honoured for hops arriving from these
+# addresses/ranges (comma-separated in the env), e.g. the nginx in front of gunicorn.
+TRUSTED_PROXIES = [p.strip() for p in os.getenv('TRUSTED_PROXIES', '127.0.0.1,::1').split(',') if p.strip()]
+# Optional offline country lookup (MaxMind GeoLite2-Country .mmdb, needs the geoip2 package)
+GEOIP_COUNTRY_DB = os.getenv('GEOIP_COUNTRY_DB', os.path.join(BASE_DIR, 'geoip', 'GeoLite2-Country.mmdb'))
@@ -11,7 +11,13 @@ class AmenitiesSearch(admin.ModelAdmin):
 
 class ContactFormSearch(admin.ModelAdmin):
     search_fields = ['name', 'phone', 'email', 'ip']
-    list_display = ['name', 'phone', 'email', 'ip', 'submitted_on']
+    list_display = ['name', 'phone', 'email', 'ip', 'submitted_on', 'crm_status', 'is_duplicate']
+
+
+class OutboxMessageSearch(admin.ModelAdmin):
+    search_fields = ['contact__email', 'last_error']
+    list_display = ['id', 'kind', 'status', 'attempts', 'next_attempt_at', 'contact', 'created_on']
+    list_filter = ['kind', 'status']
 
 
 class ProjectSearch(AdminVideoMixin, admin.ModelAdmin):
@@ -65,6 +71,7 @@ admin.site.register(BlockedName)
 admin.site.register(DailyFxRates)
 admin.site.register(BlockedWord)
 admin.site.register(ContactForm, ContactFormSearch)
+admin.site.register(OutboxMessage, OutboxMessageSearch)
 # admin.site.register(Pages, PagesSearch)
 admin.site.register(Blog, BlogSearch)
 admin.site.register(Videos, VideosSearch)
@@ -2,9 +2,13 @@ from django.apps import AppConfig
 
 
 class PlanetAppConfig(AppConfig):
+    default = True
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'planet_app'
 
+    def ready(self):
+        from . import signals  # noqa: F401
+
 
 class CoreConfig(AppConfig):
     name = "planet_app"
@@ -0,0 +1,138 @@
+# archive.py
+# Cold storage for ContactForm. `manage.py archive_submissions` moves rows older than
+# SUBMISSIONS_ARCHIVE_AFTER_DAYS into one gzip-compressed JSONL file per month under
+# SUBMISSIONS_ARCHIVE_DIR and deletes them in batches; DailyLeadStats keeps their counts
+# (rows from before the rollup are counted into it first, see lead_stats.backfill).
+# The submissions dashboard reads an archived month back on demand.
+import gzip
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import lead_stats
+from .models import ContactForm
+from .submissions import PAGE_SIZE
+
+# ----- Settings -----
+ARCHIVE_DIR = getattr(settings, "SUBMISSIONS_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "data", "submissions"))
+ARCHIVE_AFTER_DAYS = getattr(settings, "SUBMISSIONS_ARCHIVE_AFTER_DAYS", 365)
+BATCH_SIZE = 1000
+
+UNDATED = "undated"  # rows saved before submitted_on existed
+_MONTH = re.compile(r"^(\d{4}-\d{2}|undated)$")
+
+
+def month_path(month) -> str:
+    return os.path.join(ARCHIVE_DIR, f"{month}.jsonl.gz")
+
+
+def months() -> list:
+    """Archived months ('2024-05', ..., newest first), plus 'undated' if present."""
+    try:
+        names = os.listdir(ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    found = {name[:-len(".jsonl.gz")] for name in names if name.endswith(".jsonl.gz")}
+    dated = sorted((m for m in found if _MONTH.match(m) and m != UNDATED), reverse=True)
+    return dated + [UNDATED] if UNDATED in found else dated
+
+
+def _month_of(submitted_on) -> str:
+    return timezone.localtime(submitted_on).strftime("%Y-%m") if submitted_on else UNDATED
+
+
+# ----- Archiving -----
+def cutoff(days=ARCHIVE_AFTER_DAYS):
+    """Start of the month `days` ago, so only whole months are archived."""
+    day = timezone.localdate() - timedelta(days=days)
+    return timezone.make_aware(datetime(day.year, day.month, 1))
+
+
+def archive(before, batch_size=BATCH_SIZE, dry_run=False) -> dict:
+    """
+    Move ContactForm rows submitted before `before` (and undated rows) to the monthly files,
+    oldest id first. Each batch is appended to its files as a new gzip member, then deleted.
+    Returns {month: rows}.
+    """
+    fields = [f.attname for f in ContactForm._meta.concrete_fields]
+    old = ContactForm.objects.filter(Q(submitted_on__lt=before) | Q(submitted_on__isnull=True)).order_by("id")
+    counts = defaultdict(int)
+    if dry_run:
+        for submitted_on in old.values_list("submitted_on", flat=True).iterator(chunk_size=batch_size):
+            counts[_month_of(submitted_on)] += 1
+        return dict(counts)
+
+    # Deleted rows can no longer be counted, so anything the rollup has not seen is counted now
+    lead_stats.backfill()
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    last_id = 0
+    while True:
+        batch = list(old.filter(id__gt=last_id).values(*fields)[:batch_size])
+        if not batch:
+            break
+        by_month = defaultdict(list)
+        for row in batch:
+            by_month[_month_of(row["submitted_on"])].append(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+        for month, lines in by_month.items():
+            with gzip.open(month_path(month), "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            counts[month] += len(lines)
+        # Written before deleting: an interrupted run can repeat a row in the archive (reads
+        # keep one copy per id) but never lose one
+        last_id = batch[-1]["id"]
+        with transaction.atomic():
+            ContactForm.objects.filter(id__in=[row["id"] for row in batch]).delete()
+    return dict(counts)
+
+
+# ----- Search -----
+def _matches(row, filters) -> bool:
+    for name in ("email", "phone", "ip", "subject"):
+        if name in filters and row.get(name) != filters[name]:
+            return False
+    if "date_from" in filters or "date_to" in filters:
+        if row["submitted_on"] is None:
+            return False
+        day = timezone.localdate(row["submitted_on"])
+        if day < filters.get("date_from", day) or day > filters.get("date_to", day):
+            return False
+    return True
+
+
+def search(month, filters) -> list:
+    """Rows of an archived month matching the dashboard `filters`, newest first; [] for an unknown month."""
+    if not _MONTH.match(month or "") or not os.path.exists(month_path(month)):
+        return []
+    rows = {}
+    with gzip.open(month_path(month), "rt", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            row["submitted_on"] = parse_datetime(row["submitted_on"]) if row["submitted_on"] else None
+            if _matches(row, filters):
+                rows[row["id"]] = row
+    return sorted(rows.values(), key=lambda row: (row["submitted_on"] is not None, row["submitted_on"] or 0, row["id"]), reverse=True)
+
+
+def page(month, filters, after=None, before=None, size=None) -> dict:
+    """submissions.page() for an archived month; the cursors are row offsets."""
+    size = size or PAGE_SIZE
+    rows = search(month, filters)
+    try:
+        start = int(after) if after else max(int(before) - size, 0) if before else 0
+    except ValueError:
+        start = 0
+    end = start + size
+    return {
+        "rows": rows[start:end],
+        "previous": str(start) if start > 0 else None,
+        "next": str(end) if end < len(rows) else None,
+    }
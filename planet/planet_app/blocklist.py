@@ -0,0 +1,336 @@
+# blocklist.py
+# In-memory spam blocklists, compiled once per worker from the Blocked* tables.
+# Each compiled index carries a version key in the shared cache: signals bump it when the
+# table changes, and every worker rebuilds its copy on the next check.
+import csv
+import io
+import ipaddress
+import re
+import threading
+import time
+import unicodedata
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from .models import BlockedEmail, BlockedIP, BlockedName, BlockedWord
+
+# ----- Settings -----
+CACHE_ALIAS = getattr(settings, "BLOCKLIST_CACHE_ALIAS", "shared")
+CHECK_EVERY = getattr(settings, "BLOCKLIST_CHECK_EVERY", 5)  # seconds between shared version checks
+
+
+class VersionedIndex:
+    """
+    A structure built from the database, reused by every request in this worker and
+    rebuilt when the shared version key moves (checked at most every CHECK_EVERY seconds).
+    """
+
+    def __init__(self, key, build):
+        self.key = key
+        self.build = build
+        self.value = None
+        self.version = None
+        self.checked = 0.0
+        self.lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self.value is not None and now - self.checked < CHECK_EVERY:
+            return self.value
+        with self.lock:
+            if self.value is not None and now - self.checked < CHECK_EVERY:
+                return self.value
+            version = caches[CACHE_ALIAS].get_or_set(self.key, 1, None)
+            if self.value is None or version != self.version:
+                self.value = self.build()
+                self.version = version
+            self.checked = now
+        return self.value
+
+    def bump(self):
+        """Call after the source table changed: this worker rebuilds now, the others on their next check."""
+        cache = caches[CACHE_ALIAS]
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, 1, None)
+        with self.lock:
+            self.value = None
+
+
+# ----- Normalization -----
+# Diacritics (harakat, hamza above/below, superscript alef) go with the other combining
+# marks under NFKD; tatweel is a letter-stretching character and is dropped too
+_TATWEEL = "\u0640"
+_ARABIC_LETTERS = str.maketrans({
+    "ٱ": "ا", "ى": "ي", "ة": "ه",
+    # Arabic-Indic and Persian digits
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06f0 + i): str(i) for i in range(10)},
+})
+# Leet digits are read as letters only inside words that have letters ('fr33', not '4');
+# symbols only between word characters ('gr@tis', not a trailing '!')
+_LEET_DIGITS = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t"})
+_LEET_SYMBOLS = {"@": "a", "$": "s", "!": "i"}
+_INNER_SYMBOL = re.compile(r"(?<=\w)[@$!](?=\w)")
+_TOKEN = re.compile(r"\w+")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Case-, accent- and Arabic-variant-folded text with every run of non-word characters as
+    one space, padded with spaces so patterns only match whole words.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold()).replace(_TATWEEL, "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).translate(_ARABIC_LETTERS)
+    return " " + _SEPARATORS.sub(" ", text).strip() + " "
+
+
+def _deleet_word(match) -> str:
+    word = match.group()
+    return word.translate(_LEET_DIGITS) if any(c.isalpha() for c in word) else word
+
+
+def variants(text: str) -> set:
+    """
+    The normalized text plus its de-leeted form ('fr33 m0ney!' -> 'free money'). Only
+    submitted text is de-leeted; blocked patterns are matched as stored.
+    """
+    deleeted = _TOKEN.sub(_deleet_word, _INNER_SYMBOL.sub(lambda m: _LEET_SYMBOLS[m.group()], text))
+    return {normalize(text), normalize(deleeted)}
+
+
+# ----- Blocked words: Aho-Corasick -----
+class WordMatcher:
+    """Aho-Corasick automaton over normalized blocked words and phrases."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        for original in patterns:
+            key = normalize(original)
+            if key.strip():
+                self._add(key, original)
+        self._link()
+
+    def _add(self, key, original):
+        node = 0
+        for ch in key:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            node = nxt
+        if original not in self.out[node]:
+            self.out[node] += (original,)
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                # Depth-1 nodes resolve to themselves through the root; they fail to the root
+                self.fail[nxt] = 0 if target == nxt else target
+                self.out[nxt] += tuple(w for w in self.out[self.fail[nxt]] if w not in self.out[nxt])
+
+    def search(self, text: str) -> set:
+        """Blocked words/phrases (as stored) found in `text`."""
+        found = set()
+        goto, fail, out = self.goto, self.fail, self.out
+        for variant in variants(text):
+            node = 0
+            for ch in variant:
+                while node and ch not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(ch, 0)
+                if out[node]:
+                    found.update(out[node])
+        return found
+
+
+def _build_word_matcher():
+    return WordMatcher(BlockedWord.objects.values_list("word", flat=True).iterator())
+
+
+blocked_words = VersionedIndex("blocklist:words:version", _build_word_matcher)
+
+
+def find_blocked_words(text) -> set:
+    """Blocked words or phrases contained in `text`; empty when it is clean."""
+    if not text:
+        return set()
+    return blocked_words.get().search(text)
+
+
+# ----- Blocked IPs: binary prefix trie -----
+def parse_network(value):
+    """ip_network for '203.0.113.7', '203.0.113.0/24' or '2001:db8::/32' (host bits ignored); None if invalid."""
+    try:
+        return ipaddress.ip_network(str(value).strip(), strict=False)
+    except ValueError:
+        return None
+
+
+class PrefixTrie:
+    """
+    One binary trie per address family. A node is [child0, child1, blocked]; a lookup walks
+    the address bits from the top and stops at the first blocked node, so its cost is bounded
+    by the longest stored prefix rather than by the number of ranges.
+    """
+
+    def __init__(self, networks=()):
+        self.roots = {4: [None, None, False], 6: [None, None, False]}
+        for network in networks:
+            self.add(network)
+
+    def add(self, network):
+        node = self.roots[network.version]
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        for i in range(network.prefixlen):
+            if node[2]:
+                # A shorter covering range is already blocked
+                return
+            bit = (bits >> (width - 1 - i)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, False]
+            node = node[bit]
+        node[2] = True
+        node[0] = node[1] = None
+
+    def __contains__(self, address) -> bool:
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        node = self.roots[address.version]
+        bits = int(address)
+        shift = address.max_prefixlen - 1
+        while node is not None:
+            if node[2]:
+                return True
+            if shift < 0:
+                return False
+            node = node[(bits >> shift) & 1]
+            shift -= 1
+        return False
+
+
+def _build_ip_trie():
+    networks = (
+        parse_network(ip if prefix_len is None else f"{ip}/{prefix_len}")
+        for ip, prefix_len in BlockedIP.objects.values_list("ip", "prefix_len").iterator()
+    )
+    return PrefixTrie(n for n in networks if n is not None)
+
+
+blocked_ips = VersionedIndex("blocklist:ips:version", _build_ip_trie)
+
+
+def is_ip_blocked(ip) -> bool:
+    """True when `ip` falls in any blocked address or range; unparsable input is not blocked."""
+    try:
+        address = ipaddress.ip_address(str(ip).strip())
+    except ValueError:
+        return False
+    return address in blocked_ips.get()
+
+
+# ----- Bulk import -----
+IMPORT_CHUNK = 500  # keeps each `__in` lookup under SQLite's default variable limit
+
+
+def _clean_email(value):
+    # Stored as given, like create_blocked_email: check_email matches exactly
+    value = value.strip()
+    try:
+        validate_email(value)
+    except ValidationError:
+        return None
+    return value
+
+
+def _clean_text(value):
+    # Same form as create_blocked_word/create_blocked_name store
+    value = value.strip().lower()
+    return value if 0 < len(value) <= 200 else None
+
+
+def _clean_network(value):
+    network = parse_network(value)
+    return None if network is None else (str(network.network_address), network.prefixlen)
+
+
+# kind: (model, lookup fields, cleaner, in-memory index to rebuild)
+BLOCKLISTS = {
+    "email": (BlockedEmail, ("email",), _clean_email, None),
+    "ip": (BlockedIP, ("ip", "prefix_len"), _clean_network, blocked_ips),
+    "word": (BlockedWord, ("word",), _clean_text, blocked_words),
+    "name": (BlockedName, ("name",), _clean_text, None),
+}
+
+
+def read_entries(text, kind=None) -> list:
+    """
+    Entries from newline- or comma-separated text, or a CSV whose first column holds them.
+    A first row naming the column (e.g. 'email') is treated as a header.
+    """
+    entries = []
+    for row in csv.reader(io.StringIO(text)):
+        cells = [c.strip() for c in row if c.strip()]
+        if not cells:
+            continue
+        entries.append(cells[0])
+    if entries and kind and entries[0].lower() in (kind, *BLOCKLISTS[kind][1]):
+        entries = entries[1:]
+    return entries
+
+
+def bulk_block(kind, entries, chunk_size=IMPORT_CHUNK) -> dict:
+    """
+    Add `entries` to the `kind` blocklist with one lookup and one bulk insert per chunk.
+    Returns {'inserted', 'skipped' (already blocked or repeated), 'invalid'}.
+    """
+    model, fields, clean, index = BLOCKLISTS[kind]
+    stats = {"inserted": 0, "skipped": 0, "invalid": 0}
+    keys = []
+    seen = set()
+    for entry in entries:
+        key = clean(str(entry))
+        if key is None:
+            stats["invalid"] += 1
+        elif key in seen:
+            stats["skipped"] += 1
+        else:
+            seen.add(key)
+            keys.append(key)
+
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i:i + chunk_size]
+        if len(fields) == 1:
+            existing = set(model.objects.filter(**{f"{fields[0]}__in": chunk}).values_list(fields[0], flat=True))
+            new = [model(**{fields[0]: key}) for key in chunk if key not in existing]
+        else:
+            existing = set(model.objects.filter(ip__in=[ip for ip, _ in chunk]).values_list(*fields))
+            new = [model(ip=ip, prefix_len=prefix_len) for ip, prefix_len in chunk if (ip, prefix_len) not in existing]
+        # ignore_conflicts covers rows inserted concurrently since the lookup
+        model.objects.bulk_create(new, ignore_conflicts=True)
+        stats["inserted"] += len(new)
+        stats["skipped"] += len(chunk) - len(new)
+
+    if index is not None and stats["inserted"]:
+        # bulk_create sends no post_save, so rebuild explicitly
+        index.bump()
+    return stats
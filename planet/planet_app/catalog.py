@@ -0,0 +1,182 @@
+# catalog.py
+# Write path for a property's child rows (pricing, advantages, floors, amenities, images).
+# Each collection is diffed against what is stored so unchanged rows are left alone, and the
+# rest is written with bulk_create / bulk_update / one delete. These bypass the model signals,
+# so price columns are filled here and the project's exported pages are marked stale once.
+from . import fx
+from .models import Amenities, ProjectDetails, PropertyAdvantages, PropertyAmenities, PropertyFloors, PropertyImages, PropertyPricing
+from .static_export import DEPENDENCIES, mark_stale
+
+PRICING_FIELDS = ("property", "builtup", "carpet", "price")
+ADVANTAGE_FIELDS = ("title", "distance")
+FLOOR_FIELDS = ("name", "tag1", "tag2", "tag3", "tag4", "description")
+FLOOR_FILES = ("img", "pdf")
+
+
+def _sync(model, project, fields, rows, prepare=None, extra_fields=()) -> int:
+    """
+    Make the project's `model` children hold `rows` (dicts of `fields`), in order of id.
+    Rows are matched to stored children by position, so id order stays form order: a child
+    whose fields differ from its row is rewritten in place, extra rows are inserted after the
+    stored ones and leftover children deleted. Returns the number of rows written or deleted.
+    """
+    rows = list(rows)
+    stored = list(model.objects.filter(project=project).order_by("id"))
+    changed = []
+    for child, row in zip(stored, rows):
+        if any(getattr(child, f) != row.get(f) for f in fields):
+            for f in fields:
+                setattr(child, f, row.get(f))
+            changed.append(child)
+    created = [model(project=project, **{f: row.get(f) for f in fields}) for row in rows[len(stored):]]
+    removed = [child.id for child in stored[len(rows):]]
+    if prepare:
+        for child in changed + created:
+            prepare(child)
+
+    if changed:
+        model.objects.bulk_update(changed, list(fields) + list(extra_fields))
+    if created:
+        model.objects.bulk_create(created)
+    if removed:
+        model.objects.filter(id__in=removed).delete()
+    return len(changed) + len(created) + len(removed)
+
+
+def sync_pricing(project, rows) -> int:
+    return _sync(
+        PropertyPricing, project, PRICING_FIELDS, rows,
+        prepare=lambda child: fx.fill_price_columns(child, "price"),
+        extra_fields=fx.PRICE_COLUMNS.values(),
+    )
+
+
+def sync_advantages(project, rows) -> int:
+    return _sync(PropertyAdvantages, project, ADVANTAGE_FIELDS, rows)
+
+
+def _set_floor_files(floor, row) -> bool:
+    """Apply the row's 'img'/'pdf': uploads are stored now, strings are paths already in storage."""
+    changed = False
+    for f in FLOOR_FILES:
+        value = row.get(f)
+        if isinstance(value, str):
+            if getattr(floor, f).name != value:
+                setattr(floor, f, value)
+                changed = True
+        elif value:
+            # Stores the upload now; bulk writes do not run FileField.pre_save on update
+            getattr(floor, f).save(value.name, value, save=False)
+            changed = True
+    return changed
+
+
+def sync_floors(project, rows) -> int:
+    """
+    Floors carry ids from the edit form: rows with an 'id' of one of the project's floors update
+    it (only if a field or file changed), rows without one take over a floor of the same name
+    (imports) or are added, and floors not listed are removed. 'img'/'pdf' may be uploads,
+    which replace the stored files, or paths of files already in storage.
+    """
+    stored = {floor.id: floor for floor in PropertyFloors.objects.filter(project=project).order_by("id")}
+    by_name = {}
+    for floor in stored.values():
+        by_name.setdefault(floor.name, []).append(floor)
+    keep, changed, created = set(), [], []
+    for row in rows:
+        floor = stored.get(row.get("id"))
+        if floor is None and "id" not in row:
+            floor = next((f for f in by_name.get(row.get("name"), ()) if f.id not in keep), None)
+        if floor is None:
+            if not row.get("name"):
+                continue
+            floor = PropertyFloors(project=project)
+            created.append(floor)
+        else:
+            keep.add(floor.id)
+        dirty = any(getattr(floor, f) != row.get(f) for f in FLOOR_FIELDS)
+        for f in FLOOR_FIELDS:
+            setattr(floor, f, row.get(f))
+        if (_set_floor_files(floor, row) or dirty) and floor.id is not None:
+            changed.append(floor)
+
+    removed = [floor_id for floor_id in stored if floor_id not in keep]
+    if changed:
+        PropertyFloors.objects.bulk_update(changed, list(FLOOR_FIELDS) + list(FLOOR_FILES))
+    if created:
+        PropertyFloors.objects.bulk_create(created)
+    if removed:
+        PropertyFloors.objects.filter(id__in=removed).delete()
+    return len(changed) + len(created) + len(removed)
+
+
+def sync_amenities(project, amenity_ids) -> int:
+    """Link the project to exactly the existing amenities among `amenity_ids`."""
+    wanted = set(Amenities.objects.filter(id__in=amenity_ids).values_list("id", flat=True))
+    linked = set(PropertyAmenities.objects.filter(project=project).values_list("amenity_id", flat=True))
+    added = wanted - linked
+    dropped = linked - wanted
+    if added:
+        PropertyAmenities.objects.bulk_create([PropertyAmenities(project=project, amenity_id=i) for i in sorted(added)])
+    if dropped:
+        PropertyAmenities.objects.filter(project=project, amenity_id__in=dropped).delete()
+    return len(added) + len(dropped)
+
+
+def add_images(project, paths) -> int:
+    """Attach already-stored image files (paths relative to MEDIA_ROOT)."""
+    PropertyImages.objects.bulk_create([PropertyImages(project=project, img=path) for path in paths])
+    return len(paths)
+
+
+def save_children(project, pricing=None, advantages=None, floors=None, amenity_ids=None, images=()) -> dict:
+    """
+    Apply every given child collection (None leaves one untouched) and, if anything changed,
+    mark the project's exported pages stale. Call inside the transaction that saves `project`.
+    Returns {collection: rows written} for the collections that changed.
+    """
+    written = {}
+    if pricing is not None:
+        written["pricing"] = sync_pricing(project, pricing)
+    if advantages is not None:
+        written["advantages"] = sync_advantages(project, advantages)
+    if floors is not None:
+        written["floors"] = sync_floors(project, floors)
+    if amenity_ids is not None:
+        written["amenities"] = sync_amenities(project, amenity_ids)
+    if images:
+        written["images"] = add_images(project, images)
+    written = {name: n for name, n in written.items() if n}
+    if written:
+        # Images and prices also show on the listings, so the same pages as a project save
+        mark_stale(DEPENDENCIES[ProjectDetails](project))
+    return written
+
+
+def create_children(entries) -> int:
+    """
+    Children of projects that were just inserted (so have none yet), as one bulk_create per
+    model across all of them. `entries` are (project, children) pairs, children being a dict
+    with save_children's keyword names. Returns the number of rows inserted.
+    """
+    rows = {PropertyPricing: [], PropertyAdvantages: [], PropertyFloors: [], PropertyAmenities: [], PropertyImages: []}
+    for project, children in entries:
+        for row in children.get("pricing") or ():
+            pricing = PropertyPricing(project=project, **{f: row.get(f) for f in PRICING_FIELDS})
+            fx.fill_price_columns(pricing, "price")
+            rows[PropertyPricing].append(pricing)
+        for row in children.get("advantages") or ():
+            rows[PropertyAdvantages].append(PropertyAdvantages(project=project, **{f: row.get(f) for f in ADVANTAGE_FIELDS}))
+        for row in children.get("floors") or ():
+            if row.get("name"):
+                floor = PropertyFloors(project=project, **{f: row.get(f) for f in FLOOR_FIELDS})
+                _set_floor_files(floor, row)
+                rows[PropertyFloors].append(floor)
+        for amenity_id in sorted(set(children.get("amenity_ids") or ())):
+            rows[PropertyAmenities].append(PropertyAmenities(project=project, amenity_id=amenity_id))
+        for path in children.get("images") or ():
+            rows[PropertyImages].append(PropertyImages(project=project, img=path))
+    for model, objs in rows.items():
+        if objs:
+            model.objects.bulk_create(objs)
+    return sum(len(objs) for objs in rows.values())
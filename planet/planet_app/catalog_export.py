@@ -0,0 +1,148 @@
+# catalog_export.py
+# Full catalog dump: every ProjectDetails column (translations included) with its pricing,
+# advantages, floors, amenities and images. JSON Lines gives one nested object per property;
+# the CSV bundle is a zip with one CSV per table, linked by project_id. Both are generators
+# of bytes that read BATCH_SIZE ids at a time with values(), so memory stays bounded and a
+# StreamingHttpResponse or file can consume them. JSONL records can be fed back to import_catalog.
+import csv
+import io
+import json
+import zipfile
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from .models import ProjectDetails, PropertyAdvantages, PropertyAmenities, PropertyFloors, PropertyImages, PropertyPricing
+from .money import Money
+
+BATCH_SIZE = 500
+EXPORT_FORMATS = {"jsonl": "application/x-ndjson", "zip": "application/zip"}
+
+RELATED = {"city": "city__name", "builder": "builder__name", "broker": "broker__name"}
+PROJECT_COLUMNS = [f.attname for f in ProjectDetails._meta.concrete_fields if not f.is_relation]
+CHILDREN = {
+    "pricing": PropertyPricing,
+    "advantages": PropertyAdvantages,
+    "floors": PropertyFloors,
+}
+
+
+def _columns(model) -> list:
+    return [f.attname for f in model._meta.concrete_fields if f.name != "project"]
+
+
+class _Encoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, Money):
+            return str(o.to_decimal())
+        return super().default(o)
+
+
+def _value(value):
+    # CSV cells: lists joined as stored, prices as decimals
+    if isinstance(value, Money):
+        return str(value.to_decimal())
+    if isinstance(value, list):
+        return ",".join(value)
+    return value
+
+
+def _batches(queryset, batch_size):
+    """Lists of value dicts from `queryset`, `batch_size` ids at a time in id order."""
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).order_by("id")[:batch_size])
+        if not batch:
+            return
+        last_id = batch[-1]["id"]
+        if queryset.model is ProjectDetails:
+            # Related names under the keys import_catalog reads (an annotation cannot be named 'city')
+            for row in batch:
+                for key, path in RELATED.items():
+                    row[key] = row.pop(path)
+        yield batch
+
+
+def _projects():
+    return ProjectDetails.objects.values(*PROJECT_COLUMNS, *RELATED.values())
+
+
+def _grouped(queryset, project_ids) -> dict:
+    rows = {}
+    for row in queryset.filter(project_id__in=project_ids).order_by("project_id", "id"):
+        rows.setdefault(row.pop("project_id"), []).append(row)
+    return rows
+
+
+# ----- JSON Lines -----
+def jsonl_chunks(batch_size=BATCH_SIZE):
+    """One JSON object per property with nested children; one bytes chunk per batch of properties."""
+    child_values = {key: model.objects.values("project_id", *_columns(model)) for key, model in CHILDREN.items()}
+    amenity_values = PropertyAmenities.objects.values("project_id", "id", name=F("amenity__name"))
+    image_values = PropertyImages.objects.values("project_id", "id", "img")
+    for batch in _batches(_projects(), batch_size):
+        ids = [row["id"] for row in batch]
+        children = {key: _grouped(values, ids) for key, values in child_values.items()}
+        amenities = _grouped(amenity_values, ids)
+        images = _grouped(image_values, ids)
+        lines = []
+        for row in batch:
+            for key in CHILDREN:
+                row[key] = children[key].get(row["id"], [])
+            row["amenities"] = [amenity["name"] for amenity in amenities.get(row["id"], ())]
+            row["images"] = [image["img"] for image in images.get(row["id"], ())]
+            lines.append(json.dumps(row, cls=_Encoder, ensure_ascii=False))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# ----- Zipped CSV bundle -----
+class _Pipe:
+    """Write-only file for ZipFile that hands over what has been written so far."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _tables():
+    yield "projects.csv", _projects()
+    for key, model in CHILDREN.items():
+        yield f"{key}.csv", model.objects.values("id", "project_id", *[c for c in _columns(model) if c != "id"])
+    yield "amenities.csv", PropertyAmenities.objects.values("id", "project_id", "amenity_id", amenity_name=F("amenity__name"))
+    yield "images.csv", PropertyImages.objects.values("id", "project_id", "img")
+
+
+def zip_chunks(batch_size=BATCH_SIZE):
+    """A zip of one CSV per table (projects.csv, pricing.csv, ...), streamed one batch of rows at a time."""
+    pipe = _Pipe()
+    # ZipFile falls back to data descriptors on a stream it cannot seek
+    with zipfile.ZipFile(pipe, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for name, queryset in _tables():
+            with bundle.open(name, "w", force_zip64=True) as raw, io.TextIOWrapper(raw, encoding="utf-8", newline="") as text:
+                writer = csv.writer(text)
+                header = None
+                for batch in _batches(queryset, batch_size):
+                    if header is None:
+                        header = list(batch[0])
+                        writer.writerow(header)
+                    writer.writerows([_value(row[column]) for column in header] for row in batch)
+                    text.flush()
+                    yield pipe.take()
+                if header is None:
+                    writer.writerow(queryset.query.values_select + tuple(queryset.query.annotation_select))
+    yield pipe.take()
+
+
+def export_chunks(fmt="jsonl", batch_size=BATCH_SIZE):
+    return jsonl_chunks(batch_size) if fmt == "jsonl" else zip_chunks(batch_size)
@@ -0,0 +1,343 @@
+# catalog_import.py
+# Bulk import of ProjectDetails with their pricing, advantages, floors, amenities and images,
+# from CSV, XLSX (needs openpyxl), JSON Lines or a JSON array. Records are read as a stream
+# and validated one by one; each chunk is then written in one transaction: new projects with
+# one bulk_create per model, existing ones (matched by title slug) with one bulk_update and
+# catalog's diffed child writes. Cities, builders, brokers and amenities are matched by name
+# against maps loaded once per run. A dry run does the same writes and rolls them back.
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils.text import slugify
+from modeltranslation.translator import translator
+
+from . import catalog, fx
+from .models import (
+    Amenities, Brokers, Builder, Cities, ProjectDetails, PropertyAdvantages, PropertyFloors, PropertyImages, PropertyPricing,
+)
+from .static_export import DEPENDENCIES, mark_stale
+
+try:
+    import openpyxl
+except ImportError:  # optional dependency, only needed for .xlsx files
+    openpyxl = None
+
+CHUNK_SIZE = 200
+FORMATS = ("csv", "xlsx", "jsonl", "json")
+
+# Record keys: related objects by name, child collections, and the project's own fields
+RELATED = {"city": "city_id", "builder": "builder_id", "broker": "broker_id"}
+CHILDREN = {
+    "pricing": catalog.PRICING_FIELDS,
+    "advantages": catalog.ADVANTAGE_FIELDS,
+    "floors": catalog.FLOOR_FIELDS + catalog.FLOOR_FILES,
+}
+LISTS = ("amenities", "images")  # "|"-separated in CSV/XLSX cells
+# Read-only columns, present in catalog_export records, are accepted and ignored
+READ_ONLY = {"id", "slug", *fx.PRICE_COLUMNS.values()}
+PROJECT_FIELDS = {
+    f.name: f for f in ProjectDetails._meta.concrete_fields if f.name not in READ_ONLY | set(RELATED) and f.editable
+}
+_CHILD_COLUMNS = {
+    key: {f.attname for f in model._meta.concrete_fields}
+    for key, model in (("pricing", PropertyPricing), ("advantages", PropertyAdvantages), ("floors", PropertyFloors))
+}
+_TRANSLATED = {name: [f.name for f in fields] for name, fields in translator.get_options_for_model(ProjectDetails).all_fields.items()}
+
+
+# ----- Reading -----
+def _decode_cells(row) -> dict:
+    """A flat CSV/XLSX row as a record: empty cells dropped, JSON child cells and list cells split."""
+    record = {}
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue
+        key = key.strip()
+        if key in CHILDREN:
+            try:
+                value = json.loads(value)
+            except (TypeError, ValueError):
+                raise ValidationError(f"{key}: not a JSON list")
+        elif key in LISTS:
+            value = [part.strip() for part in str(value).split("|") if part.strip()]
+        record[key] = value
+    return record
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for number, row in enumerate(csv.DictReader(f), start=2):
+            yield number, row
+
+
+def _read_xlsx(path):
+    if openpyxl is None:
+        raise ValueError("reading .xlsx files needs openpyxl (pip install openpyxl)")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else None for cell in next(rows, ())]
+        for number, cells in enumerate(rows, start=2):
+            if any(cell is not None for cell in cells):
+                yield number, dict(zip(header, cells))
+    finally:
+        workbook.close()
+
+
+def read_records(path, fmt=None):
+    """
+    Yield (row number, record or ValidationError) from a catalog file; `fmt` defaults to the
+    file extension. JSON Lines and the spreadsheets are streamed, a JSON array is loaded whole.
+    """
+    fmt = fmt or path.rsplit(".", 1)[-1].lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    if fmt in ("csv", "xlsx"):
+        for number, row in (_read_csv(path) if fmt == "csv" else _read_xlsx(path)):
+            try:
+                yield number, _decode_cells(row)
+            except ValidationError as e:
+                yield number, e
+    elif fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError as e:
+                        yield number, ValidationError(f"invalid JSON: {e}")
+    else:
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("a .json catalog must be a list of objects")
+        yield from enumerate(records, start=1)
+
+
+# ----- Lookups -----
+class Lookups:
+    """Name maps for the related tables and the slug -> id map of existing projects, loaded once per run."""
+
+    def __init__(self):
+        self.city = self._by_name(Cities.objects.all())
+        self.builder = self._by_name(Builder.objects.all())
+        self.broker = self._by_name(Brokers.objects.all())
+        self.amenity = {name: obj.id for name, obj in self._by_name(Amenities.objects.all()).items()}
+        self.slugs = dict(ProjectDetails.objects.exclude(slug=None).values_list("slug", "id").iterator())
+        self.property_types = set(ProjectDetails.objects.values_list("property_type_2", flat=True).distinct())
+        self.seen = {}  # slug -> row number, to reject a title repeated in the file
+
+    @staticmethod
+    def _by_name(queryset) -> dict:
+        # Every language's name matches; translation fields are found through the model's options
+        model = queryset.model
+        names = [f.name for f in model._meta.concrete_fields if f.name == "name" or f.name.startswith("name_")]
+        found = {}
+        for obj in queryset:
+            for name in names:
+                value = getattr(obj, name)
+                if value:
+                    found.setdefault(value.strip().casefold(), obj)
+        return found
+
+    def resolve(self, kind, name):
+        if name in (None, ""):
+            return None
+        obj = getattr(self, kind).get(str(name).strip().casefold())
+        if obj is None:
+            raise ValidationError({kind: f"unknown {kind} {name!r}"})
+        return obj
+
+
+# ----- Building -----
+_BOOLEANS = {"yes": True, "y": True, "true": True, "no": False, "n": False, "false": False}
+_PRICE_SOURCES = {"project_price", *_TRANSLATED.get("project_price", ())}
+
+
+def _messages(error) -> str:
+    if hasattr(error, "error_dict"):
+        return "; ".join(f"{key}: {' '.join(messages)}" for key, messages in error.message_dict.items())
+    return "; ".join(error.messages)
+
+
+def _field_value(field, value):
+    if isinstance(value, str):
+        value = value.strip()
+        if value == "" and field.null:
+            return None
+        if isinstance(field, models.BooleanField) and value.lower() in _BOOLEANS:
+            return _BOOLEANS[value.lower()]
+    return field.to_python(value)
+
+
+def _child_rows(key, rows) -> list:
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValidationError({key: "must be a list of objects"})
+    fields = CHILDREN[key]
+    for row in rows:
+        unknown = set(row) - set(fields) - _CHILD_COLUMNS[key]
+        if unknown:
+            raise ValidationError({key: f"unknown fields {', '.join(sorted(unknown))}"})
+    return [{f: (str(row[f]) if row.get(f) is not None else None) for f in fields} for row in rows]
+
+
+def _export_state(project, lookups) -> dict:
+    # static_export.remember_project_state without its query per project
+    if project.pk is None:
+        known = project.property_type_2 in lookups.property_types
+        return {"property_type_2": project.property_type_2 if known else None, "slug": project.slug, "city_slug": None, "is_featured": False}
+    return {
+        "property_type_2": project.property_type_2, "slug": project.slug,
+        "city_slug": project.city.slug if project.city else None, "is_featured": project.is_featured,
+    }
+
+
+def build(record, existing, lookups):
+    """
+    Apply one record to its project (a new one if its title is unknown) without saving.
+    Returns (project, changed field names, children); raises ValidationError.
+    """
+    if not isinstance(record, dict):
+        raise ValidationError("a record must be an object")
+    unknown = set(record) - set(PROJECT_FIELDS) - set(RELATED) - set(CHILDREN) - set(LISTS) - READ_ONLY
+    if unknown:
+        raise ValidationError(f"unknown fields {', '.join(sorted(unknown))}")
+    title = str(record.get("title") or "").strip()
+    if not title:
+        raise ValidationError({"title": "required"})
+    slug = slugify(title)
+    if slug in lookups.seen:
+        raise ValidationError({"title": f"same title as row {lookups.seen[slug]}"})
+
+    project = existing.get(lookups.slugs.get(slug)) or ProjectDetails()
+    previous = _export_state(project, lookups) if project.pk else None
+    changed = []
+    for key, name in RELATED.items():
+        if key in record:
+            obj = lookups.resolve(key, record[key])
+            if getattr(project, name) != (obj.id if obj else None):
+                setattr(project, key, obj)
+                changed.append(key)
+    for key, value in record.items():
+        field = PROJECT_FIELDS.get(key)
+        if field is None:
+            continue
+        try:
+            value = _field_value(field, value)
+        except ValidationError as e:
+            raise ValidationError({key: e.messages})
+        current = getattr(project, field.attname)
+        if isinstance(field, models.FileField):
+            # Files are given as storage paths; no file and an empty name are the same
+            current, value = current.name or None, value or None
+        if current != value:
+            setattr(project, field.attname, value)
+            changed.append(key)
+    project.slug = slug
+    project._export_previous = previous or _export_state(project, lookups)
+    project.clean_fields(exclude=["slug", *RELATED, *fx.PRICE_COLUMNS.values()])
+    if project.pk is None or _PRICE_SOURCES.intersection(changed):
+        fx.fill_price_columns(project, "project_price")
+        changed += fx.PRICE_COLUMNS.values()
+
+    children = {key: _child_rows(key, record[key]) for key in CHILDREN if key in record}
+    if "amenities" in record:
+        children["amenity_ids"] = [lookups.resolve("amenity", name) for name in record["amenities"]]
+    if "images" in record:
+        children["images"] = [str(path).strip() for path in record["images"]]
+    return project, changed, children
+
+
+def _update_fields(changed) -> list:
+    """bulk_update columns for changed field names: a translated field also writes its language columns."""
+    fields = set()
+    for name in changed:
+        fields.add(name)
+        fields.update(_TRANSLATED.get(name, ()))
+    return sorted(fields)
+
+
+# ----- Importing -----
+def _import_chunk(chunk, lookups, dry_run, counts, report):
+    slugs = [slugify(str(record.get("title") or "")) for _, record in chunk if isinstance(record, dict)]
+    ids = [lookups.slugs[slug] for slug in slugs if slug in lookups.slugs]
+    with transaction.atomic():
+        existing = ProjectDetails.objects.select_related("city").in_bulk(ids)
+        created, updated, fields = [], [], set()
+        for number, record in chunk:
+            title = record.get("title") if isinstance(record, dict) else None
+            try:
+                if isinstance(record, ValidationError):
+                    raise record
+                project, changed, children = build(record, existing, lookups)
+            except ValidationError as e:
+                counts["invalid"] += 1
+                report(number, "invalid", title, _messages(e))
+                continue
+            lookups.seen[project.slug] = number
+            if project.pk is None:
+                created.append((number, project, children))
+            else:
+                updated.append((number, project, changed, children))
+                fields.update(changed)
+
+        if created:
+            ProjectDetails.objects.bulk_create([project for _, project, _ in created])
+        if fields:
+            ProjectDetails.objects.bulk_update([project for _, project, changed, _ in updated if changed], _update_fields(fields))
+        catalog.create_children([(project, children) for _, project, children in created])
+
+        images = {}
+        if updated:
+            for project_id, path in PropertyImages.objects.filter(project_id__in=[p.id for _, p, _, _ in updated]).values_list("project_id", "img"):
+                images.setdefault(project_id, set()).add(path)
+        stale = set()
+        for number, project, children in created:
+            counts["created"] += 1
+            stale |= DEPENDENCIES[ProjectDetails](project)
+            lookups.slugs[project.slug] = project.id
+            lookups.property_types.add(project.property_type_2)
+            report(number, "created", project.title, ", ".join(
+                f"{key.replace('amenity_ids', 'amenities')} {len(rows)}" for key, rows in children.items()
+            ))
+        for number, project, changed, children in updated:
+            if "images" in children:
+                children["images"] = [path for path in children["images"] if path not in images.get(project.id, ())]
+            written = catalog.save_children(project, **children)
+            if changed:
+                stale |= DEPENDENCIES[ProjectDetails](project)
+            if changed or written:
+                counts["updated"] += 1
+                detail = [name for name in changed if name not in fx.PRICE_COLUMNS.values()]
+                detail += [f"{key} {n}" for key, n in written.items()]
+                report(number, "updated", project.title, ", ".join(detail))
+            else:
+                counts["unchanged"] += 1
+                report(number, "unchanged", project.title, "")
+        if stale:
+            mark_stale(stale)
+        if dry_run:
+            transaction.set_rollback(True)
+
+
+def import_catalog(records, chunk_size=CHUNK_SIZE, dry_run=False, report=None) -> dict:
+    """
+    Import (row number, record) pairs from read_records() in transactions of `chunk_size`
+    records. `report(number, action, title, detail)` is called per record with action
+    'created', 'updated' (detail: changed fields and child rows written), 'unchanged' or
+    'invalid' (detail: the errors). Returns the count per action.
+    """
+    report = report or (lambda *args: None)
+    lookups = Lookups()
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "invalid": 0}
+    chunk = []
+    for item in records:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            _import_chunk(chunk, lookups, dry_run, counts, report)
+            chunk = []
+    if chunk:
+        _import_chunk(chunk, lookups, dry_run, counts, report)
+    return counts
@@ -0,0 +1,88 @@
+# client_ip.py
+# Visitor IP from the request itself (REMOTE_ADDR + X-Forwarded-For through trusted proxies)
+# and optional country enrichment from an offline GeoIP database.
+import ipaddress
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+from .blocklist import PrefixTrie, parse_network
+
+try:
+    import geoip2.database
+    import geoip2.errors
+except ImportError:  # optional dependency
+    geoip2 = None
+
+logger = logging.getLogger(__name__)
+
+# ----- Settings -----
+TRUSTED_PROXIES = PrefixTrie(
+    n for n in map(parse_network, getattr(settings, "TRUSTED_PROXIES", ["127.0.0.1", "::1"])) if n is not None
+)
+GEOIP_COUNTRY_DB = getattr(settings, "GEOIP_COUNTRY_DB", None)
+
+
+# ----- Client IP -----
+def _address(value):
+    try:
+        return ipaddress.ip_address(value.strip().strip("[]"))
+    except ValueError:
+        return None
+
+
+def get_client_ip(request) -> str:
+    """
+    The first untrusted hop, reading X-Forwarded-For right to left from REMOTE_ADDR.
+    Entries added before an untrusted hop are client-controlled and ignored.
+    """
+    remote = _address(request.META.get("REMOTE_ADDR", "")) or ipaddress.ip_address("0.0.0.0")
+    client = remote
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    hops = [h for h in forwarded.split(",") if h.strip()]
+    while client in TRUSTED_PROXIES and hops:
+        hop = _address(hops.pop())
+        if hop is None:
+            break
+        client = hop
+    if client.version == 6 and client.ipv4_mapped:
+        client = client.ipv4_mapped
+    return str(client)
+
+
+# ----- Country lookup -----
+_reader = None
+_reader_lock = threading.Lock()
+_reader_missing = False
+
+
+def _get_reader():
+    """GeoIP reader opened once per worker; None when geoip2 or the database file is unavailable."""
+    global _reader, _reader_missing
+    if _reader is not None or _reader_missing:
+        return _reader
+    with _reader_lock:
+        if _reader is None and not _reader_missing:
+            if geoip2 is None or not GEOIP_COUNTRY_DB or not os.path.exists(GEOIP_COUNTRY_DB):
+                _reader_missing = True
+            else:
+                try:
+                    # MODE_MEMORY: the whole file is read once, lookups never touch the disk
+                    _reader = geoip2.database.Reader(GEOIP_COUNTRY_DB, mode=geoip2.database.MODE_MEMORY)
+                except Exception as e:
+                    logger.warning("GeoIP database unavailable: %s", e)
+                    _reader_missing = True
+    return _reader
+
+
+def lookup_country(ip):
+    """ISO country code for `ip` (e.g. 'AE'), or None if unknown or GeoIP isn't configured."""
+    reader = _get_reader()
+    if reader is None or not ip:
+        return None
+    try:
+        return reader.country(ip).country.iso_code
+    except (ValueError, geoip2.errors.AddressNotFoundError):
+        return None
@@ -0,0 +1,47 @@
+# dedup.py
+# Drops repeated lead submissions (double clicks, reloads, replayed bot payloads) before they
+# reach Leadrat and SMTP. A hash of the normalized submission opens a LeadDigest row for
+# SUBMISSION_DEDUP_WINDOW seconds. The row's unique digest makes "first" atomic across
+# workers, which a check-then-write cache add (FileBasedCache) is not.
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import LeadDigest
+
+# ----- Settings -----
+WINDOW = getattr(settings, "SUBMISSION_DEDUP_WINDOW", 600)
+
+_SPACES = re.compile(r"\s+")
+
+
+def submission_hash(email, phone, property_id, message) -> str:
+    """sha256 of the submission with case, spacing and phone formatting folded away."""
+    parts = (
+        (email or "").strip().casefold(),
+        re.sub(r"\D", "", phone or ""),
+        str(property_id or "").strip(),
+        _SPACES.sub(" ", (message or "").strip().casefold()),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def first_seen(digest) -> bool:
+    """
+    True the first time `digest` is seen within the window (and starts the window), False for repeats.
+    Call inside the transaction that stores the submission, so the window only opens if it commits.
+    """
+    now = timezone.now()
+    # Closed windows are dropped first (by the expires_at index), so the table stays small
+    LeadDigest.objects.filter(expires_at__lte=now).delete()
+    try:
+        with transaction.atomic():
+            LeadDigest.objects.create(digest=digest, expires_at=now + timedelta(seconds=WINDOW))
+    except IntegrityError:
+        # Another request holds an open window for the same submission
+        return False
+    return True
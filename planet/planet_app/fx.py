@@ -0,0 +1,320 @@
+# fx.py
+# Single FX service for the site. Rates are AED-based and resolved through three tiers:
+#   1. in-process memo (per worker, short TTL)
+#   2. shared cache (FX_CACHE_ALIAS, visible to every worker)
+#   3. DailyFxRates (durable source). Past its 24h window the stored row is still served
+#      while one worker, elected by a file lock, refreshes it in the background.
+import logging
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .fx_providers import get_provider
+from .models import DailyFxRates, ProjectDetails, PropertyPricing
+from .money import RATE_SCALE, SYMBOLS, Money, convert_many, scale_rate
+
+logger = logging.getLogger(__name__)
+
+# ----- Constants -----
+BASE_CURRENCY = "AED"
+SUPPORTED_CURRENCIES = ("AED", "USD", "EUR", "INR")
+CURRENCY_SYMBOLS = SYMBOLS
+SESSION_KEY = "currency"
+# Mirrors a non-base session currency so the web server can skip the statically exported
+# pages, which are rendered in BASE_CURRENCY (see STATIC_EXPORT_ROOT in settings)
+CURRENCY_COOKIE = getattr(settings, "CURRENCY_COOKIE_NAME", "currency")
+
+MEMO_TTL = getattr(settings, "FX_MEMO_TTL", 60)
+SHARED_TTL = getattr(settings, "FX_CACHE_TTL", 600)
+CACHE_ALIAS = getattr(settings, "FX_CACHE_ALIAS", "default")
+CACHE_KEY = "fx:rates:aed:scaled"
+REFRESH_AFTER = timedelta(hours=24)
+LOCK_PATH = getattr(settings, "FX_LOCK_PATH", os.path.join(settings.BASE_DIR, "cache", "fx_refresh.lock"))
+LOCK_TIMEOUT = 60
+
+_memo = {"rates": None, "expires": 0.0}
+_memo_lock = threading.Lock()
+
+
+# ----- Durable tier -----
+def _rates_from_row(row) -> dict:
+    """AED->code rates as integers scaled by money.RATE_SCALE."""
+    if row is None:
+        # Nothing stored yet: only AED can be shown until the first refresh lands
+        return {BASE_CURRENCY: RATE_SCALE}
+    return {
+        "AED": RATE_SCALE,
+        "USD": scale_rate(row.aed_to_usd),
+        "EUR": scale_rate(row.aed_to_eur),
+        "INR": scale_rate(row.aed_to_inr),
+    }
+
+
+def _is_stale(row) -> bool:
+    return row is None or timezone.now() - row.fetched_at > REFRESH_AFTER
+
+
+def store_rates(as_of: date, norm: dict):
+    row, _ = DailyFxRates.objects.update_or_create(
+        as_of_date=as_of,
+        defaults={
+            "aed_to_usd": norm["USD"],
+            "aed_to_eur": norm["EUR"],
+            "aed_to_inr": norm["INR"],
+            # Provider may still report the same date; a new fetch still makes the row fresh
+            "fetched_at": timezone.now(),
+        },
+    )
+    return row
+
+
+def _load_durable() -> dict:
+    """
+    Latest DailyFxRates row, served as-is even when past its 24h window.
+    A stale (or missing) row triggers a background refresh instead of a provider call in the request.
+    """
+    latest = DailyFxRates.objects.first()
+    if _is_stale(latest):
+        refresh_in_background()
+    return _rates_from_row(latest)
+
+
+# ----- Single-flight refresh -----
+class RefreshLock:
+    """
+    Cross-process lock backed by an exclusively created file, so only one worker on the host
+    talks to the provider at a time. A lock older than LOCK_TIMEOUT is treated as abandoned.
+    """
+
+    def __init__(self, path=LOCK_PATH, timeout=LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self.acquired = False
+
+    def acquire(self) -> bool:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        for _ in range(2):
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                self.acquired = True
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) < self.timeout:
+                        return False
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+        return False
+
+    def release(self):
+        if self.acquired:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.acquired = False
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def refresh_rates(force=False) -> bool:
+    """
+    Fetch from the configured provider and store a new DailyFxRates row, if this worker wins the lock.
+    Returns True when a refresh happened.
+    """
+    with RefreshLock() as won:
+        if not won:
+            return False
+        if not force and not _is_stale(DailyFxRates.objects.first()):
+            return False
+        store_rates(*get_provider().fetch())
+        invalidate()
+        return True
+
+
+_refreshing = threading.Event()
+
+
+def refresh_in_background():
+    """Start at most one refresh thread per worker; the file lock dedupes across workers."""
+    if _refreshing.is_set():
+        return
+    _refreshing.set()
+
+    def run():
+        try:
+            refresh_rates()
+        except Exception as e:
+            logger.warning("FX refresh failed: %s", e)
+        finally:
+            _refreshing.clear()
+            connection.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+# ----- Tiered accessor -----
+def get_rates() -> dict:
+    """AED-based scaled rates {'AED': RATE_SCALE, 'USD': int, ...}, memoized per worker and shared across workers."""
+    now = time.monotonic()
+    rates = _memo["rates"]
+    if rates is not None and now < _memo["expires"]:
+        return rates
+    with _memo_lock:
+        if _memo["rates"] is not None and now < _memo["expires"]:
+            return _memo["rates"]
+        shared = caches[CACHE_ALIAS]
+        rates = shared.get(CACHE_KEY)
+        if rates is None:
+            rates = _load_durable()
+            shared.set(CACHE_KEY, rates, SHARED_TTL)
+        _memo["rates"] = rates
+        _memo["expires"] = now + MEMO_TTL
+    return rates
+
+
+def invalidate():
+    """Drop cached rates in this worker and the shared cache (e.g. after a new DailyFxRates row)."""
+    with _memo_lock:
+        _memo["rates"] = None
+        _memo["expires"] = 0.0
+    caches[CACHE_ALIAS].delete(CACHE_KEY)
+
+
+# ----- Session currency -----
+def normalize_code(code) -> str:
+    c = code.upper() if isinstance(code, str) else BASE_CURRENCY
+    return c if c in SUPPORTED_CURRENCIES else BASE_CURRENCY
+
+
+def session_currency(request) -> str:
+    """Visitor's chosen currency, without touching (and so without saving) the session."""
+    return normalize_code(request.session.get(SESSION_KEY, BASE_CURRENCY))
+
+
+def set_session_currency(request, code) -> bool:
+    """Set a supported currency in session; returns True if set, False if invalid."""
+    if not isinstance(code, str) or code.upper() not in SUPPORTED_CURRENCIES:
+        return False
+    request.session[SESSION_KEY] = code.upper()
+    return True
+
+
+def sync_currency_cookie(request, response, code=None):
+    """Set the currency cookie for a non-base currency, drop it for the base one."""
+    code = normalize_code(code) if code else session_currency(request)
+    if code == BASE_CURRENCY:
+        if CURRENCY_COOKIE in request.COOKIES:
+            response.delete_cookie(CURRENCY_COOKIE)
+    elif request.COOKIES.get(CURRENCY_COOKIE) != code:
+        response.set_cookie(CURRENCY_COOKIE, code, max_age=settings.SESSION_COOKIE_AGE, samesite="Lax")
+    return response
+
+
+class CurrencyCookieMiddleware:
+    """Keeps the currency cookie in step with the session on responses that read the session."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        session = getattr(request, "session", None)
+        if session is not None and session.accessed:
+            sync_currency_cookie(request, response)
+        return response
+
+
+# ----- Conversion/formatting -----
+def convert(amount_aed: Money, to_code) -> Money:
+    """Convert an AED Money to `to_code` with the scaled rate (AED if no rate is loaded)."""
+    code = available_code(to_code)
+    return amount_aed.convert(get_rates()[code], code)
+
+
+def available_code(code) -> str:
+    """`code` if a rate for it is loaded, else AED (e.g. before the first refresh)."""
+    code = normalize_code(code)
+    return code if code in get_rates() else BASE_CURRENCY
+
+
+def display_price(value, code) -> dict:
+    """Convert and format a stored AED price for display in `code`."""
+    code = available_code(code)
+    amount = Money.parse(value, BASE_CURRENCY)
+    if amount is None:
+        return {"price_raw": None, "price_display": None, "code": code}
+    converted = convert(amount, code)
+    return {"price_raw": converted, "price_display": converted.format(), "code": code}
+
+
+def display_price_for_project(project, request) -> dict:
+    return display_price(project.project_price, session_currency(request))
+
+
+# ----- Precomputed price columns -----
+# price_<code> columns on these models mirror their AED source field in every currency (as
+# minor-unit MoneyFields), so listings can show, sort and range-filter straight from SQL.
+PRICE_COLUMNS = {code: f"price_{code.lower()}" for code in SUPPORTED_CURRENCIES}
+PRICED_MODELS = ((ProjectDetails, "project_price"), (PropertyPricing, "price"))
+REPRICE_BATCH = 500
+
+
+def fill_price_columns(obj, source_field):
+    """Set the price_<code> columns of an instance about to be saved from its AED source field."""
+    amount = Money.parse(getattr(obj, source_field), BASE_CURRENCY)
+    rates = get_rates()
+    for code, column in PRICE_COLUMNS.items():
+        value = None
+        if amount is not None and code in rates:
+            value = amount.convert(rates[code], code)
+        setattr(obj, column, value)
+
+
+def refresh_price_columns(row=None):
+    """
+    Recompute every converted price column from price_aed. Conversion runs over whole
+    batches of minor units in Python (a 64-bit SQL product of amount and scaled rate can
+    overflow), then each batch is written back with one bulk UPDATE.
+    """
+    row = row or DailyFxRates.objects.first()
+    if row is None:
+        return
+    rates = _rates_from_row(row)
+    targets = [code for code in SUPPORTED_CURRENCIES if code != BASE_CURRENCY]
+    for model, _ in PRICED_MODELS:
+        # Plain QuerySet: skip modeltranslation's manager, these are untranslated columns
+        pairs = list(QuerySet(model).filter(price_aed__isnull=False).values_list("id", "price_aed"))
+        with transaction.atomic():
+            for i in range(0, len(pairs), REPRICE_BATCH):
+                batch = pairs[i:i + REPRICE_BATCH]
+                minors = [aed.minor for _, aed in batch]
+                objs = [model(id=pk) for pk, _ in batch]
+                for code in targets:
+                    column = PRICE_COLUMNS[code]
+                    for obj, minor in zip(objs, convert_many(minors, rates[code])):
+                        setattr(obj, column, Money(minor, code))
+                QuerySet(model).bulk_update(objs, [PRICE_COLUMNS[c] for c in targets])
+
+
+def column_price(obj, code) -> dict:
+    """Display a precomputed price column; same shape as display_price."""
+    amount = getattr(obj, PRICE_COLUMNS[code], None)
+    if amount is None and obj.price_aed is not None and code in get_rates():
+        # Saved before this currency had a rate; the next rate refresh fills the column
+        amount = obj.price_aed.convert(get_rates()[code], code)
+    if amount is None:
+        return {"price_raw": None, "price_display": None, "code": code}
+    return {"price_raw": amount, "price_display": amount.format(), "code": code}
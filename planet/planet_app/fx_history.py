@@ -0,0 +1,161 @@
+# fx_history.py
+# Historical AED rates served from memory. DailyFxRates is loaded once per worker into
+# sorted parallel arrays (date ordinals + rates scaled to integers) and searched with bisect.
+# New rows are merged in as they are saved; other workers notice through a version key in
+# the shared cache and reload.
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import caches
+
+from .fx import BASE_CURRENCY, CACHE_ALIAS, MEMO_TTL, normalize_code
+from .models import DailyFxRates
+from .money import RATE_SCALE, Money, scale_rate
+
+# ----- Constants -----
+CURRENCY_FIELDS = {"USD": "aed_to_usd", "EUR": "aed_to_eur", "INR": "aed_to_inr"}
+VERSION_KEY = "fx:history:version"
+
+
+class RateHistory:
+    """
+    Sorted, de-duplicated daily rates. `days` holds date ordinals; `rates[code]` the
+    AED->code rate of the same index as an integer scaled by RATE_SCALE.
+    """
+
+    def __init__(self):
+        self.days = array("l")
+        self.rates = {code: array("q") for code in CURRENCY_FIELDS}
+        self.version = None
+        self.checked = 0.0
+        self.lock = threading.Lock()
+
+    # ----- Loading -----
+    def load(self):
+        rows = DailyFxRates.objects.order_by("as_of_date").values_list("as_of_date", *CURRENCY_FIELDS.values())
+        days = array("l")
+        rates = {code: array("q") for code in CURRENCY_FIELDS}
+        for as_of, *values in rows.iterator(chunk_size=2000):
+            days.append(as_of.toordinal())
+            for code, value in zip(CURRENCY_FIELDS, values):
+                rates[code].append(scale_rate(value))
+        self.days, self.rates = days, rates
+
+    def _ensure_current(self):
+        """Load on first use; reload when another worker bumped the version (checked every MEMO_TTL)."""
+        now = time.monotonic()
+        if self.version is not None and now - self.checked < MEMO_TTL:
+            return
+        with self.lock:
+            if self.version is not None and now - self.checked < MEMO_TTL:
+                return
+            version = caches[CACHE_ALIAS].get_or_set(VERSION_KEY, 1, None)
+            if version != self.version or not self.days:
+                self.load()
+            self.version = version
+            self.checked = now
+
+    def add(self, as_of: date, values: dict):
+        """Merge one day's rates into the loaded arrays (appends for the usual newest-day case)."""
+        with self.lock:
+            if self.version is None:
+                # Not loaded in this worker yet; the first read will pick the row up
+                return
+            day = as_of.toordinal()
+            i = bisect_left(self.days, day)
+            if i < len(self.days) and self.days[i] == day:
+                for code, value in values.items():
+                    self.rates[code][i] = scale_rate(value)
+                return
+            if i == len(self.days):
+                self.days.append(day)
+                for code, value in values.items():
+                    self.rates[code].append(scale_rate(value))
+                return
+            insort(self.days, day)
+            for code, value in values.items():
+                self.rates[code].insert(i, scale_rate(value))
+
+    # ----- Queries -----
+    def rate_on(self, code, on: date):
+        """(as_of_date, rate) in effect on `on`: the latest row at or before it, or None."""
+        self._ensure_current()
+        code = normalize_code(code)
+        if code == BASE_CURRENCY:
+            return on, Decimal("1")
+        i = bisect_right(self.days, on.toordinal()) - 1
+        if i < 0:
+            return None
+        return date.fromordinal(self.days[i]), Decimal(self.rates[code][i]) / RATE_SCALE
+
+    def between(self, code, start: date, end: date) -> list:
+        """[(as_of_date, rate), ...] for every stored day in [start, end], oldest first."""
+        self._ensure_current()
+        code = normalize_code(code)
+        lo = bisect_left(self.days, start.toordinal())
+        hi = bisect_right(self.days, end.toordinal())
+        if code == BASE_CURRENCY:
+            return [(date.fromordinal(d), Decimal("1")) for d in self.days[lo:hi]]
+        series = self.rates[code]
+        return [(date.fromordinal(self.days[i]), Decimal(series[i]) / RATE_SCALE) for i in range(lo, hi)]
+
+    def bounds(self):
+        """(first, last) stored dates, or None when there is no history."""
+        self._ensure_current()
+        if not self.days:
+            return None
+        return date.fromordinal(self.days[0]), date.fromordinal(self.days[-1])
+
+
+history = RateHistory()
+
+
+# ----- Module API -----
+def rate_on(code, on: date):
+    return history.rate_on(code, on)
+
+
+def rates_between(code, start: date, end: date) -> list:
+    return history.between(code, start, end)
+
+
+def convert_on(amount_aed: Money, code, on: date):
+    """AED Money in `code` at the rate in effect on `on` (e.g. a project's launch date); None if no rate."""
+    code = normalize_code(code)
+    if code == BASE_CURRENCY:
+        return amount_aed
+    history._ensure_current()
+    i = bisect_right(history.days, on.toordinal()) - 1
+    if i < 0:
+        return None
+    return amount_aed.convert(history.rates[code][i], code)
+
+
+def record(row):
+    """Merge a saved DailyFxRates row here and tell other workers to reload."""
+    history.add(row.as_of_date, {code: getattr(row, field) for code, field in CURRENCY_FIELDS.items()})
+    bump_version()
+
+
+def bump_version():
+    cache = caches[CACHE_ALIAS]
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        version = 1
+        cache.set(VERSION_KEY, version, None)
+    with history.lock:
+        if history.version is not None:
+            # This worker is already up to date; don't reload because of its own bump
+            history.version = version
+
+
+def reload():
+    """Drop this worker's index (e.g. after a bulk backfill) and bump the shared version."""
+    with history.lock:
+        history.version = None
+    bump_version()
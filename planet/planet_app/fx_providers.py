@@ -0,0 +1,78 @@
+# fx_providers.py
+# Pluggable FX rate sources. settings.FX_PROVIDER names the class to use:
+#   FX_PROVIDER = "planet_app.fx_providers.FixerProvider"      (default)
+#   FX_PROVIDER = "planet_app.fx_providers.FileFxProvider"     (tests / offline; reads FX_PROVIDER_FILE)
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import http_client
+
+BASE_CURRENCY = "AED"
+TARGETS = ("USD", "EUR", "INR")
+
+
+def normalize_to_aed(base_code: str, rates: dict) -> dict:
+    """
+    Convert provider rates (possibly base EUR) into AED->target for USD/EUR/INR.
+    Raises RuntimeError if a needed rate is missing, zero, negative or not a number.
+    """
+    needed = {BASE_CURRENCY, *TARGETS} - {base_code}
+    missing = needed - set(rates.keys())
+    if missing:
+        raise RuntimeError(f"Provider payload missing: {missing}")
+    values = {code: Decimal(str(rates[code])) for code in needed}
+    invalid = sorted(code for code, value in values.items() if not value.is_finite() or value <= 0)
+    if invalid:
+        raise RuntimeError(f"Provider payload has unusable rates: {', '.join(invalid)}")
+    values[base_code] = Decimal("1")
+    return {code: values[code] / values[BASE_CURRENCY] for code in TARGETS}
+
+
+class FxProvider:
+    """Returns (as_of_date, {'USD': Decimal, 'EUR': Decimal, 'INR': Decimal}) with AED as base."""
+
+    def fetch(self) -> tuple[date, dict]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _parse(data: dict) -> tuple[date, dict]:
+        normalized = normalize_to_aed(data.get("base", "EUR"), data["rates"])
+        as_of_str = data.get("date")
+        as_of = date.fromisoformat(as_of_str) if as_of_str else date.today()
+        return as_of, normalized
+
+
+class FixerProvider(FxProvider):
+    url = "https://data.fixer.io/api/latest"
+    timeout = 8
+
+    def fetch(self):
+        params = {"access_key": settings.FIXER_API_KEY, "symbols": ",".join((BASE_CURRENCY, *TARGETS))}
+        resp = http_client.get(self.url, params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        if not data.get("success"):
+            raise RuntimeError(f"FX fetch failed: {data}")
+        return self._parse(data)
+
+
+class FileFxProvider(FxProvider):
+    """
+    Local stand-in reading a Fixer-shaped JSON file, e.g.
+    {"base": "AED", "date": "2026-01-01", "rates": {"USD": 0.2723, "EUR": 0.2511, "INR": 22.61}}
+    """
+
+    def __init__(self, path=None):
+        self.path = path or settings.FX_PROVIDER_FILE
+
+    def fetch(self):
+        with open(self.path, encoding="utf-8") as f:
+            return self._parse(json.load(f))
+
+
+def get_provider() -> FxProvider:
+    return import_string(getattr(settings, "FX_PROVIDER", "planet_app.fx_providers.FixerProvider"))()
@@ -0,0 +1,159 @@
+# http_client.py
+# The one way out to third-party HTTP APIs (Fixer, Leadrat, Google Translate).
+#   - one pooled keep-alive session per host, shared by the threads of a worker
+#   - a timeout on every call (per-host default when the caller gives none)
+#   - a circuit breaker per host: after BREAKER_THRESHOLD consecutive failures calls fail
+#     fast with CircuitOpenError for BREAKER_RESET seconds, then one trial call is let through
+#   - per-host request/error/latency counters (see stats())
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# ----- Settings -----
+DEFAULT_TIMEOUT = getattr(settings, "HTTP_CLIENT_TIMEOUT", (3.05, 10))  # (connect, read) seconds
+POOL_SIZE = getattr(settings, "HTTP_CLIENT_POOL_SIZE", 10)
+BREAKER_THRESHOLD = getattr(settings, "HTTP_CLIENT_BREAKER_THRESHOLD", 5)
+BREAKER_RESET = getattr(settings, "HTTP_CLIENT_BREAKER_RESET", 30)
+# Per-host overrides, e.g. {"connect.leadrat.com": {"timeout": (3.05, 20)}}
+HOSTS = getattr(settings, "HTTP_CLIENT_HOSTS", {})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host failed repeatedly and is not being called until its breaker resets."""
+
+
+class CircuitBreaker:
+    def __init__(self, threshold, reset_after):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_after or self.trial_running:
+                return False
+            # Half-open: let a single trial call through
+            self.trial_running = True
+            return True
+
+    def record(self, ok):
+        """Settle a call: True/False for success/failure, None if it ended without saying anything about the host."""
+        with self.lock:
+            self.trial_running = False
+            if ok is None:
+                return
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class Host:
+    """Session, breaker and counters for one remote host."""
+
+    def __init__(self, name):
+        options = HOSTS.get(name) or HOSTS.get(name.rsplit(":", 1)[0], {})
+        self.name = name
+        self.timeout = options.get("timeout", DEFAULT_TIMEOUT)
+        self.breaker = CircuitBreaker(options.get("breaker_threshold", BREAKER_THRESHOLD),
+                                      options.get("breaker_reset", BREAKER_RESET))
+        self.session = requests.Session()
+        # Retries are the caller's business (e.g. the outbox backoff); the adapter only pools
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=options.get("pool_size", POOL_SIZE), max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.counters = {"requests": 0, "errors": 0, "rejected": 0, "latency_total": 0.0, "latency_max": 0.0}
+        self.counter_lock = threading.Lock()
+
+    def count(self, **values):
+        with self.counter_lock:
+            for key, value in values.items():
+                if key == "latency":
+                    self.counters["latency_total"] += value
+                    self.counters["latency_max"] = max(self.counters["latency_max"], value)
+                else:
+                    self.counters[key] += value
+
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+
+def _host(url) -> Host:
+    parts = urlsplit(url)
+    name = f"{parts.hostname}:{parts.port}" if parts.port else (parts.hostname or "")
+    host = _hosts.get(name)
+    if host is None:
+        with _hosts_lock:
+            host = _hosts.setdefault(name, Host(name))
+    return host
+
+
+# ----- Requests -----
+def request(method, url, timeout=None, **kwargs) -> requests.Response:
+    """
+    requests-style call through the host's pooled session and breaker. 5xx responses and
+    transport errors count as failures; the response is returned either way for the caller to check.
+    """
+    host = _host(url)
+    if not host.breaker.allow():
+        host.count(rejected=1)
+        raise CircuitOpenError(f"{host.name} is unavailable (circuit open)")
+    started = time.monotonic()
+    ok = None
+    try:
+        response = host.session.request(method, url, timeout=timeout or host.timeout, **kwargs)
+        ok = response.status_code < 500
+    except requests.RequestException:
+        ok = False
+        raise
+    finally:
+        # Settled on every exit, so an unexpected exception cannot hold the half-open trial forever
+        host.breaker.record(ok)
+        if ok is not None:
+            host.count(requests=1, errors=int(not ok), latency=time.monotonic() - started)
+    return response
+
+
+def get(url, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def stats() -> dict:
+    """Per-host counters and breaker state for this worker process."""
+    out = {}
+    for name, host in list(_hosts.items()):
+        with host.counter_lock:
+            counters = dict(host.counters)
+        done = counters["requests"]
+        out[name] = {
+            "requests": done,
+            "errors": counters["errors"],
+            "rejected": counters["rejected"],
+            "latency_avg_ms": round(counters["latency_total"] / done * 1000, 1) if done else None,
+            "latency_max_ms": round(counters["latency_max"] * 1000, 1),
+            "breaker": host.breaker.state,
+        }
+    return out
@@ -0,0 +1,161 @@
+# lead_stats.py
+# Daily lead rollup. Every processed submission adds one to its DailyLeadStats cell
+# (day, property, outcome, source) in the transaction that stores it, and CRM failures
+# are added when the outbox learns of them, so dashboard trends never scan ContactForm.
+# Submissions from before the rollup existed are counted in once by backfill()
+# (`manage.py backfill_lead_stats`, and archive() before it deletes anything).
+from collections import Counter
+from datetime import date, datetime, time
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .blocklist import find_blocked_words, is_ip_blocked
+from .models import BlockedEmail, BlockedName, ContactForm, DailyLeadStats
+from .spam import REJECT_THRESHOLD
+
+SOURCE_MAX = 50
+
+
+def lead_source(request) -> str:
+    """
+    Where a lead came from: the utm_source of the page the form was posted from, else that
+    page's first path segment ('home' for /), or 'direct' without a referer.
+    """
+    referer = request.META.get("HTTP_REFERER") or ""
+    if not referer:
+        return "direct"
+    parts = urlsplit(referer)
+    utm = (parse_qs(parts.query).get("utm_source") or [""])[0].strip()
+    source = utm or parts.path.strip("/").split("/", 1)[0] or "home"
+    return source.lower()[:SOURCE_MAX]
+
+
+# ----- Recording -----
+def record(day, outcome, project_id=None, source="", n=1):
+    """Add `n` to one rollup cell, creating it on first use."""
+    cell = DailyLeadStats.objects.filter(day=day, project_id=project_id, outcome=outcome, source=source)
+    if cell.update(count=F("count") + n):
+        return
+    try:
+        with transaction.atomic():
+            DailyLeadStats.objects.create(day=day, project_id=project_id, outcome=outcome, source=source, count=n)
+    except IntegrityError:
+        # Another worker created the cell first
+        cell.update(count=F("count") + n)
+
+
+def fold_project(project_id):
+    """
+    Move a property's cells onto the site-wide ones before the property is deleted, as
+    on_delete=SET_NULL would otherwise collide with the site-wide unique constraint.
+    """
+    cells = DailyLeadStats.objects.filter(project_id=project_id)
+    for day, outcome, source, count in cells.values_list("day", "outcome", "source", "count"):
+        record(day, outcome, None, source, count)
+    cells.delete()
+
+
+def record_contact(contact, outcome):
+    """Count `contact` under `outcome` on the day it was submitted."""
+    day = timezone.localdate(contact.submitted_on) if contact.submitted_on else timezone.localdate()
+    record(day, outcome, contact.project_id, contact.source or "")
+
+
+def record_contacts(contact_ids, outcome):
+    """record_contact for ContactForm ids, e.g. the leads of a failed CRM batch."""
+    for contact in ContactForm.objects.filter(id__in=contact_ids).only("submitted_on", "project_id", "source"):
+        record_contact(contact, outcome)
+
+
+# ----- Backfill -----
+def _outcomes(row, emails, names) -> list:
+    """The outcomes a stored submission was (or, before they were recorded, most likely was) counted under."""
+    if row["is_duplicate"]:
+        return ["duplicate"]
+    if row["crm_status"]:
+        return ["dispatched", "crm_failed"] if row["crm_status"] in ("failed", "rejected") else ["dispatched"]
+    blocked = (
+        row["email"] in emails or (row["name"] or "").lower() in names or is_ip_blocked(row["ip"])
+        or bool(find_blocked_words(row["message"]))
+    )
+    if blocked:
+        return ["blocked"]
+    if row["spam_score"] is not None and row["spam_score"] >= REJECT_THRESHOLD:
+        return ["spam"]
+    if row["dedup_hash"]:
+        # Stored by the current form view with nothing queued: the captcha answer was wrong
+        return ["wrong_captcha"]
+    # Older rows did not record a wrong captcha apart from a dispatched lead
+    return ["dispatched"]
+
+
+def backfill() -> int:
+    """
+    Count the ContactForm rows submitted before the rollup's first day (all of them if it
+    has none yet) into their daily cells. Those days have no cells, so nothing is counted
+    twice and a second run finds nothing to do. Returns the number of submissions counted.
+    """
+    first = DailyLeadStats.objects.order_by("day").values_list("day", flat=True).first()
+    rows = ContactForm.objects.exclude(submitted_on=None)
+    if first:
+        rows = rows.filter(submitted_on__lt=timezone.make_aware(datetime.combine(first, time.min)))
+    emails = set(BlockedEmail.objects.values_list("email", flat=True).iterator())
+    names = set(BlockedName.objects.values_list("name", flat=True).iterator())
+
+    cells = Counter()
+    counted = 0
+    fields = ("submitted_on", "project_id", "source", "name", "email", "ip", "message", "crm_status",
+              "is_duplicate", "spam_score", "dedup_hash")
+    for row in rows.values(*fields).iterator(chunk_size=2000):
+        day = timezone.localdate(row["submitted_on"])
+        for outcome in _outcomes(row, emails, names):
+            cells[(day, row["project_id"], outcome, row["source"] or "")] += 1
+        counted += 1
+    with transaction.atomic():
+        # record() adds to a cell a live submission may have created meanwhile (first run, no cells yet)
+        for (day, project_id, outcome, source), count in cells.items():
+            record(day, outcome, project_id, source, count)
+    return counted
+
+
+# ----- Dashboard -----
+def _month_starts(months) -> list:
+    today = timezone.localdate()
+    year, month = today.year, today.month
+    starts = []
+    for _ in range(months):
+        starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+def trends(months=12, top=10) -> dict:
+    """
+    Chart data for the last `months` calendar months: month labels, one monthly series per
+    outcome, and the properties and sources with the most dispatched leads.
+    """
+    starts = _month_starts(months)
+    stats = DailyLeadStats.objects.filter(day__gte=starts[0])
+
+    series = {code: [0] * months for code, _ in DailyLeadStats.Outcome_Choices}
+    index = {start: i for i, start in enumerate(starts)}
+    monthly = stats.annotate(month=TruncMonth("day")).values("month", "outcome").annotate(total=Sum("count"))
+    for row in monthly:
+        if row["outcome"] in series and row["month"] in index:
+            series[row["outcome"]][index[row["month"]]] = row["total"]
+
+    dispatched = stats.filter(outcome="dispatched")
+    properties = dispatched.exclude(project=None).values("project__title").annotate(total=Sum("count")).order_by("-total")[:top]
+    sources = dispatched.values("source").annotate(total=Sum("count")).order_by("-total")[:top]
+    return {
+        "labels": [start.strftime("%b %Y") for start in starts],
+        "outcomes": [
+            {"code": code, "label": label, "data": series[code]} for code, label in DailyLeadStats.Outcome_Choices
+        ],
+        "properties": [{"label": row["project__title"], "total": row["total"]} for row in properties],
+        "sources": [{"label": row["source"] or "unknown", "total": row["total"]} for row in sources],
+    }
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from planet_app import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move contact submissions older than --older-than-days (whole months) into gzip-compressed "
+        "monthly JSONL files under SUBMISSIONS_ARCHIVE_DIR and delete them from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=archive.ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=archive.BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows each month would archive.")
+        parser.add_argument("--vacuum", action="store_true", help="VACUUM the SQLite database afterwards to return the space.")
+
+    def handle(self, *args, **options):
+        before = archive.cutoff(options["older_than_days"])
+        counts = archive.archive(before, batch_size=options["batch_size"], dry_run=options["dry_run"])
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        for month, count in sorted(counts.items()):
+            self.stdout.write(f"{month}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {sum(counts.values())} submissions from before {before:%Y-%m-%d} to {archive.ARCHIVE_DIR}"
+        ))
+        if options["vacuum"] and not options["dry_run"] and connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("VACUUM")
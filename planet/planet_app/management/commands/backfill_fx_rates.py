@@ -0,0 +1,84 @@
+import csv
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app import fx, fx_history
+from planet_app.fx_providers import normalize_to_aed
+from planet_app.models import DailyFxRates
+
+
+class Command(BaseCommand):
+    help = (
+        "Load historical rates into DailyFxRates from a CSV with a 'date' column (YYYY-MM-DD) and one column "
+        "per currency, quoted against --base (default AED: columns USD, EUR, INR)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--base", default="AED", help="Currency the CSV rates are quoted in (e.g. EUR, then an AED column is required).")
+        parser.add_argument("--overwrite", action="store_true", help="Replace rates already stored for a date.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        base = options["base"].upper()
+        rows = []
+        invalid = 0
+        try:
+            with open(options["csv_path"], newline="", encoding="utf-8-sig") as f:
+                for line, rec in enumerate(csv.DictReader(f), start=2):
+                    row = self._parse(rec, base, line)
+                    if row is None:
+                        invalid += 1
+                    else:
+                        rows.append(row)
+        except OSError as e:
+            raise CommandError(e)
+
+        existing = set(DailyFxRates.objects.values_list("as_of_date", flat=True))
+        by_date = {row.as_of_date: row for row in rows}  # last line wins for repeated dates
+        new = [row for day, row in by_date.items() if day not in existing]
+        DailyFxRates.objects.bulk_create(new, batch_size=options["batch_size"], ignore_conflicts=True)
+
+        updated = 0
+        if options["overwrite"]:
+            changed = [row for day, row in by_date.items() if day in existing]
+            ids = dict(DailyFxRates.objects.filter(as_of_date__in=[r.as_of_date for r in changed]).values_list("as_of_date", "id"))
+            for row in changed:
+                row.pk = ids[row.as_of_date]
+            updated = DailyFxRates.objects.bulk_update(
+                changed, ["aed_to_usd", "aed_to_eur", "aed_to_inr"], batch_size=options["batch_size"]
+            )
+
+        # bulk_create/bulk_update skip post_save, so refresh derived state explicitly
+        fx_history.reload()
+        fx.invalidate()
+        latest = DailyFxRates.objects.first()
+        if latest and latest.as_of_date in by_date:
+            fx.refresh_price_columns(latest)
+
+        skipped = len(by_date) - len(new) - updated
+        self.stdout.write(
+            f"inserted {len(new)}, updated {updated}, skipped {skipped}, invalid {invalid} "
+            f"(of {len(rows) + invalid} lines)"
+        )
+
+    def _parse(self, rec, base, line):
+        """The DailyFxRates for one CSV line, or None (with a warning) if its rates are unusable."""
+        rec = {(k or "").strip().upper(): (v or "").strip() for k, v in rec.items()}
+        try:
+            as_of = date.fromisoformat(rec.pop("DATE"))
+        except KeyError:
+            raise CommandError(f"line {line}: missing 'date' column")
+        except ValueError as e:
+            raise CommandError(f"line {line}: {e}")
+        try:
+            rates = {code: Decimal(value) for code, value in rec.items() if value}
+            norm = normalize_to_aed(base, rates)
+        except (InvalidOperation, RuntimeError) as e:
+            # One bad day (e.g. a zero or missing AED rate) is skipped, not the whole backfill
+            reason = "a rate is not a number" if isinstance(e, InvalidOperation) else e
+            self.stderr.write(self.style.WARNING(f"line {line} ({as_of}): skipped, {reason}"))
+            return None
+        return DailyFxRates(as_of_date=as_of, aed_to_usd=norm["USD"], aed_to_eur=norm["EUR"], aed_to_inr=norm["INR"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from planet_app import lead_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Count contact submissions from before the daily lead rollup started into DailyLeadStats, so the "
+        "dashboard trends cover them. Safe to run again; archive_submissions runs it before deleting rows."
+    )
+
+    def handle(self, *args, **options):
+        counted = lead_stats.backfill()
+        self.stdout.write(self.style.SUCCESS(f"Counted {counted} submissions into the daily lead rollup"))
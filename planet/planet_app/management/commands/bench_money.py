@@ -0,0 +1,66 @@
+import random
+import timeit
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app.money import Money, convert_many, format_many, parse_minor, scale_rate
+
+
+def _decimal_path(prices, rate):
+    # What display_price used to do for each price: parse, Decimal multiply, quantize, format
+    out = []
+    for value in prices:
+        amount = Decimal(str(value).replace(",", "").strip())
+        converted = (amount * rate).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        out.append(f"$ {converted:,.2f}")
+    return out
+
+
+def _money_path(minors, rate):
+    # Listing path now: amounts already in minor units (MoneyField), converted and formatted as lists
+    return format_many(convert_many(minors, rate), "USD")
+
+
+def _money_parse_path(prices, rate):
+    # Save-time path (fill_price_columns): parse the stored price string once, then convert
+    return [Money.parse(value).convert(rate, "USD").format() for value in prices]
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark per-price conversion + formatting: Decimal round-trips vs integer Money."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prices", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(42)
+        n = options["prices"]
+        prices = [f"{rnd.randrange(300_000, 50_000_000):,}" for _ in range(n)]
+        minors = [parse_minor(p) for p in prices]
+        rate = Decimal("0.27229408")
+        scaled = scale_rate(rate)
+
+        # The paths must agree before their speed means anything (a check that survives python -O)
+        sample = slice(0, 100)
+        expected = _decimal_path(prices[sample], rate)
+        for label, got in (
+            ("money per render", _money_path(minors[sample], scaled)),
+            ("money on save", _money_parse_path(prices[sample], scaled)),
+        ):
+            for price, want, have in zip(prices[sample], expected, got):
+                if want != have:
+                    raise CommandError(f"{label} disagrees with Decimal for {price}: {have!r} != {want!r}")
+
+        cases = (
+            ("decimal (string -> Decimal -> quantize)", lambda: _decimal_path(prices, rate)),
+            ("money per render (stored minor units)", lambda: _money_path(minors, scaled)),
+            ("money on save (string -> minor units)", lambda: _money_parse_path(prices, scaled)),
+        )
+        baseline = None
+        for label, fn in cases:
+            best = min(timeit.repeat(fn, number=1, repeat=options["repeat"]))
+            per_price = best / n * 1e9
+            baseline = baseline or per_price
+            self.stdout.write(f"{label:<42} {per_price:8.0f} ns/price  ({baseline / per_price:4.1f}x)")
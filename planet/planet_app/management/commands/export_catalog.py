@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app import catalog_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the full property catalog, with pricing, advantages, floors, amenities, images and every "
+        "translation, as JSON Lines (one property per line) or a zip of one CSV per table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(catalog_export.EXPORT_FORMATS), default="jsonl")
+        parser.add_argument("--batch-size", type=int, default=catalog_export.BATCH_SIZE, help="Properties (or rows) read per query.")
+        parser.add_argument("--output", default="-", help="File to write, or - for stdout.")
+
+    def handle(self, *args, **options):
+        chunks = catalog_export.export_chunks(options["format"], options["batch_size"])
+        if options["output"] == "-":
+            for data in chunks:
+                sys.stdout.buffer.write(data)
+            return
+        try:
+            with open(options["output"], "wb") as f:
+                for data in chunks:
+                    f.write(data)
+        except OSError as e:
+            raise CommandError(e)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from planet_app.static_export import EXPORT_LANGUAGES, EXPORT_ROOT, export_site
+
+
+class Command(BaseCommand):
+    help = ("Render public pages for every language into a directory tree nginx can serve directly. "
+            "Only new or changed pages are re-rendered unless --full is given.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=EXPORT_ROOT, help=f"Export root (default: {EXPORT_ROOT})")
+        parser.add_argument("--full", action="store_true", help="Re-render every page, not just stale ones.")
+        parser.add_argument("--language", action="append", choices=EXPORT_LANGUAGES, dest="languages",
+                            help="Only render these languages (repeatable).")
+
+    def handle(self, *args, **options):
+        stats = export_site(root=options["output"], full=options["full"], languages=options["languages"])
+        self.stdout.write(
+            f"rendered {stats['rendered']}, unchanged {stats['skipped']}, removed {stats['removed']}"
+        )
+        for key in stats["failed"]:
+            self.stderr.write(f"failed: {key}")
@@ -0,0 +1,34 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app import submissions
+
+
+class Command(BaseCommand):
+    help = "Stream contact submissions to a CSV or JSONL file (or stdout), optionally limited to a date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(submissions.EXPORT_FORMATS), default="csv")
+        parser.add_argument("--from", dest="date_from", help="First day to include (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", help="Last day to include (YYYY-MM-DD).")
+        parser.add_argument("--output", default="-", help="File to write, or - for stdout.")
+
+    def handle(self, *args, **options):
+        filters = submissions.clean_filters({"date_from": options["date_from"], "date_to": options["date_to"]})
+        for name in ("date_from", "date_to"):
+            if options[name] and name not in filters:
+                raise CommandError(f"Invalid date: {options[name]}")
+
+        lines = submissions.export_lines(submissions.filter_submissions(filters), options["format"])
+        if options["output"] == "-":
+            for text in lines:
+                sys.stdout.write(text)
+            return
+        try:
+            with open(options["output"], "w", newline="", encoding="utf-8") as f:
+                for text in lines:
+                    f.write(text)
+        except OSError as e:
+            raise CommandError(e)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
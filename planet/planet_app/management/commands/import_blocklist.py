@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app.blocklist import BLOCKLISTS, IMPORT_CHUNK, bulk_block, read_entries
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-add entries to a blocklist from a CSV (first column) or a file with one entry per line. "
+        "Entries already blocked are skipped; IPs may be CIDR ranges."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(BLOCKLISTS))
+        parser.add_argument("path", help="File to read, or - for stdin.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK)
+
+    def handle(self, *args, **options):
+        try:
+            if options["path"] == "-":
+                text = sys.stdin.read()
+            else:
+                with open(options["path"], encoding="utf-8-sig") as f:
+                    text = f.read()
+        except OSError as e:
+            raise CommandError(e)
+
+        kind = options["kind"]
+        stats = bulk_block(kind, read_entries(text, kind), chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{kind}: {stats['inserted']} inserted, {stats['skipped']} skipped, {stats['invalid']} invalid"
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app import catalog_import
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update properties (matched by title) with their pricing, advantages, floors, amenities "
+        "and images from a CSV, XLSX, JSON Lines or JSON file. In CSV/XLSX, pricing/advantages/floors "
+        "cells hold JSON lists and amenities/images cells '|'-separated names and media paths."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=catalog_import.FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=catalog_import.CHUNK_SIZE, help="Records per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="List what would change and roll everything back.")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        verbose = dry_run or options["verbosity"] > 1
+
+        def report(number, action, title, detail):
+            if action == "invalid":
+                self.stderr.write(f"row {number} ({title or 'untitled'}): {detail}")
+            elif verbose and action != "unchanged":
+                self.stdout.write(f"row {number} {action}: {title}" + (f" ({detail})" if detail else ""))
+
+        try:
+            records = catalog_import.read_records(options["path"], options["format"])
+            counts = catalog_import.import_catalog(records, chunk_size=options["chunk_size"], dry_run=dry_run, report=report)
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+        prefix = "Dry run, nothing saved: " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{counts['created']} created, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged, {counts['invalid']} invalid"
+        ))
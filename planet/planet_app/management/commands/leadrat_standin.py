@@ -0,0 +1,79 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            leads = json.loads(body or b"[]")
+        except ValueError:
+            leads = []
+        if server.delay:
+            time.sleep(server.delay)
+        server.batches.append(leads)
+        if server.log:
+            server.log(f"{self.path}: {len(leads)} lead(s) key={self.headers.get('API-Key', '')[:6]}...")
+        missing = any(not lead.get("mobile") for lead in leads)
+        if server.reject_status and missing:
+            # Validation error for the request as a whole, like Leadrat's 400
+            status = server.reject_status
+            response = json.dumps({"succeeded": False, "message": "mobile is required"}).encode()
+        else:
+            status = server.status
+            # One result per lead, in request order; leads without a mobile number are rejected
+            results = [
+                {"succeeded": bool(lead.get("mobile")), "leadId": f"standin-{time.time_ns()}-{i}",
+                 "message": None if lead.get("mobile") else "mobile is required"}
+                for i, lead in enumerate(leads)
+            ]
+            response = json.dumps({"succeeded": status == 200, "data": results}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_server(port=8025, status=200, delay=0.0, reject_status=None, log=None) -> ThreadingHTTPServer:
+    """
+    The stand-in server on 127.0.0.1:`port` (0 picks a free port). `status`, `delay` and
+    `reject_status` can be changed on the server while it runs; `batches` holds every payload received.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+    server.status, server.delay, server.reject_status, server.log = status, delay, reject_status, log
+    server.batches = []
+    return server
+
+
+class Command(BaseCommand):
+    help = (
+        "Local stand-in for the Leadrat integration endpoint. Run it, then set "
+        "LEADRAT_URL=http://127.0.0.1:8025/ (and EMAIL_BACKEND to the console backend) to exercise the outbox offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8025)
+        parser.add_argument("--status", type=int, default=200, help="HTTP status to answer with (e.g. 503 to test retries).")
+        parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering.")
+        parser.add_argument("--reject-status", type=int,
+                            help="Answer a request holding a lead without a mobile number with this status "
+                                 "(e.g. 400) instead of a per-lead rejection.")
+
+    def handle(self, *args, **options):
+        server = make_server(options["port"], options["status"], options["delay"], options["reject_status"],
+                             log=self.stdout.write)
+        self.stdout.write(f"Leadrat stand-in listening on http://127.0.0.1:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
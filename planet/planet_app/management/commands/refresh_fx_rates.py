@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from planet_app import fx
+
+
+class Command(BaseCommand):
+    help = "Refresh DailyFxRates from the configured FX provider (safe to run from cron on every host)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Refresh even if the stored rates are fresh.")
+
+    def handle(self, *args, **options):
+        try:
+            refreshed = fx.refresh_rates(force=options["force"])
+        except Exception as e:
+            raise CommandError(f"FX refresh failed: {e}")
+        self.stdout.write("refreshed" if refreshed else "skipped (fresh, or another worker holds the lock)")
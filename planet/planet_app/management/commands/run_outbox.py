@@ -0,0 +1,31 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from planet_app import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued CRM pushes and notification emails (OutboxMessage) with retries and backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Delivery threads.")
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain what is due now and exit (e.g. from cron).")
+        parser.add_argument("--retry-dead", action="store_true", help="Requeue dead-lettered messages first.")
+
+    def handle(self, *args, **options):
+        if options["retry_dead"]:
+            self.stdout.write(f"requeued {outbox.retry_dead()} dead-lettered messages")
+
+        with ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="outbox") as executor:
+            while True:
+                stats = outbox.drain(executor, options["batch_size"], lead_batches=options["workers"])
+                if stats:
+                    self.stdout.write(", ".join(f"{status}: {count}" for status, count in sorted(stats.items())))
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from planet_app.models import Videos
+from planet_app.transcode import transcode_video
+
+
+class Command(BaseCommand):
+    help = "Transcode pending homepage videos into an HLS ladder with a poster frame."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry videos whose last run failed.")
+        parser.add_argument("--reset-stuck", action="store_true",
+                            help="Treat videos left in 'processing' (e.g. by a killed worker) as pending.")
+        parser.add_argument("--id", type=int, action="append", dest="ids", help="Only transcode these video ids.")
+
+    def handle(self, *args, **options):
+        if options["reset_stuck"]:
+            Videos.objects.filter(hls_status="processing").update(hls_status="pending")
+
+        statuses = ["pending", "failed"] if options["retry_failed"] else ["pending"]
+        videos = Videos.objects.filter(hls_status__in=statuses)
+        if options["ids"]:
+            videos = Videos.objects.filter(id__in=options["ids"]).exclude(hls_status="processing")
+
+        for video_id in list(videos.values_list("id", flat=True)):
+            transcode_video(video_id)
+            status = Videos.objects.values_list("hls_status", flat=True).get(id=video_id)
+            self.stdout.write(f"video {video_id}: {status}")
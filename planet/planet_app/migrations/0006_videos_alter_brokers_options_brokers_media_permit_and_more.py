@@ -0,0 +1,109 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0005_brokers_projectdetails_dld_permit_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Videos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('thumbnail', models.ImageField(upload_to='videos/thumbnails')),
+                ('video', models.FileField(help_text='Upload video file', upload_to='videos')),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('hls_status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('hls_playlist', models.CharField(blank=True, help_text='HLS master playlist, relative to MEDIA_ROOT', max_length=300, null=True)),
+                ('poster', models.ImageField(blank=True, null=True, upload_to='videos/posters')),
+                ('hls_error', models.TextField(blank=True, null=True)),
+                ('transcoded_on', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Video',
+                'verbose_name_plural': 'Videos',
+                'ordering': ['-created_on'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='brokers',
+            options={'ordering': ['name'], 'verbose_name': 'Broker', 'verbose_name_plural': 'Brokers'},
+        ),
+        migrations.AddField(
+            model_name='brokers',
+            name='media_permit',
+            field=models.CharField(blank=True, help_text='Trakheesi / advertising media permit number', max_length=200, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='broker',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='properties', to='planet_app.brokers'),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='dld_qr_code',
+            field=models.ImageField(blank=True, null=True, upload_to='properties/dld_qr/'),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='ownership_type',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='project_price_text',
+            field=models.CharField(blank=True, max_length=30, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='project_price_text_ar',
+            field=models.CharField(blank=True, max_length=30, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='project_price_text_en',
+            field=models.CharField(blank=True, max_length=30, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='project_area',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='project_area_ar',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='project_area_en',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='project_units',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='project_units_ar',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='project_units_en',
+            field=models.CharField(blank=True, max_length=300, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='video_link',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
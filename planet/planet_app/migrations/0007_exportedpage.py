@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0006_videos_alter_brokers_options_brokers_media_permit_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=400, unique=True)),
+                ('path', models.CharField(max_length=400)),
+                ('stale', models.BooleanField(default=True)),
+                ('rendered_on', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
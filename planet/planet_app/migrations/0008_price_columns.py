@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:30
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import migrations, models
+
+
+def populate_price_columns(apps, schema_editor):
+    DailyFxRates = apps.get_model('planet_app', 'DailyFxRates')
+    latest = DailyFxRates.objects.order_by('-as_of_date').first()
+    rates = {'aed': Decimal('1')}
+    if latest is not None:
+        rates.update(usd=latest.aed_to_usd, eur=latest.aed_to_eur, inr=latest.aed_to_inr)
+    cent = Decimal('0.01')
+    for model_name, source in (('ProjectDetails', 'project_price'), ('PropertyPricing', 'price')):
+        model = apps.get_model('planet_app', model_name)
+        for obj in model.objects.exclude(**{f'{source}__isnull': True}).iterator():
+            try:
+                amount = Decimal(str(getattr(obj, source)).replace(',', '').strip())
+            except InvalidOperation:
+                continue
+            if not amount.is_finite():
+                continue
+            values = {f'price_{code}': (amount * rate).quantize(cent, rounding=ROUND_HALF_UP) for code, rate in rates.items()}
+            model.objects.filter(pk=obj.pk).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0007_exportedpage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectdetails',
+            name='price_aed',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='price_eur',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='price_inr',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectdetails',
+            name='price_usd',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertypricing',
+            name='price_aed',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertypricing',
+            name='price_eur',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertypricing',
+            name='price_inr',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertypricing',
+            name='price_usd',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=20, null=True),
+        ),
+        migrations.RunPython(populate_price_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:35
+
+import planet_app.money
+from django.db import migrations
+from planet_app.money import convert_minor, parse_minor, scale_rate
+
+
+def populate_minor_units(apps, schema_editor):
+    # The columns held major units; recompute every row from its source price
+    DailyFxRates = apps.get_model('planet_app', 'DailyFxRates')
+    latest = DailyFxRates.objects.order_by('-as_of_date').first()
+    rates = {'aed': 10 ** 8}
+    if latest is not None:
+        rates.update(usd=scale_rate(latest.aed_to_usd), eur=scale_rate(latest.aed_to_eur), inr=scale_rate(latest.aed_to_inr))
+    for model_name, source in (('ProjectDetails', 'project_price'), ('PropertyPricing', 'price')):
+        model = apps.get_model('planet_app', model_name)
+        for pk, price in model.objects.values_list('pk', source).iterator():
+            minor = parse_minor(price)
+            values = {f'price_{code}': None if minor is None else convert_minor(minor, rate) for code, rate in rates.items()}
+            model.objects.filter(pk=pk).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0008_price_columns'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='price_aed',
+            field=planet_app.money.MoneyField(blank=True, currency='AED', db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='price_eur',
+            field=planet_app.money.MoneyField(blank=True, currency='EUR', db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='price_inr',
+            field=planet_app.money.MoneyField(blank=True, currency='INR', db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='projectdetails',
+            name='price_usd',
+            field=planet_app.money.MoneyField(blank=True, currency='USD', db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='propertypricing',
+            name='price_aed',
+            field=planet_app.money.MoneyField(blank=True, currency='AED', editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='propertypricing',
+            name='price_eur',
+            field=planet_app.money.MoneyField(blank=True, currency='EUR', editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='propertypricing',
+            name='price_inr',
+            field=planet_app.money.MoneyField(blank=True, currency='INR', editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='propertypricing',
+            name='price_usd',
+            field=planet_app.money.MoneyField(blank=True, currency='USD', editable=False, null=True),
+        ),
+        migrations.RunPython(populate_minor_units, migrations.RunPython.noop),
+    ]
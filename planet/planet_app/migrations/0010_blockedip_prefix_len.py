@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:39
+
+import ipaddress
+
+from django.db import migrations, models
+
+
+def fill_prefix_len(apps, schema_editor):
+    # Existing rows are single addresses
+    BlockedIP = apps.get_model('planet_app', 'BlockedIP')
+    for blocked in BlockedIP.objects.filter(prefix_len__isnull=True):
+        blocked.prefix_len = ipaddress.ip_address(blocked.ip).max_prefixlen
+        blocked.save(update_fields=['prefix_len'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0009_money_price_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockedip',
+            name='prefix_len',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='blockedip',
+            name='ip',
+            field=models.GenericIPAddressField(),
+        ),
+        migrations.RunPython(fill_prefix_len, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='blockedip',
+            constraint=models.UniqueConstraint(fields=('ip', 'prefix_len'), name='unique_blocked_network'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0010_blockedip_prefix_len'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='country',
+            field=models.CharField(blank=True, max_length=2, null=True),
+        ),
+    ]
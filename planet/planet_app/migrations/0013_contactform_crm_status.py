@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0012_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='crm_lead_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='crm_pushed_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='crm_status',
+            field=models.CharField(blank=True, choices=[('queued', 'Queued'), ('pushed', 'Pushed'), ('rejected', 'Rejected'), ('failed', 'Failed')], max_length=20, null=True),
+        ),
+    ]
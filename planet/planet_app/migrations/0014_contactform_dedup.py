@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0013_contactform_crm_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='dedup_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='is_duplicate',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0014_contactform_dedup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['submitted_on', 'id'], name='contact_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['email', 'submitted_on', 'id'], name='contact_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['phone', 'submitted_on', 'id'], name='contact_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['ip', 'submitted_on', 'id'], name='contact_ip_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactform',
+            index=models.Index(fields=['subject', 'submitted_on', 'id'], name='contact_subject_idx'),
+        ),
+    ]
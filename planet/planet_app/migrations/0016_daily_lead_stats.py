@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0015_contactform_submission_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='project',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='planet_app.projectdetails'),
+        ),
+        migrations.AddField(
+            model_name='contactform',
+            name='source',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.CreateModel(
+            name='DailyLeadStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('outcome', models.CharField(choices=[('dispatched', 'Dispatched'), ('duplicate', 'Duplicate'), ('blocked', 'Blocked'), ('wrong_captcha', 'Wrong captcha'), ('crm_failed', 'CRM failed')], max_length=20)),
+                ('source', models.CharField(default='', max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='planet_app.projectdetails')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'project', 'outcome', 'source'), name='unique_daily_lead_stat')],
+            },
+        ),
+    ]
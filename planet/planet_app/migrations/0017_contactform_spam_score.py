@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0016_daily_lead_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactform',
+            name='spam_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='dailyleadstats',
+            name='outcome',
+            field=models.CharField(choices=[('dispatched', 'Dispatched'), ('duplicate', 'Duplicate'), ('blocked', 'Blocked'), ('spam', 'Spam score'), ('wrong_captcha', 'Wrong captcha'), ('crm_failed', 'CRM failed')], max_length=20),
+        ),
+    ]
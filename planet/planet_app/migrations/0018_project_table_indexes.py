@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0017_contactform_spam_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectdetails',
+            index=models.Index(fields=['title_en'], name='project_title_en_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectdetails',
+            index=models.Index(fields=['title_ar'], name='project_title_ar_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectdetails',
+            index=models.Index(fields=['project_status_en'], name='project_status_en_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectdetails',
+            index=models.Index(fields=['project_status_ar'], name='project_status_ar_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectdetails',
+            index=models.Index(fields=['is_featured'], name='project_featured_idx'),
+        ),
+    ]
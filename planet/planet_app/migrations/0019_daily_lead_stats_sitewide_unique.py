@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:19
+
+from django.db import migrations, models
+
+
+def merge_sitewide_duplicates(apps, schema_editor):
+    # Cells without a property may have been created twice by concurrent first leads
+    DailyLeadStats = apps.get_model('planet_app', 'DailyLeadStats')
+    kept = {}
+    for cell in DailyLeadStats.objects.filter(project=None).order_by('id'):
+        key = (cell.day, cell.outcome, cell.source)
+        if key in kept:
+            kept[key].count += cell.count
+            kept[key].save(update_fields=['count'])
+            cell.delete()
+        else:
+            kept[key] = cell
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0018_project_table_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_sitewide_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailyleadstats',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('day', 'outcome', 'source'), name='unique_daily_lead_stat_sitewide'),
+        ),
+    ]
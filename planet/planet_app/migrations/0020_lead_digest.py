@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planet_app', '0019_daily_lead_stats_sitewide_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -1,12 +1,16 @@
+import ipaddress
 from datetime import datetime
 
 from django.db import models
+from django.utils import timezone
 from embed_video.fields import EmbedVideoField
 
 # Create your models here.
 from django.utils.text import slugify
 from multiselectfield import MultiSelectField
 
+from .money import MoneyField
+
 
 class Amenities(models.Model):
     name = models.TextField()
@@ -149,6 +153,21 @@ class ProjectDetails(models.Model):
     meta_keywords = models.TextField(null=True, blank=True)
     meta_title = models.TextField(null=True, blank=True)
 
+    # Denormalized from project_price and the latest DailyFxRates row, in minor units (see fx.refresh_price_columns)
+    price_aed = MoneyField(currency="AED", null=True, blank=True, editable=False, db_index=True)
+    price_usd = MoneyField(currency="USD", null=True, blank=True, editable=False, db_index=True)
+    price_eur = MoneyField(currency="EUR", null=True, blank=True, editable=False, db_index=True)
+    price_inr = MoneyField(currency="INR", null=True, blank=True, editable=False, db_index=True)
+
+    class Meta:
+        # Sort columns of the dashboard property table (see property_table.py), per language column
+        indexes = [
+            models.Index(fields=["title_en"], name="project_title_en_idx"),
+            models.Index(fields=["title_ar"], name="project_title_ar_idx"),
+            models.Index(fields=["project_status_en"], name="project_status_en_idx"),
+            models.Index(fields=["project_status_ar"], name="project_status_ar_idx"),
+            models.Index(fields=["is_featured"], name="project_featured_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         self.slug = slugify(self.title)
@@ -190,6 +209,12 @@ class PropertyPricing(models.Model):
     carpet = models.CharField(max_length=300, null=True, blank=True)
     price = models.CharField(max_length=300, null=True, blank=True)
 
+    # Denormalized from price and the latest DailyFxRates row, in minor units (see fx.refresh_price_columns)
+    price_aed = MoneyField(currency="AED", null=True, blank=True, editable=False)
+    price_usd = MoneyField(currency="USD", null=True, blank=True, editable=False)
+    price_eur = MoneyField(currency="EUR", null=True, blank=True, editable=False)
+    price_inr = MoneyField(currency="INR", null=True, blank=True, editable=False)
+
 
 class PropertyAdvantages(models.Model):
     project = models.ForeignKey(ProjectDetails, on_delete=models.CASCADE)
@@ -272,13 +297,112 @@ class WebsiteContent(models.Model):
 
 
 class ContactForm(models.Model):
+    CRM_Status_Choices = (
+        ("queued", "Queued"),
+        ("pushed", "Pushed"),
+        ("rejected", "Rejected"),
+        ("failed", "Failed"),
+    )
+
     name = models.CharField(max_length=200)
     phone = models.CharField(max_length=20)
     email = models.EmailField()
     subject = models.TextField(null=True, blank=True)
     message = models.TextField(null=True, blank=True)
     ip = models.GenericIPAddressField()
+    country = models.CharField(max_length=2, null=True, blank=True)  # ISO code from the offline GeoIP database
+    project = models.ForeignKey(ProjectDetails, on_delete=models.SET_NULL, null=True, blank=True)
+    source = models.CharField(max_length=50, null=True, blank=True)  # see lead_stats.lead_source
     submitted_on = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    # Outcome of the Leadrat push for this lead (see outbox.deliver_leads)
+    crm_status = models.CharField(max_length=20, choices=CRM_Status_Choices, null=True, blank=True)
+    crm_lead_id = models.CharField(max_length=100, null=True, blank=True)
+    crm_pushed_on = models.DateTimeField(null=True, blank=True)
+    # Repeats of the same submission inside the dedup window are kept but not dispatched (see dedup.py)
+    dedup_hash = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    is_duplicate = models.BooleanField(default=False)
+    # Probability from the spam model (spam.py) at submission time; None before a model was trained
+    spam_score = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        # Keyset pagination and filters of the submissions dashboard (see submissions.py)
+        indexes = [
+            models.Index(fields=["submitted_on", "id"], name="contact_submitted_idx"),
+            models.Index(fields=["email", "submitted_on", "id"], name="contact_email_idx"),
+            models.Index(fields=["phone", "submitted_on", "id"], name="contact_phone_idx"),
+            models.Index(fields=["ip", "submitted_on", "id"], name="contact_ip_idx"),
+            models.Index(fields=["subject", "submitted_on", "id"], name="contact_subject_idx"),
+        ]
+
+
+# Open dedup windows: the unique digest makes claiming a window one atomic insert (see dedup.py)
+class LeadDigest(models.Model):
+    digest = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+
+# Lead counts per day, property, outcome and source, kept up to date by lead_stats.record
+# so dashboard trends read a few hundred rows instead of scanning ContactForm
+class DailyLeadStats(models.Model):
+    Outcome_Choices = (
+        ("dispatched", "Dispatched"),
+        ("duplicate", "Duplicate"),
+        ("blocked", "Blocked"),
+        ("spam", "Spam score"),
+        ("wrong_captcha", "Wrong captcha"),
+        ("crm_failed", "CRM failed"),
+    )
+
+    day = models.DateField()
+    project = models.ForeignKey(ProjectDetails, on_delete=models.SET_NULL, null=True, blank=True)
+    outcome = models.CharField(max_length=20, choices=Outcome_Choices)
+    source = models.CharField(max_length=50, default="")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "project", "outcome", "source"], name="unique_daily_lead_stat"),
+            # NULLs are distinct to the constraint above, so site-wide cells need their own
+            models.UniqueConstraint(
+                fields=["day", "outcome", "source"], condition=models.Q(project__isnull=True),
+                name="unique_daily_lead_stat_sitewide",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.outcome}: {self.count}"
+
+
+# Side effects of a lead (CRM push, notification email), written with the ContactForm row
+# and delivered by `manage.py run_outbox`
+class OutboxMessage(models.Model):
+    Kind_Choices = (
+        ("leadrat", "Leadrat CRM push"),
+        ("email", "Notification email"),
+    )
+    Status_Choices = (
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("dead", "Dead letter"),
+    )
+
+    kind = models.CharField(max_length=20, choices=Kind_Choices)
+    contact = models.ForeignKey(ContactForm, on_delete=models.SET_NULL, null=True, blank=True)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=Status_Choices, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    sent_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.id} ({self.status})"
 
 
 class Message(models.Model):
@@ -293,10 +417,25 @@ class BlockedEmail(models.Model):
 
 
 class BlockedIP(models.Model):
-    ip = models.GenericIPAddressField(unique=True)
+    # Network address of the blocked range; a single address is a full-length prefix (/32 or /128)
+    ip = models.GenericIPAddressField()
+    prefix_len = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["ip", "prefix_len"], name="unique_blocked_network"),
+        ]
+
+    def save(self, *args, **kwargs):
+        network = ipaddress.ip_network(f"{self.ip}/{self.prefix_len}" if self.prefix_len is not None else self.ip, strict=False)
+        self.ip = str(network.network_address)
+        self.prefix_len = network.prefixlen
+        super(BlockedIP, self).save(*args, **kwargs)
 
     def __str__(self):
-        return self.ip
+        if self.prefix_len in (None, ipaddress.ip_address(self.ip).max_prefixlen):
+            return self.ip
+        return f"{self.ip}/{self.prefix_len}"
 
 
 class BlockedWord(models.Model):
@@ -346,11 +485,23 @@ class Brokers(models.Model):
 
 
 class Videos(models.Model):
+    HLS_Status_Choices = (
+        ("pending", "Pending"),
+        ("processing", "Processing"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+    )
+
     title = models.CharField(max_length=200)
     thumbnail = models.ImageField(upload_to='videos/thumbnails')
     video = models.FileField(upload_to='videos', help_text="Upload video file")
     created_on = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    hls_status = models.CharField(max_length=20, choices=HLS_Status_Choices, default="pending")
+    hls_playlist = models.CharField(max_length=300, blank=True, null=True, help_text="HLS master playlist, relative to MEDIA_ROOT")
+    poster = models.ImageField(upload_to='videos/posters', blank=True, null=True)
+    hls_error = models.TextField(blank=True, null=True)
+    transcoded_on = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         ordering = ['-created_on']
@@ -359,3 +510,14 @@ class Videos(models.Model):
 
     def __str__(self):
         return self.title
+
+
+# One public page rendered to disk by `manage.py export_static_site`
+class ExportedPage(models.Model):
+    key = models.CharField(max_length=400, unique=True)
+    path = models.CharField(max_length=400)
+    stale = models.BooleanField(default=True)
+    rendered_on = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.key
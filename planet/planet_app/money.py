@@ -0,0 +1,181 @@
+# money.py
+# Fixed-point money: amounts are integers of minor units (fils, cents, paise) and FX rates are
+# integers scaled by RATE_SCALE, so conversion is one integer multiply and a rounded division.
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import models
+
+# ----- Constants -----
+MINOR_DIGITS = {"AED": 2, "USD": 2, "EUR": 2, "INR": 2}
+RATE_DIGITS = 8  # same precision as DailyFxRates
+RATE_SCALE = 10 ** RATE_DIGITS
+SYMBOLS = {"AED": "د.إ", "USD": "$", "EUR": "€", "INR": "₹"}
+
+_HALF = RATE_SCALE // 2
+
+
+def minor_factor(code) -> int:
+    return 10 ** MINOR_DIGITS.get(code, 2)
+
+
+def scale_rate(rate) -> int:
+    """Integer rate (RATE_SCALE units) from a Decimal/str/int rate."""
+    return int((Decimal(str(rate)) * RATE_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _is_digits(text) -> bool:
+    # ASCII only: str.isdigit() also accepts '²' and other characters int() rejects
+    return text.isascii() and text.isdigit()
+
+
+def parse_minor(value, code="AED"):
+    """
+    Minor units from a stored price string such as '1,250,000' or '1250000.5'; None if it isn't a number.
+    Parsed as digits, without a Decimal round-trip. Extra decimals are rounded half up.
+    """
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value * minor_factor(code)
+    text = str(value).replace(",", "").strip()
+    if _is_digits(text):
+        # The common case: a whole amount
+        return int(text) * minor_factor(code)
+    negative = text.startswith("-")
+    if negative or text.startswith("+"):
+        text = text[1:]
+    whole, _, frac = text.partition(".")
+    if not (whole or frac) or (whole and not _is_digits(whole)) or (frac and not _is_digits(frac)):
+        return None
+    digits = MINOR_DIGITS.get(code, 2)
+    minor = int(whole or 0) * 10 ** digits + int((frac[:digits] or "0").ljust(digits, "0"))
+    if len(frac) > digits and frac[digits] >= "5":
+        minor += 1
+    return -minor if negative else minor
+
+
+def convert_minor(minor: int, rate: int) -> int:
+    """Convert minor units with a scaled rate, rounding half away from zero."""
+    if minor < 0:
+        return -((-minor * rate + _HALF) // RATE_SCALE)
+    return (minor * rate + _HALF) // RATE_SCALE
+
+
+def convert_many(minors, rate: int) -> list:
+    """Vectorized convert_minor for a list of amounts (None entries stay None)."""
+    half, scale = _HALF, RATE_SCALE
+    return [
+        None if m is None else ((m * rate + half) // scale if m >= 0 else -((-m * rate + half) // scale))
+        for m in minors
+    ]
+
+
+# Below this many minor units a float holds minor/10**digits closely enough that
+# formatting it to `digits` places is exact, and float formatting is much cheaper
+_FLOAT_SAFE = 10 ** 15
+
+
+def format_minor(minor: int, code) -> str:
+    """'$ 1,250,000.00' style display for an amount in minor units."""
+    digits = MINOR_DIGITS.get(code, 2)
+    if -_FLOAT_SAFE < minor < _FLOAT_SAFE:
+        return f"{SYMBOLS.get(code, code)} {minor / 10 ** digits:,.{digits}f}"
+    sign = "-" if minor < 0 else ""
+    major, rest = divmod(abs(minor), 10 ** digits)
+    return f"{SYMBOLS.get(code, code)} {sign}{major:,}.{rest:0{digits}d}"
+
+
+def format_many(minors, code) -> list:
+    """Vectorized format_minor (None entries stay None)."""
+    digits = MINOR_DIGITS.get(code, 2)
+    factor, prefix, spec = 10 ** digits, f"{SYMBOLS.get(code, code)} ", f",.{digits}f"
+    return [
+        None if m is None else (
+            prefix + format(m / factor, spec) if -_FLOAT_SAFE < m < _FLOAT_SAFE else format_minor(m, code)
+        )
+        for m in minors
+    ]
+
+
+class Money:
+    """Amount in minor units of one currency. Treat as immutable: operations return new values."""
+
+    __slots__ = ("minor", "code")
+
+    def __init__(self, minor: int, code="AED"):
+        self.minor = minor
+        self.code = code
+
+    @classmethod
+    def parse(cls, value, code="AED"):
+        """Money from a price string/number, or None if it isn't a number."""
+        minor = parse_minor(value, code)
+        return None if minor is None else cls(minor, code)
+
+    @classmethod
+    def from_decimal(cls, amount, code="AED"):
+        exp = Decimal(1).scaleb(-MINOR_DIGITS.get(code, 2))
+        return cls(int((Decimal(amount) / exp).to_integral_value(rounding=ROUND_HALF_UP)), code)
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.minor).scaleb(-MINOR_DIGITS.get(self.code, 2))
+
+    def convert(self, rate: int, to_code):
+        """This amount in `to_code`, given the scaled `self.code`->`to_code` rate."""
+        return Money(convert_minor(self.minor, rate), to_code)
+
+    def format(self) -> str:
+        return format_minor(self.minor, self.code)
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return f"Money({self.minor}, {self.code!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Money) and (self.minor, self.code) == (other.minor, other.code)
+
+    def __hash__(self):
+        return hash((self.minor, self.code))
+
+    def __lt__(self, other):
+        if not isinstance(other, Money) or other.code != self.code:
+            return NotImplemented
+        return self.minor < other.minor
+
+
+# ----- Model field -----
+class MoneyField(models.BigIntegerField):
+    """
+    Amount stored as a BIGINT of minor units in a fixed currency; reads back as Money.
+    Lookups and updates accept Money or plain minor-unit integers.
+    """
+
+    def __init__(self, *args, currency="AED", **kwargs):
+        self.currency = currency
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["currency"] = self.currency
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else Money(value, self.currency)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, Money):
+            return value
+        return Money(super().to_python(value), self.currency)
+
+    def get_prep_value(self, value):
+        if isinstance(value, Money):
+            if value.code != self.currency:
+                raise ValueError(f"{self.name} holds {self.currency}, got {value.code}")
+            value = value.minor
+        return super().get_prep_value(value)
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        return "" if value is None else str(value.minor)
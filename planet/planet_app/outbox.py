@@ -0,0 +1,278 @@
+# outbox.py
+# Transactional outbox for lead side effects. send_email stores OutboxMessage rows in the
+# same transaction as the ContactForm; `manage.py run_outbox` delivers them from a thread
+# pool, retrying with exponential backoff and dead-lettering after OUTBOX_MAX_ATTEMPTS.
+# Leadrat leads go out in batches over the pooled keep-alive connections of http_client.
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import http_client, lead_stats
+from .models import ContactForm, OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# ----- Settings -----
+MAX_ATTEMPTS = getattr(settings, "OUTBOX_MAX_ATTEMPTS", 8)
+BACKOFF_BASE = getattr(settings, "OUTBOX_BACKOFF_BASE", 30)
+BACKOFF_MAX = getattr(settings, "OUTBOX_BACKOFF_MAX", 6 * 60 * 60)
+# Leads are posted to Leadrat as one list of up to LEADRAT_BATCH_SIZE, waiting at most
+# LEADRAT_BATCH_WINDOW seconds for a batch to fill
+LEADRAT_BATCH_SIZE = getattr(settings, "LEADRAT_BATCH_SIZE", 25)
+LEADRAT_BATCH_WINDOW = getattr(settings, "LEADRAT_BATCH_WINDOW", 2)
+# A message left in 'sending' this long belongs to a worker that died; it is picked up again
+LEASE = timedelta(minutes=10)
+
+
+# ----- Enqueue -----
+def enqueue(kind, payload, contact=None) -> OutboxMessage:
+    """Queue one side effect; call inside the transaction that creates `contact`."""
+    return OutboxMessage.objects.create(kind=kind, payload=payload, contact=contact)
+
+
+def lead_payload(contact, project=None) -> dict:
+    """Leadrat lead for a ContactForm row (one element of the integration's list payload)."""
+    submitted = timezone.localtime(contact.submitted_on) if contact.submitted_on else timezone.localtime()
+    lead = {
+        "name": contact.name,
+        "email": contact.email,
+        "mobile": contact.phone,
+        "notes": contact.message,
+        "source": "Website",
+        "submittedDate": submitted.strftime('%Y-%m-%d'),
+        "submittedTime": submitted.strftime('%H:%M:%S'),
+    }
+    if project:
+        lead.update({
+            "leadStatus": f"Lead for {project.title}",
+            "propertyType": f"{project.property_type}, ({project.property_type_2})",
+            "project": project.title,
+            "property": project.title,
+        })
+    return lead
+
+
+def notification_payload(contact, subject) -> dict:
+    html = "<table border='1'><tr><th>Name</th><td>" + str(
+        contact.name) + "</td></tr><tr><th>Email</th><td>" + str(
+        contact.email) + "</td></tr><tr><th>Mobile No.</th><td>" + str(
+        contact.phone) + "</td></tr><tr><th>Message</th><td>" + str(contact.message) + "</td></tr></table>"
+    return {"subject": subject, "html": html, "reply_to": [contact.email]}
+
+
+# ----- Handlers -----
+def _lead_results(body, count) -> list:
+    """
+    Per-lead results from a Leadrat response, in request order, as (ok, lead_id, error).
+    A response without one entry per lead applies to the whole batch.
+    """
+    items = body.get("data") if isinstance(body, dict) else body
+    if not isinstance(items, list) or len(items) != count:
+        return [(True, None, None)] * count
+    results = []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append((True, None, None))
+            continue
+        ok = item.get("succeeded", item.get("success", True)) is not False
+        lead_id = item.get("leadId") or item.get("id")
+        error = item.get("message") or item.get("error")
+        results.append((ok, str(lead_id) if lead_id else None, None if ok else str(error or "rejected")))
+    return results
+
+
+# 4xx statuses that are about the request as a whole (credentials, endpoint, throttling)
+# rather than about a lead in it; like 5xx and network errors they are retried
+_RETRYABLE_4XX = {401, 403, 404, 407, 408, 429}
+
+
+class LeadsRejected(Exception):
+    """Leadrat refused the request itself (4xx): some lead in it is malformed."""
+
+
+def push_leads(messages) -> list:
+    """
+    POST the leads of `messages` as one list payload. Raises LeadsRejected on a lead-level
+    4xx, other exceptions on transport, 5xx and request-level errors (the batch is retried);
+    otherwise returns one (ok, lead_id, error) per message.
+    """
+    response = http_client.post(
+        settings.LEADRAT_URL,
+        headers={"API-Key": settings.LEADRAT_API_KEY},
+        json=[m.payload for m in messages],
+        timeout=getattr(settings, "LEADRAT_TIMEOUT", 10),
+    )
+    if 400 <= response.status_code < 500 and response.status_code not in _RETRYABLE_4XX:
+        raise LeadsRejected(f"Leadrat returned {response.status_code}: {response.text[:500]}")
+    if response.status_code != 200:
+        raise RuntimeError(f"Leadrat returned {response.status_code}: {response.text[:500]}")
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    return _lead_results(body, len(messages))
+
+
+def send_notification(message):
+    payload = message.payload
+    email_msg = EmailMessage(
+        payload["subject"], payload["html"], settings.LEAD_NOTIFY_FROM, settings.LEAD_NOTIFY_TO,
+        reply_to=payload.get("reply_to"),
+    )
+    email_msg.content_subtype = 'html'
+    email_msg.send(fail_silently=False)
+
+
+HANDLERS = {
+    "email": send_notification,
+}
+
+
+# ----- Delivery -----
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number `attempts`: BACKOFF_BASE * 2^(attempts-1), capped, with jitter."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _claim(messages, limit) -> list:
+    """Mark up to `limit` of the due `messages` as 'sending' and return the ids this worker won."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(messages.order_by("next_attempt_at", "id").values_list("id", flat=True)[:limit])
+        # The status filter makes the claim safe against another worker racing for the same rows
+        OutboxMessage.objects.filter(id__in=ids, status="pending").update(status="sending", claimed_at=now)
+    return list(OutboxMessage.objects.filter(id__in=ids, status="sending", claimed_at=now).values_list("id", flat=True))
+
+
+def _due():
+    now = timezone.now()
+    OutboxMessage.objects.filter(status="sending", claimed_at__lt=now - LEASE).update(status="pending")
+    return OutboxMessage.objects.filter(status="pending", next_attempt_at__lte=now)
+
+
+def claim(limit) -> list:
+    """Claim due messages that are delivered one at a time."""
+    return _claim(_due().exclude(kind="leadrat"), limit)
+
+
+def claim_leads(limit) -> list:
+    """
+    Claim due Leadrat messages once a batch is worth sending: LEADRAT_BATCH_SIZE of them
+    are waiting, or the oldest has waited LEADRAT_BATCH_WINDOW seconds.
+    """
+    due = _due().filter(kind="leadrat")
+    oldest = due.order_by("next_attempt_at").values_list("next_attempt_at", flat=True).first()
+    if oldest is None:
+        return []
+    if oldest > timezone.now() - timedelta(seconds=LEADRAT_BATCH_WINDOW) and due.count() < LEADRAT_BATCH_SIZE:
+        return []
+    return _claim(due, limit)
+
+
+def _record(message, error=None, retry=True) -> str:
+    message.attempts += 1
+    message.claimed_at = None
+    if error is None:
+        message.status = "sent"
+        message.sent_on = timezone.now()
+        message.last_error = None
+    else:
+        message.last_error = str(error)[:2000]
+        if not retry or message.attempts >= MAX_ATTEMPTS:
+            message.status = "dead"
+            logger.error("Outbox message %s dead-lettered after %s attempts: %s", message.id, message.attempts, error)
+        else:
+            message.status = "pending"
+            message.next_attempt_at = timezone.now() + backoff(message.attempts)
+    message.save(update_fields=["attempts", "claimed_at", "status", "sent_on", "last_error", "next_attempt_at"])
+    return message.status
+
+
+def deliver(message_id) -> str:
+    """Run the handler for one claimed message and record the outcome; returns the new status."""
+    message = OutboxMessage.objects.get(id=message_id)
+    try:
+        HANDLERS[message.kind](message)
+    except Exception as e:
+        return _record(message, f"{type(e).__name__}: {e}")
+    return _record(message)
+
+
+def deliver_leads(message_ids) -> list:
+    """Push claimed Leadrat messages as one batch and record each lead's outcome on its ContactForm."""
+    return _deliver_batch(list(OutboxMessage.objects.filter(id__in=message_ids).order_by("id")))
+
+
+def _deliver_batch(batch) -> list:
+    try:
+        results = push_leads(batch)
+    except LeadsRejected as e:
+        if len(batch) > 1:
+            # Halve until the rejected leads are alone, so the good ones still go out now
+            half = len(batch) // 2
+            return _deliver_batch(batch[:half]) + _deliver_batch(batch[half:])
+        results = [(False, None, f"{type(e).__name__}: {e}")]
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        statuses = [_record(m, error) for m in batch]
+        failed = [m.contact_id for m in batch if m.status == "dead" and m.contact_id]
+        ContactForm.objects.filter(id__in=failed).update(crm_status="failed")
+        lead_stats.record_contacts(failed, "crm_failed")
+        return statuses
+
+    statuses = []
+    now = timezone.now()
+    for message, (ok, lead_id, error) in zip(batch, results):
+        statuses.append(_record(message, None if ok else error, retry=False))
+        if message.contact_id:
+            if ok:
+                ContactForm.objects.filter(id=message.contact_id).update(
+                    crm_status="pushed", crm_lead_id=lead_id, crm_pushed_on=now,
+                )
+            else:
+                # A rejected lead has no CRM record, whatever id the response carried
+                ContactForm.objects.filter(id=message.contact_id).update(crm_status="rejected")
+                lead_stats.record_contacts([message.contact_id], "crm_failed")
+    return statuses
+
+
+def _in_thread(fn, arg):
+    try:
+        return fn(arg)
+    finally:
+        connection.close()
+
+
+def drain(executor: ThreadPoolExecutor, batch_size, lead_batches=1) -> dict:
+    """
+    Claim due messages and deliver them on `executor`: up to `lead_batches` Leadrat batches,
+    plus `batch_size` other messages. Returns {status: count}.
+    """
+    futures = []
+    lead_ids = claim_leads(LEADRAT_BATCH_SIZE * lead_batches)
+    for i in range(0, len(lead_ids), LEADRAT_BATCH_SIZE):
+        futures.append(executor.submit(_in_thread, deliver_leads, lead_ids[i:i + LEADRAT_BATCH_SIZE]))
+    for message_id in claim(batch_size):
+        futures.append(executor.submit(_in_thread, deliver, message_id))
+
+    stats = {}
+    for future in futures:
+        result = future.result()
+        for status in (result if isinstance(result, list) else [result]):
+            stats[status] = stats.get(status, 0) + 1
+    return stats
+
+
+def retry_dead(ids=None) -> int:
+    """Put dead-lettered messages back in the queue with a fresh attempt budget."""
+    dead = OutboxMessage.objects.filter(status="dead")
+    if ids:
+        dead = dead.filter(id__in=ids)
+    return dead.update(status="pending", attempts=0, next_attempt_at=timezone.now())
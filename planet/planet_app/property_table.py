@@ -0,0 +1,71 @@
+# property_table.py
+# Server-side data for the dashboard property list, in the DataTables 1.10 protocol (draw,
+# start, length, search[value], order[0][...], columns[n][data]). Only one page is read,
+# as values() of the displayed columns with the city and builder names joined in, and the
+# sortable columns are indexed (ProjectDetails.Meta), so the list opens at the same speed
+# however many properties there are.
+from django.db.models import F, Q
+
+from .models import ProjectDetails
+
+MAX_LENGTH = 100
+
+# Column name (columns[n][data]) -> sort field
+SORT_FIELDS = {
+    "title": "title",
+    "city": "city__name",
+    "builder": "builder__name",
+    "status": "project_status",
+    "featured": "is_featured",
+}
+SEARCH_LOOKUPS = ("title__icontains", "city__name__icontains", "builder__name__icontains", "project_status__icontains")
+
+
+def _int(value, default, low, high) -> int:
+    try:
+        return min(max(int(value), low), high)
+    except (TypeError, ValueError):
+        return default
+
+
+def _ordering(params) -> list:
+    column = params.get(f"columns[{_int(params.get('order[0][column]'), 0, 0, 100)}][data]")
+    field = SORT_FIELDS.get(column, "title")
+    if params.get("order[0][dir]") == "desc":
+        return [f"-{field}", "-id"]
+    return [field, "id"]
+
+
+def query(params) -> dict:
+    """The DataTables response for one request's GET parameters."""
+    projects = ProjectDetails.objects.all()
+    total = projects.count()
+    search = (params.get("search[value]") or "").strip()
+    if search:
+        match = Q()
+        for lookup in SEARCH_LOOKUPS:
+            match |= Q(**{lookup: search})
+        projects = projects.filter(match)
+        filtered = projects.count()
+    else:
+        filtered = total
+
+    start = _int(params.get("start"), 0, 0, filtered)
+    length = _int(params.get("length"), 50, -1, MAX_LENGTH)
+    # length -1 is the "All" choice; capped like any other page size
+    length = MAX_LENGTH if length <= 0 else length
+    rows = projects.order_by(*_ordering(params)).values(
+        "id", "slug", "title", "project_status", "is_featured", city_name=F("city__name"), builder_name=F("builder__name"),
+    )[start:start + length]
+    return {
+        "draw": _int(params.get("draw"), 0, 0, 2 ** 31),
+        "recordsTotal": total,
+        "recordsFiltered": filtered,
+        "data": [
+            {
+                "id": row["id"], "slug": row["slug"], "title": row["title"], "city": row["city_name"] or "",
+                "builder": row["builder_name"] or "", "status": row["project_status"], "featured": row["is_featured"],
+            }
+            for row in rows
+        ],
+    }
@@ -0,0 +1,130 @@
+# ratelimit.py
+# Token-bucket rate limiting for public endpoints. Buckets live in their own file cache
+# ('ratelimit'), keyed by endpoint + client IP (and e.g. the submitted email), so every worker
+# draws from the same budget without bucket writes culling the keys in 'shared'. Each bucket
+# is read and written under a lock file (fx.RefreshLock), so two workers cannot spend the same
+# token. A throttled request gets a plain 429 before the view touches the database or network.
+import hashlib
+import math
+import os
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .client_ip import get_client_ip
+from .fx import RefreshLock
+
+# ----- Settings -----
+CACHE_ALIAS = getattr(settings, "RATE_LIMIT_CACHE_ALIAS", "ratelimit")
+# Throttle counters have no expiry, so they stay in a cache that is not culled by bucket writes
+COUNTER_CACHE_ALIAS = getattr(settings, "RATE_LIMIT_COUNTER_CACHE_ALIAS", "shared")
+# {endpoint: (burst, seconds)}: up to `burst` requests at once, refilled at burst/seconds per second
+BUDGETS = getattr(settings, "RATE_LIMITS", {})
+COUNTER_KEY = "ratelimit:throttled:{}"
+LOCK_DIR = getattr(settings, "RATE_LIMIT_LOCK_DIR", os.path.join(settings.BASE_DIR, "cache", "ratelimit_locks"))
+LOCK_WAIT = 0.5  # seconds a request waits for a bucket another worker is updating
+LOCK_TIMEOUT = 5  # a lock file this old was left behind by a dead worker
+
+
+def _lock(key):
+    lock = RefreshLock(os.path.join(LOCK_DIR, hashlib.sha1(key.encode()).hexdigest() + ".lock"), LOCK_TIMEOUT)
+    deadline = time.monotonic() + LOCK_WAIT
+    while not lock.acquire():
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.005)
+    return lock
+
+
+def _take(buckets) -> float:
+    """
+    Take one token from every (key, burst, seconds) bucket, or from none of them; returns 0 if
+    allowed, else seconds until each bucket has a token again.
+    """
+    cache = caches[CACHE_ALIAS]
+    locks = []
+    try:
+        # Locked in key order, so two requests sharing buckets cannot wait on each other
+        for key in sorted(key for key, _, _ in buckets):
+            lock = _lock(key)
+            if lock is None:
+                # Contended for longer than any update takes: refuse rather than skip the check
+                return LOCK_WAIT
+            locks.append(lock)
+        now = time.time()
+        levels = []
+        wait = 0
+        for key, burst, seconds in buckets:
+            rate = burst / seconds
+            tokens, updated = cache.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens < 1:
+                wait = max(wait, (1 - tokens) / rate)
+            levels.append(tokens)
+        if wait:
+            # Nothing stored: a refused request does not move any bucket
+            return wait
+        for (key, burst, seconds), tokens in zip(buckets, levels):
+            # A bucket left alone for `seconds` is full again, so it can simply expire
+            cache.set(key, (tokens - 1, now), math.ceil(seconds))
+        return 0
+    finally:
+        for lock in locks:
+            lock.release()
+
+
+def _identities(request, keys):
+    for key in keys:
+        if key == "ip":
+            yield "ip", get_client_ip(request)
+        elif key == "email":
+            email = (request.POST.get("email") or "").strip().casefold()
+            if email:
+                yield "email", email
+
+
+def rate_limit(endpoint, keys=("ip",)):
+    """
+    Limit a view to the RATE_LIMITS[endpoint] budget per identity in `keys` ('ip', 'email').
+    Endpoints without a configured budget are not limited.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            budget = BUDGETS.get(endpoint)
+            if budget:
+                burst, seconds = budget
+                buckets = [
+                    (f"ratelimit:{endpoint}:{kind}:{value}", burst, seconds) for kind, value in _identities(request, keys)
+                ]
+                wait = _take(buckets) if buckets else 0
+                if wait:
+                    _count(endpoint)
+                    response = HttpResponse("Too many requests, please try again shortly.", status=429,
+                                            content_type="text/plain")
+                    response["Retry-After"] = str(math.ceil(wait))
+                    return response
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _count(endpoint):
+    cache = caches[COUNTER_CACHE_ALIAS]
+    key = COUNTER_KEY.format(endpoint)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def throttled_counts() -> dict:
+    """Throttled requests per endpoint since the counters were last reset."""
+    cache = caches[COUNTER_CACHE_ALIAS]
+    return {endpoint: cache.get(COUNTER_KEY.format(endpoint), 0) for endpoint in BUDGETS}
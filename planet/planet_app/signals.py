@@ -0,0 +1,61 @@
+# signals.py
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import blocklist, fx, fx_history, lead_stats
+from .models import BlockedIP, BlockedWord, DailyFxRates, ProjectDetails, PropertyPricing
+from .static_export import DEPENDENCIES, mark_stale_for, remember_project_state
+
+
+# ----- Static export: flag pages affected by content edits -----
+@receiver(pre_save, sender=ProjectDetails)
+def remember_project_pages(sender, instance, **kwargs):
+    remember_project_state(instance)
+
+
+def mark_exported_pages_stale(sender, instance, **kwargs):
+    mark_stale_for(instance)
+
+
+for _model in DEPENDENCIES:
+    post_save.connect(mark_exported_pages_stale, sender=_model, dispatch_uid=f"export_save_{_model.__name__}")
+    post_delete.connect(mark_exported_pages_stale, sender=_model, dispatch_uid=f"export_delete_{_model.__name__}")
+
+
+# ----- FX: drop cached rates and reprice listings when a new daily row lands -----
+@receiver(post_save, sender=DailyFxRates)
+def invalidate_fx_cache(sender, instance, **kwargs):
+    fx.invalidate()
+    fx_history.record(instance)
+    latest = DailyFxRates.objects.first()
+    if latest and latest.pk == instance.pk:
+        fx.refresh_price_columns(latest)
+
+
+@receiver(pre_save, sender=ProjectDetails)
+def fill_project_price_columns(sender, instance, **kwargs):
+    fx.fill_price_columns(instance, "project_price")
+
+
+@receiver(pre_save, sender=PropertyPricing)
+def fill_pricing_price_columns(sender, instance, **kwargs):
+    fx.fill_price_columns(instance, "price")
+
+
+# ----- Blocklists: recompile in-memory matchers on change -----
+@receiver(post_save, sender=BlockedWord)
+@receiver(post_delete, sender=BlockedWord)
+def rebuild_word_matcher(sender, **kwargs):
+    blocklist.blocked_words.bump()
+
+
+@receiver(post_save, sender=BlockedIP)
+@receiver(post_delete, sender=BlockedIP)
+def rebuild_ip_trie(sender, **kwargs):
+    blocklist.blocked_ips.bump()
+
+
+# ----- Lead rollup: keep a deleted property's counts as site-wide -----
+@receiver(pre_delete, sender=ProjectDetails)
+def fold_project_lead_stats(sender, instance, **kwargs):
+    lead_stats.fold_project(instance.pk)
@@ -0,0 +1,173 @@
+# spam.py
+# Pre-dispatch spam scoring. A submission that passed the exact-match blocklists is reduced
+# to a set of cheap features (message tokens, link count, script mixing, email shape, and how
+# many ContactForm rows its IP left in the last VELOCITY_WINDOW seconds) and scored with a
+# naive Bayes model. Velocity comes from the database, so every worker and the trainer count alike.
+# `manage.py train_spam_model` learns the model offline from ContactForm rows labelled by the
+# blocklists and writes it as a JSON table of per-feature log-likelihood ratios.
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .blocklist import normalize
+from .models import ContactForm
+
+# ----- Settings -----
+MODEL_PATH = getattr(settings, "SPAM_MODEL_PATH", os.path.join(settings.BASE_DIR, "spam_model.json"))
+# Submissions scoring at or above this spam probability are rejected before the outbox
+REJECT_THRESHOLD = getattr(settings, "SPAM_REJECT_THRESHOLD", 0.99)
+VELOCITY_WINDOW = getattr(settings, "SPAM_VELOCITY_WINDOW", 3600)  # seconds
+
+
+# ----- Velocity -----
+def recent_submissions(ip, now=None) -> int:
+    """ContactForm rows from `ip` in the VELOCITY_WINDOW seconds before `now` (every submission is stored, spam too)."""
+    now = timezone.now() if now is None else now
+    return ContactForm.objects.filter(ip=ip, submitted_on__gt=now - timedelta(seconds=VELOCITY_WINDOW)).count()
+
+
+class VelocityWindow:
+    """
+    recent_submissions() for rows replayed in submission order, without a query per row:
+    train_spam_model gets the count each stored row had when it was scored.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.hits = {}
+
+    def hit(self, key, now) -> int:
+        """Record a submission from `key` at timestamp `now` and return how many it made in the window before it."""
+        times = self.hits.setdefault(key, deque())
+        while times and times[0] <= now - self.seconds:
+            times.popleft()
+        count = len(times)
+        times.append(now)
+        return count
+
+
+# ----- Features -----
+_LINK = re.compile(r"https?://|www\.|\b[\w-]+\.(?:com|net|org|ru|cn|xyz|top|info|biz|io|ly)\b", re.IGNORECASE)
+_WORD = re.compile(r"\w+")
+_DIGITS = re.compile(r"\d")
+
+
+def _bucket(n, edges) -> str:
+    for edge in edges:
+        if n <= edge:
+            return str(edge)
+    return f"{edges[-1]}+"
+
+
+def _script(ch) -> str:
+    # First word of the Unicode name: LATIN, ARABIC, CYRILLIC, CJK, ...
+    return unicodedata.name(ch, "?").split(" ", 1)[0]
+
+
+def features(name, email, message, recent=0) -> set:
+    """Feature tokens for one submission; `recent` is the IP's count from recent_submissions."""
+    name, email, message = name or "", (email or "").lower(), message or ""
+    found = {f"w:{word}" for word in normalize(message).split() if 1 < len(word) <= 30}
+
+    found.add("links:" + _bucket(len(_LINK.findall(message)), (0, 1, 3)))
+    found.add("len:" + _bucket(len(message), (0, 20, 80, 300, 1000)))
+    found.add("rate:" + _bucket(recent, (0, 1, 4)))
+
+    scripts = set()
+    for word in _WORD.findall(message + " " + name):
+        word_scripts = {_script(ch) for ch in word if ch.isalpha()}
+        if len(word_scripts) > 1:
+            # Letters of two alphabets in one word: a homoglyph trick
+            found.add("mixed:word")
+        scripts |= word_scripts
+    found.add("scripts:" + "+".join(sorted(scripts)[:3]) if scripts else "scripts:none")
+
+    local, _, domain = email.partition("@")
+    found.add(f"dom:{domain}")
+    if len(_DIGITS.findall(local)) >= 4:
+        found.add("email:digits")
+    if _DIGITS.search(name):
+        found.add("name:digits")
+    if _LINK.search(name):
+        found.add("name:link")
+    return found
+
+
+# ----- Model -----
+class SpamModel:
+    """Naive Bayes over feature presence: prior log-odds plus one log-likelihood ratio per known feature."""
+
+    def __init__(self, prior, weights):
+        self.prior = prior
+        self.weights = weights
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["prior"], data["weights"])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"prior": self.prior, "weights": self.weights}, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def train(cls, samples, min_count=3, max_features=20000):
+        """Model from (features, is_spam) pairs with Laplace smoothing; rare features are dropped."""
+        counts = {}
+        totals = [0, 0]  # ham, spam
+        for found, is_spam in samples:
+            totals[is_spam] += 1
+            for feature in found:
+                pair = counts.setdefault(feature, [0, 0])
+                pair[is_spam] += 1
+        ham, spam = totals
+        if not ham or not spam:
+            raise ValueError(f"need both spam and ham samples (got {spam} spam, {ham} ham)")
+        weights = {
+            feature: round(math.log((s + 1) / (spam + 2)) - math.log((h + 1) / (ham + 2)), 3)
+            for feature, (h, s) in counts.items() if h + s >= min_count
+        }
+        kept = sorted(weights, key=lambda feature: abs(weights[feature]), reverse=True)[:max_features]
+        return cls(round(math.log(spam / ham), 3), {feature: weights[feature] for feature in kept})
+
+    def probability(self, found) -> float:
+        weights = self.weights
+        log_odds = self.prior + sum(weights.get(feature, 0.0) for feature in found)
+        if log_odds < -50:
+            return 0.0
+        return 1 / (1 + math.exp(-min(log_odds, 50)))
+
+
+_loaded = (None, None)  # (mtime, model)
+_load_lock = threading.Lock()
+
+
+def model():
+    """The trained model, reloaded when the file changes; None until one has been trained."""
+    global _loaded
+    try:
+        mtime = os.stat(MODEL_PATH).st_mtime
+    except OSError:
+        return None
+    if _loaded[0] != mtime:
+        with _load_lock:
+            if _loaded[0] != mtime:
+                _loaded = (mtime, SpamModel.load(MODEL_PATH))
+    return _loaded[1]
+
+
+def score(name, email, message, ip):
+    """Spam probability of a submission, scored before it is stored; None without a model."""
+    current = model()
+    if current is None:
+        return None
+    return current.probability(features(name, email, message, recent_submissions(ip)))
@@ -0,0 +1,225 @@
+# static_export.py
+import os
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import *
+
+# ----- Settings -----
+EXPORT_ROOT = getattr(settings, "STATIC_EXPORT_ROOT", os.path.join(settings.BASE_DIR, "static_export"))
+EXPORT_HOST = getattr(settings, "STATIC_EXPORT_HOST", settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else "localhost")
+EXPORT_LANGUAGES = [code for code, _ in settings.LANGUAGES]
+
+# Exported pages carry a CSRF token baked in at render time; swap in a live one on load.
+CSRF_REFRESH_SNIPPET = """<script>
+(function () {
+  var xhr = new XMLHttpRequest();
+  xhr.open('GET', '/csrf-token');
+  xhr.onload = function () {
+    if (xhr.status !== 200) return;
+    var token = JSON.parse(xhr.responseText).token;
+    var inputs = document.querySelectorAll('input[name="csrfmiddlewaretoken"]');
+    for (var i = 0; i < inputs.length; i++) inputs[i].value = token;
+  };
+  xhr.send();
+})();
+</script>
+"""
+
+# Pages whose content changes with every page (nav, footer, common context)
+ALL = "*"
+
+
+# ----- Page registry -----
+def public_pages() -> dict:
+    """Every exportable public page as {key: url path}."""
+    pages = {
+        "home": reverse("index"),
+        "properties": reverse("properties"),
+        "contact": reverse("contact_us"),
+        "about": reverse("about_us"),
+        "why": reverse("why_planets_properties"),
+        "team": reverse("our_team"),
+        "awards": reverse("awards_and_recognitions"),
+        "events": reverse("events_all"),
+        "disclaimer": reverse("disclaimer"),
+        "blogs": reverse("blog_list"),
+    }
+    for slug in Cities.objects.exclude(slug__isnull=True).values_list("slug", flat=True):
+        pages[f"city:{slug}"] = reverse("properties_city", args=[slug])
+    for slug in ProjectDetails.objects.exclude(slug__isnull=True).values_list("slug", flat=True):
+        pages[f"property:{slug}"] = reverse("single_property", args=[slug])
+    for slug in Blog.objects.exclude(slug__isnull=True).values_list("slug", flat=True):
+        pages[f"blog:{slug}"] = reverse("blog_detail", args=[slug])
+    for slug in EventsAndCampaigns.objects.exclude(slug__isnull=True).values_list("slug", flat=True):
+        pages[f"event:{slug}"] = reverse("events_single", args=[slug])
+    return pages
+
+
+# ----- Dependency map -----
+# Keys ending in ':' mark every page with that prefix (e.g. 'property:' = all property pages).
+LISTINGS = {"home", "properties", "city:"}
+STATIC_PAGES = {"home", "properties", "contact", "about", "why", "team", "awards", "events"}
+
+
+def _project_pages(project) -> set:
+    keys = {"home", "properties", f"property:{project.slug}"}
+    if project.city_id:
+        keys.add(f"city:{project.city.slug}")
+    if project.is_featured:
+        # Featured projects appear in the sidebar of every property and event page
+        keys |= {"property:", "event:"}
+    previous = getattr(project, "_export_previous", None)
+    if previous:
+        # Values captured in pre_save: the page set the project was on before this edit
+        if previous["property_type_2"] != project.property_type_2:
+            # "Looking for" options in the navigation come from property_type_2
+            return {ALL}
+        keys.add(f"property:{previous['slug']}")
+        if previous["city_slug"]:
+            keys.add(f"city:{previous['city_slug']}")
+        if previous["is_featured"]:
+            keys |= {"property:", "event:"}
+    return keys
+
+
+def remember_project_state(project):
+    """Capture the pre-edit values of a project so its old pages are refreshed too."""
+    if not project.pk:
+        # A new project only changes the navigation if it brings a new property_type_2
+        known_type = ProjectDetails.objects.filter(property_type_2=project.property_type_2).exists()
+        project._export_previous = {
+            "property_type_2": project.property_type_2 if known_type else None,
+            "slug": project.slug, "city_slug": None, "is_featured": False,
+        }
+        return
+    project._export_previous = (
+        ProjectDetails.objects.filter(pk=project.pk)
+        .values("property_type_2", "slug", "is_featured", city_slug=models.F("city__slug"))
+        .first()
+    )
+
+
+def _child_pages(child) -> set:
+    return _project_pages(child.project)
+
+
+DEPENDENCIES = {
+    WebsiteContent: lambda obj: {ALL},
+    Cities: lambda obj: {ALL},
+    Message: lambda obj: LISTINGS | {"property:"},
+    Pages: lambda obj: STATIC_PAGES,
+    ProjectDetails: _project_pages,
+    PropertyImages: _child_pages,
+    # Prices show on the listing cards too
+    PropertyPricing: _child_pages,
+    PropertyAdvantages: lambda obj: {f"property:{obj.project.slug}"},
+    PropertyFloors: lambda obj: {f"property:{obj.project.slug}"},
+    PropertyAmenities: lambda obj: {f"property:{obj.project.slug}"},
+    Amenities: lambda obj: {"property:"},
+    Builder: lambda obj: LISTINGS | {"property:"},
+    Brokers: lambda obj: {"home", "property:"},
+    Blog: lambda obj: {"blogs", f"blog:{obj.slug}"},
+    EventsAndCampaigns: lambda obj: {"home", "events", f"event:{obj.slug}"},
+    TeamMembers: lambda obj: {"team"},
+    AwardsAndRecognitions: lambda obj: {"awards"},
+    Testimonials: lambda obj: {"home"},
+    Association: lambda obj: {"home"},
+    Videos: lambda obj: {"home"},
+}
+
+
+def mark_stale(keys):
+    """Flag exported pages for re-rendering on the next incremental export."""
+    if ALL in keys:
+        ExportedPage.objects.update(stale=True)
+        return
+    exact = [k for k in keys if not k.endswith(":")]
+    ExportedPage.objects.filter(key__in=exact).update(stale=True)
+    for prefix in (k for k in keys if k.endswith(":")):
+        ExportedPage.objects.filter(key__startswith=prefix).update(stale=True)
+
+
+def mark_stale_for(instance):
+    deps = DEPENDENCIES.get(type(instance))
+    if deps is None:
+        return
+    try:
+        keys = deps(instance)
+    except ObjectDoesNotExist:
+        # Parent already gone (cascade delete); its own signal covers the pages
+        return
+    mark_stale(keys)
+
+
+# ----- Rendering -----
+def _file_for(root, lang, path) -> str:
+    return os.path.join(root, lang, path.strip("/"), "index.html")
+
+
+def _write_atomic(dest, content: bytes):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = dest + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, dest)
+
+
+def _client(lang) -> Client:
+    client = Client(HTTP_HOST=EXPORT_HOST, HTTP_ACCEPT_LANGUAGE=lang)
+    client.cookies[settings.LANGUAGE_COOKIE_NAME] = lang
+    return client
+
+
+def export_site(root=None, full=False, languages=None) -> dict:
+    """
+    Render public pages for each language into `root/<lang>/<path>/index.html`, priced in
+    the base currency (the export client has no session) and without query parameters;
+    visitors with another currency (they carry the currency cookie) and requests with a query
+    string, e.g. filtered listings, are served by Django instead.
+    Incremental by default: only pages that are new or flagged stale are rendered,
+    and pages that no longer exist are removed. A page only stops being stale once it has
+    been rendered in every EXPORT_LANGUAGES language, so a `languages` subset leaves it for the next run.
+    """
+    root = root or EXPORT_ROOT
+    languages = languages or EXPORT_LANGUAGES
+    pages = public_pages()
+    known = {p.key: p for p in ExportedPage.objects.all()}
+    stats = {"rendered": 0, "skipped": 0, "removed": 0, "failed": []}
+
+    for key in set(known) - set(pages):
+        for lang in EXPORT_LANGUAGES:
+            dest = _file_for(root, lang, known[key].path)
+            if os.path.exists(dest):
+                os.remove(dest)
+        known[key].delete()
+        stats["removed"] += 1
+
+    todo = {k: p for k, p in pages.items() if full or k not in known or known[k].stale or known[k].path != p}
+    stats["skipped"] = len(pages) - len(todo)
+    clients = {lang: _client(lang) for lang in languages}
+    complete = set(EXPORT_LANGUAGES) <= set(languages)
+    for key, path in sorted(todo.items()):
+        if complete:
+            # Clear the flag before rendering, so an edit that lands mid-render marks it again
+            ExportedPage.objects.update_or_create(key=key, defaults={"path": path, "stale": False})
+        ok = True
+        for lang, client in clients.items():
+            resp = client.get(path)
+            if resp.status_code != 200:
+                ok = False
+                continue
+            html = resp.content.replace(b"</body>", CSRF_REFRESH_SNIPPET.encode() + b"</body>", 1)
+            _write_atomic(_file_for(root, lang, path), html)
+        if not ok:
+            ExportedPage.objects.filter(key=key).update(stale=True)
+            stats["failed"].append(key)
+            continue
+        if complete:
+            ExportedPage.objects.filter(key=key).update(rendered_on=timezone.now())
+        stats["rendered"] += 1
+    return stats
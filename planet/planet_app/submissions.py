@@ -0,0 +1,179 @@
+# submissions.py
+# Filtering, keyset pagination and streaming export of ContactForm rows for the submissions dashboard.
+# Pages are read newest first along (submitted_on, id); a cursor holds the boundary row's
+# key, so a page costs one index range scan whatever its depth. Every filter is backed by
+# a (column, submitted_on, id) index on ContactForm.
+import base64
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ContactForm
+
+# ----- Settings -----
+PAGE_SIZE = getattr(settings, "SUBMISSIONS_PAGE_SIZE", 50)
+EXPORT_CHUNK = getattr(settings, "SUBMISSIONS_EXPORT_CHUNK", 2000)
+
+FILTERS = ("date_from", "date_to", "email", "phone", "ip", "subject")
+
+
+# ----- Filters -----
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def clean_filters(params) -> dict:
+    """The recognised, non-empty filters from a GET QueryDict (dates parsed, bad dates dropped)."""
+    filters = {}
+    for name in FILTERS:
+        value = (params.get(name) or "").strip()
+        if not value:
+            continue
+        if name.startswith("date_"):
+            value = _parse_date(value)
+            if value is None:
+                continue
+        filters[name] = value
+    return filters
+
+
+def filter_submissions(filters, queryset=None):
+    """
+    ContactForm rows matching `filters` (see clean_filters). Dates are inclusive local days;
+    the text filters match exactly, which keeps each one a single index range scan.
+    """
+    qs = ContactForm.objects.all() if queryset is None else queryset
+    if "date_from" in filters:
+        qs = qs.filter(submitted_on__gte=_day_start(filters["date_from"]))
+    if "date_to" in filters:
+        qs = qs.filter(submitted_on__lt=_day_start(filters["date_to"] + timedelta(days=1)))
+    for name in ("email", "phone", "ip", "subject"):
+        if name in filters:
+            qs = qs.filter(**{name: filters[name]})
+    return qs
+
+
+# ----- Keyset pagination -----
+def encode_cursor(row) -> str:
+    stamp = row.submitted_on.isoformat() if row.submitted_on else ""
+    return base64.urlsafe_b64encode(f"{stamp}|{row.id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(value):
+    """(submitted_on or None, id) from a cursor, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        stamp, _, row_id = raw.rpartition("|")
+        return (datetime.fromisoformat(stamp) if stamp else None), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _older(queryset, key, n) -> list:
+    # Up to n rows after `key` in newest-first order: dated rows newest first, then the
+    # undated (pre-timestamp) rows by id. Each part is a single range scan of its index.
+    submitted_on, row_id = key or (False, None)
+    if submitted_on is None:
+        return list(queryset.filter(submitted_on__isnull=True, id__lt=row_id).order_by("-id")[:n])
+    dated = queryset.filter(submitted_on__isnull=False)
+    if key:
+        dated = dated.filter(submitted_on__lte=submitted_on).exclude(submitted_on=submitted_on, id__gte=row_id)
+    rows = list(dated.order_by("-submitted_on", "-id")[:n])
+    if len(rows) < n:
+        rows += list(queryset.filter(submitted_on__isnull=True).order_by("-id")[:n - len(rows)])
+    return rows
+
+
+def _newer(queryset, key, n) -> list:
+    # Up to n rows before `key` in newest-first order, nearest first
+    submitted_on, row_id = key
+    if submitted_on is not None:
+        return list(queryset.filter(submitted_on__gte=submitted_on)
+                    .exclude(submitted_on=submitted_on, id__lte=row_id)
+                    .order_by("submitted_on", "id")[:n])
+    rows = list(queryset.filter(submitted_on__isnull=True, id__gt=row_id).order_by("id")[:n])
+    if len(rows) < n:
+        rows += list(queryset.filter(submitted_on__isnull=False).order_by("submitted_on", "id")[:n - len(rows)])
+    return rows
+
+
+def page(queryset, after=None, before=None, size=PAGE_SIZE) -> dict:
+    """
+    One newest-first page of `queryset`: the rows following the `after` cursor, or preceding
+    the `before` cursor, or the newest rows. Returns {'rows', 'next', 'previous'} where the
+    last two are cursors for the neighbouring pages (None at either end).
+    """
+    after_key = decode_cursor(after) if after else None
+    before_key = decode_cursor(before) if before else None
+
+    if before_key:
+        rows = _newer(queryset, before_key, size + 1)
+        if len(rows) > size:
+            rows = rows[:size][::-1]
+            return {"rows": rows, "previous": encode_cursor(rows[0]), "next": encode_cursor(rows[-1])}
+        # Back at the newest rows: serve a full first page
+        after_key = None
+
+    rows = _older(queryset, after_key, size + 1)
+    has_more = len(rows) > size
+    rows = rows[:size]
+    return {
+        "rows": rows,
+        "previous": encode_cursor(rows[0]) if rows and after_key else None,
+        "next": encode_cursor(rows[-1]) if rows and has_more else None,
+    }
+
+
+# ----- Export -----
+EXPORT_FIELDS = (
+    "id", "submitted_on", "name", "email", "phone", "subject", "message", "ip", "country",
+    "crm_status", "crm_lead_id", "is_duplicate",
+)
+EXPORT_FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+class _Line:
+    """File-like target for csv.writer that hands back each formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def _export_values(row):
+    submitted_on = row[1]
+    return (row[0], timezone.localtime(submitted_on).isoformat() if submitted_on else None) + row[2:]
+
+
+def export_lines(queryset, fmt="csv"):
+    """
+    Generator of CSV or JSONL text for `queryset`, oldest first. Rows are read as tuples
+    EXPORT_CHUNK at a time with iterator(), and each chunk is emitted as one string, so
+    memory stays flat however many rows are exported.
+    """
+    rows = queryset.order_by("submitted_on", "id").values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK)
+    if fmt == "csv":
+        writer = csv.writer(_Line())
+        yield writer.writerow(EXPORT_FIELDS)
+        encode = writer.writerow
+    else:
+        def encode(values):
+            return json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False) + "\n"
+
+    buffer = []
+    for row in rows:
+        buffer.append(encode(_export_values(row)))
+        if len(buffer) >= EXPORT_CHUNK:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
@@ -1,3 +1,229 @@
-from django.test import TestCase
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import catalog, outbox, ratelimit
+from .management.commands.leadrat_standin import make_server
+from .models import ContactForm, OutboxMessage, ProjectDetails, PropertyAdvantages
+
+
+class OutboxTestCase(TestCase):
+    """Runs the outbox against the Leadrat stand-in on a free local port and Django's locmem mail backend."""
+
+    def setUp(self):
+        self.server = make_server(port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        settings = override_settings(LEADRAT_URL=f"http://127.0.0.1:{self.server.server_address[1]}/")
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Batches go out as soon as something is due
+        patcher = mock.patch.object(outbox, "LEADRAT_BATCH_WINDOW", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def lead(self, phone="0500000000"):
+        contact = ContactForm.objects.create(
+            name="Test", email="test@example.com", phone=phone, message="Hello", ip="127.0.0.1", crm_status="queued",
+        )
+        return contact, outbox.enqueue("leadrat", outbox.lead_payload(contact), contact)
+
+    def drain(self):
+        """What outbox.drain does, on this thread (worker threads would not see the test transaction)."""
+        statuses = []
+        lead_ids = outbox.claim_leads(outbox.LEADRAT_BATCH_SIZE)
+        if lead_ids:
+            statuses += outbox.deliver_leads(lead_ids)
+        statuses += [outbox.deliver(message_id) for message_id in outbox.claim(50)]
+        return statuses
+
+    def make_due(self):
+        OutboxMessage.objects.filter(status="pending").update(next_attempt_at=timezone.now())
+
+
+class DeliveryTests(OutboxTestCase):
+    def test_leads_and_notifications_are_delivered(self):
+        contact, _ = self.lead()
+        outbox.enqueue("email", outbox.notification_payload(contact, "New lead"), contact)
+
+        self.assertEqual(sorted(self.drain()), ["sent", "sent"])
+        self.assertEqual(len(self.server.batches), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "New lead")
+        contact.refresh_from_db()
+        self.assertEqual(contact.crm_status, "pushed")
+        self.assertTrue(contact.crm_lead_id.startswith("standin-"))
+
+    def test_server_errors_are_retried_with_backoff(self):
+        contact, message = self.lead()
+        self.server.status = 503
+
+        before = timezone.now()
+        self.assertEqual(self.drain(), ["pending"])
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+        self.assertIn("503", message.last_error)
+        # First retry waits BACKOFF_BASE seconds, +-20% jitter
+        self.assertGreaterEqual(message.next_attempt_at, before + timedelta(seconds=outbox.BACKOFF_BASE * 0.8))
+        self.assertEqual(self.drain(), [], "not due again before its backoff")
+
+        self.server.status = 200
+        self.make_due()
+        self.assertEqual(self.drain(), ["sent"])
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 2)
+        contact.refresh_from_db()
+        self.assertEqual(contact.crm_status, "pushed")
+
+    def test_backoff_doubles_and_is_capped(self):
+        with mock.patch.object(outbox.random, "uniform", return_value=1):
+            self.assertEqual(outbox.backoff(1), timedelta(seconds=outbox.BACKOFF_BASE))
+            self.assertEqual(outbox.backoff(3), timedelta(seconds=outbox.BACKOFF_BASE * 4))
+            self.assertEqual(outbox.backoff(50), timedelta(seconds=outbox.BACKOFF_MAX))
+
+    def test_dead_lettered_after_max_attempts(self):
+        contact, message = self.lead()
+        self.server.status = 503
+        OutboxMessage.objects.filter(id=message.id).update(attempts=outbox.MAX_ATTEMPTS - 1)
+
+        with self.assertLogs("planet_app.outbox", "ERROR"):
+            self.assertEqual(self.drain(), ["dead"])
+        contact.refresh_from_db()
+        self.assertEqual(contact.crm_status, "failed")
+
+        self.assertEqual(outbox.retry_dead(), 1)
+        self.server.status = 200
+        self.assertEqual(self.drain(), ["sent"])
+
+    def test_failed_notification_is_retried(self):
+        contact, _ = self.lead()
+        message = outbox.enqueue("email", outbox.notification_payload(contact, "New lead"), contact)
+        with mock.patch.object(outbox.EmailMessage, "send", side_effect=OSError("SMTP down")):
+            self.assertEqual(sorted(self.drain()), ["pending", "sent"])
+        message.refresh_from_db()
+        self.assertIn("SMTP down", message.last_error)
+
+        self.make_due()
+        self.assertEqual(self.drain(), ["sent"])
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class BatchRejectionTests(OutboxTestCase):
+    def test_rejected_batch_is_split_until_the_bad_lead_is_alone(self):
+        self.server.reject_status = 400
+        leads = [self.lead() for _ in range(3)] + [self.lead(phone="")] + [self.lead() for _ in range(4)]
+
+        with self.assertLogs("planet_app.outbox", "ERROR"):
+            self.assertEqual(sorted(self.drain()), ["dead"] + ["sent"] * 7)
+        # The rejected halves are split again until the bad lead is alone; the rest go through
+        self.assertEqual([len(batch) for batch in self.server.batches], [8, 4, 2, 2, 1, 1, 4])
+        statuses = dict(ContactForm.objects.values_list("id", "crm_status"))
+        for index, (contact, message) in enumerate(leads):
+            message.refresh_from_db()
+            self.assertEqual(message.status, "dead" if index == 3 else "sent")
+            self.assertEqual(statuses[contact.id], "rejected" if index == 3 else "pushed")
+
+    def test_lead_rejected_in_results_is_dead_lettered(self):
+        good, _ = self.lead()
+        bad, bad_message = self.lead(phone="")
+
+        with self.assertLogs("planet_app.outbox", "ERROR"):
+            self.assertEqual(sorted(self.drain()), ["dead", "sent"])
+        self.assertEqual(len(self.server.batches), 1)
+        bad_message.refresh_from_db()
+        self.assertEqual(bad_message.last_error, "mobile is required")
+        bad.refresh_from_db()
+        self.assertEqual(bad.crm_status, "rejected")
+        self.assertIsNone(bad.crm_lead_id)
+        self.assertIsNone(bad.crm_pushed_on)
+
+    def test_request_level_4xx_is_retried_not_split(self):
+        self.lead()
+        self.lead()
+        self.server.status = 401
+
+        self.assertEqual(self.drain(), ["pending", "pending"])
+        self.assertEqual(len(self.server.batches), 1)
+
+
+@mock.patch.object(ratelimit, "BUDGETS", {})
+class SubmissionTransactionTests(TestCase):
+    def post(self):
+        return self.client.post("/send-email", {
+            "name": "Test", "email": "test@example.com", "phone": "0500000000", "message": "Interested in a villa",
+            "num1": "2", "num2": "3", "answer_quiz": "5", "check_field": "",
+        }, HTTP_REFERER="/contact")
+
+    def test_submission_and_outbox_rows_are_created_together(self):
+        self.post()
+        contact = ContactForm.objects.get()
+        self.assertEqual(contact.crm_status, "queued")
+        self.assertEqual(
+            sorted(OutboxMessage.objects.filter(contact=contact).values_list("kind", flat=True)), ["email", "leadrat"]
+        )
+
+    def test_failed_enqueue_rolls_back_the_submission(self):
+        real_enqueue = outbox.enqueue
+
+        def enqueue(kind, payload, contact=None):
+            if kind == "email":
+                raise RuntimeError("database unavailable")
+            return real_enqueue(kind, payload, contact)
+
+        with mock.patch.object(outbox, "enqueue", side_effect=enqueue), self.assertRaises(RuntimeError):
+            self.post()
+        self.assertFalse(ContactForm.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+        # The dedup window was rolled back too, so the retry goes out
+        self.post()
+        self.assertFalse(ContactForm.objects.get().is_duplicate)
+
+    def test_repeat_is_recorded_as_duplicate(self):
+        self.post()
+        self.post()
+        self.assertEqual(sorted(ContactForm.objects.values_list("is_duplicate", flat=True)), [False, True])
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+
+
+class CatalogSyncTests(TestCase):
+    def titles(self, project):
+        return list(PropertyAdvantages.objects.filter(project=project).order_by("id").values_list("title", flat=True))
+
+    def test_children_keep_form_order(self):
+        project = ProjectDetails.objects.create(title="Test tower")
+        catalog.sync_advantages(project, [{"title": t, "distance": "1 km"} for t in ("1BR", "2BR", "3BR")])
+
+        written = catalog.sync_advantages(project, [{"title": t, "distance": "1 km"} for t in ("1BR", "3BR", "4BR")])
+        self.assertEqual(self.titles(project), ["1BR", "3BR", "4BR"])
+        self.assertEqual(written, 2)
+        self.assertEqual(catalog.sync_advantages(project, [{"title": "4BR", "distance": "1 km"}]), 3)
+        self.assertEqual(self.titles(project), ["4BR"])
+
+
+class RateLimitTests(TestCase):
+    def key(self, name):
+        key = f"ratelimit:test:{name}:{uuid.uuid4().hex}"
+        self.addCleanup(caches[ratelimit.CACHE_ALIAS].delete, key)
+        return key
+
+    def test_concurrent_requests_cannot_spend_the_same_token(self):
+        bucket = (self.key("ip"), 5, 600)
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            waits = list(executor.map(lambda _: ratelimit._take([bucket]), range(20)))
+        self.assertEqual(waits.count(0), 5)
+
+    def test_refused_request_charges_no_bucket(self):
+        ip, email = (self.key("ip"), 5, 600), (self.key("email"), 1, 600)
+        self.assertEqual(ratelimit._take([ip, email]), 0)
+        self.assertGreater(ratelimit._take([ip, email]), 0)
+        tokens, _ = caches[ratelimit.CACHE_ALIAS].get(ip[0])
+        self.assertAlmostEqual(tokens, 4, places=2)
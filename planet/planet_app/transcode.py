@@ -0,0 +1,173 @@
+# transcode.py
+import json
+import os
+import shutil
+import subprocess
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Videos
+from .static_export import mark_stale
+
+# ----- Settings -----
+FFMPEG_BINARY = getattr(settings, "FFMPEG_BINARY", "ffmpeg")
+FFPROBE_BINARY = getattr(settings, "FFPROBE_BINARY", "ffprobe")
+# (height, video bitrate, audio bitrate); rungs taller than the source are skipped
+HLS_LADDER = getattr(settings, "HLS_LADDER", [
+    (1080, "5000k", "192k"),
+    (720, "2800k", "128k"),
+    (480, "1400k", "128k"),
+    (360, "800k", "96k"),
+])
+HLS_SEGMENT_SECONDS = getattr(settings, "HLS_SEGMENT_SECONDS", 4)
+HLS_OUTPUT_DIR = "videos/hls"
+TRANSCODE_TIMEOUT = getattr(settings, "VIDEO_TRANSCODE_TIMEOUT", 60 * 60)
+
+# One ffmpeg run per worker process at a time; extra uploads wait their turn.
+_slots = threading.BoundedSemaphore(getattr(settings, "VIDEO_TRANSCODE_CONCURRENCY", 1))
+
+
+# ----- ffmpeg helpers -----
+def _output_dir(video_id) -> str:
+    return os.path.join(settings.MEDIA_ROOT, HLS_OUTPUT_DIR, str(video_id))
+
+
+def _probe(path: str):
+    """(height, has_audio) of the source; height is None if ffprobe can't tell."""
+    cmd = [FFPROBE_BINARY, "-v", "error", "-show_entries", "stream=codec_type,height", "-of", "json", path]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True, timeout=60).stdout
+        streams = json.loads(out).get("streams", [])
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None, True
+    heights = [s["height"] for s in streams if s.get("codec_type") == "video" and s.get("height")]
+    has_audio = any(s.get("codec_type") == "audio" for s in streams)
+    return (int(heights[0]) if heights else None), has_audio
+
+
+def _ladder_for(height):
+    rungs = [r for r in HLS_LADDER if height is None or r[0] <= height]
+    # Always emit at least the smallest rung, even for tiny sources
+    return rungs or [min(HLS_LADDER)]
+
+
+def _hls_command(src: str, out_dir: str, ladder, has_audio: bool) -> list:
+    n = len(ladder)
+    split = f"[0:v]split={n}" + "".join(f"[v{i}]" for i in range(n))
+    scales = [f"[v{i}]scale=-2:{h}[v{i}out]" for i, (h, _, _) in enumerate(ladder)]
+    cmd = [FFMPEG_BINARY, "-y", "-i", src, "-filter_complex", ";".join([split] + scales)]
+    for i, (_, v_rate, a_rate) in enumerate(ladder):
+        cmd += [
+            "-map", f"[v{i}out]", f"-c:v:{i}", "libx264", f"-b:v:{i}", v_rate,
+            f"-maxrate:v:{i}", v_rate, f"-bufsize:v:{i}", v_rate,
+        ]
+        if has_audio:
+            cmd += ["-map", "a:0", f"-c:a:{i}", "aac", f"-b:a:{i}", a_rate]
+    stream_map = [f"v:{i},a:{i}" if has_audio else f"v:{i}" for i in range(n)]
+    cmd += [
+        "-preset", "veryfast", "-sc_threshold", "0",
+        "-force_key_frames", f"expr:gte(t,n_forced*{HLS_SEGMENT_SECONDS})",
+        "-f", "hls", "-hls_time", str(HLS_SEGMENT_SECONDS), "-hls_playlist_type", "vod",
+        "-hls_segment_filename", os.path.join(out_dir, "v%v_%04d.ts"),
+        "-master_pl_name", "master.m3u8",
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(out_dir, "v%v.m3u8"),
+    ]
+    return cmd
+
+
+def _poster_command(src: str, dest: str, offset=1) -> list:
+    return [FFMPEG_BINARY, "-y", "-ss", str(offset), "-i", src, "-frames:v", "1", "-q:v", "3", dest]
+
+
+def _make_poster(src: str, dest: str):
+    """Poster frame from 1s in, or from the first frame for clips shorter than that."""
+    if os.path.exists(dest):
+        os.remove(dest)
+    # Seeking past the end writes no frame (with or without an error, depending on the ffmpeg version)
+    subprocess.run(_poster_command(src, dest), capture_output=True, timeout=120)
+    if not os.path.exists(dest) or not os.path.getsize(dest):
+        subprocess.run(_poster_command(src, dest, offset=0), capture_output=True, check=True, timeout=120)
+
+
+# ----- Job -----
+def transcode_video(video_id) -> bool:
+    """
+    Build the HLS ladder and poster frame for one video and record the outcome on the row.
+    Returns False if another worker already claimed the video.
+    """
+    claimed = Videos.objects.filter(id=video_id).exclude(hls_status="processing").update(
+        hls_status="processing", hls_error=None
+    )
+    if not claimed:
+        return False
+    out_dir = _output_dir(video_id)
+    with _slots:
+        try:
+            src = Videos.objects.get(id=video_id).video.path
+            shutil.rmtree(out_dir, ignore_errors=True)
+            height, has_audio = _probe(src)
+            ladder = _ladder_for(height)
+            os.makedirs(out_dir, exist_ok=True)
+            subprocess.run(_hls_command(src, out_dir, ladder, has_audio), capture_output=True, check=True,
+                           timeout=TRANSCODE_TIMEOUT)
+            _make_poster(src, os.path.join(out_dir, "poster.jpg"))
+        except subprocess.CalledProcessError as e:
+            _mark_failed(video_id, e.stderr.decode("utf-8", "replace")[-2000:])
+            return True
+        except (subprocess.SubprocessError, OSError, ValueError) as e:
+            _mark_failed(video_id, str(e))
+            return True
+
+    rel_dir = os.path.join(HLS_OUTPUT_DIR, str(video_id))
+    Videos.objects.filter(id=video_id).update(
+        hls_status="ready",
+        hls_playlist=os.path.join(rel_dir, "master.m3u8"),
+        poster=os.path.join(rel_dir, "poster.jpg"),
+        transcoded_on=timezone.now(),
+    )
+    # Bulk update() skips post_save, so flag the exported homepage directly
+    mark_stale({"home"})
+    return True
+
+
+def _mark_failed(video_id, error: str):
+    Videos.objects.filter(id=video_id).update(hls_status="failed", hls_error=error)
+
+
+def enqueue_transcode(video_id):
+    """
+    Start transcoding in a background thread once the upload is committed,
+    so the admin request returns straight away. `manage.py transcode_videos`
+    picks up anything left pending (e.g. after a restart).
+    """
+    def run():
+        try:
+            transcode_video(video_id)
+        finally:
+            connection.close()
+
+    transaction.on_commit(lambda: threading.Thread(target=run, daemon=True).start())
+
+
+def reset_renditions(video) -> bool:
+    """
+    Drop generated renditions, e.g. when the source file is replaced or deleted. Returns False,
+    touching nothing, while a transcode is running: its output directory is still being written.
+    """
+    # Check and reset in one UPDATE, like transcode_video's claim
+    reset = Videos.objects.filter(id=video.id).exclude(hls_status="processing").update(
+        hls_status="pending", hls_playlist=None, poster=None, hls_error=None, transcoded_on=None
+    )
+    if not reset:
+        return False
+    shutil.rmtree(_output_dir(video.id), ignore_errors=True)
+    video.hls_status = "pending"
+    video.hls_playlist = None
+    video.poster = None
+    video.hls_error = None
+    video.transcoded_on = None
+    return True
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views_currency import set_currency
+from .views_currency import fx_rate_history, fx_rate_on, set_currency
 from .views import *
 
 
@@ -17,6 +17,9 @@ urlpatterns = [
     path('events/<str:slug>', events_single, name='events_single'),
     path('disclaimer', disclaimer, name='disclaimer'),
     path("set-currency/", set_currency, name="set_currency"),
+    path("fx/rate/", fx_rate_on, name="fx_rate_on"),
+    path("fx/history/", fx_rate_history, name="fx_rate_history"),
+    path('csrf-token', csrf_token, name='csrf_token'),
 
 
     path('search', search_property),
@@ -32,8 +35,10 @@ urlpatterns = [
 
     path('add-property', add_property),
     path('view-properties', view_properties),
+    path('view-properties/data', properties_table),
     path('edit-property', edit_property),
     path('delete-property', delete_property),
+    path('export-catalog', export_catalog),
     path('check-property-exist', check_property_exist),
     path('edit-property/<int:pk>', edit_property_details),
 
@@ -82,10 +87,14 @@ urlpatterns = [
 
     path('send-email', send_email),
     path('show-form-submissions', show_form_submissions),
+    path('export-submissions', export_submissions),
+    path('http-client-stats', http_client_stats, name='http_client_stats'),
+    path('rate-limit-stats', rate_limit_stats, name='rate_limit_stats'),
     path('block-email', block_email),
     path('block-ip', block_ip),
     path('block-words', block_words),
     path('block-name', block_name),
+    path('block-bulk', block_bulk),
 
     path('sitemap.xml', sitemap_xml, name='sitemap'),
     path('sitemap/', html_sitemap, name='html_sitemap'),
@@ -6,16 +6,25 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
-from django.core.mail import EmailMessage
-from django.db import IntegrityError
-from django.db.models import Count, Q
-from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect, get_object_or_404
+from django.utils import timezone
 from django.utils.translation import gettext as _
+from django.views.decorators.http import require_POST
 from honeypot.decorators import check_honeypot
 
 from .utils import *
+from . import (
+    archive, catalog, catalog_export, dedup, fx, http_client, lead_stats, outbox, property_table, spam, submissions,
+)
+from .blocklist import BLOCKLISTS, bulk_block, read_entries
+from .money import parse_minor
+from .ratelimit import rate_limit, throttled_counts
+from .transcode import enqueue_transcode, reset_renditions
 
 base_dir = settings.MEDIA_ROOT
 LANG_COOKIE = getattr(settings, "LANGUAGE_COOKIE_NAME", "django_language")
@@ -72,15 +81,34 @@ def get_search_filters():
     }
 
 
+def apply_price_filters(projects, request):
+    """Range-filter and sort on the precomputed price column of the visitor's currency"""
+    code = fx.available_code(session_currency(request))
+    column = fx.PRICE_COLUMNS[code]
+    min_price = parse_minor(request.GET.get('min_price') or None, code)
+    max_price = parse_minor(request.GET.get('max_price') or None, code)
+    if min_price is not None:
+        projects = projects.filter(**{column + '__gte': min_price})
+    if max_price is not None:
+        projects = projects.filter(**{column + '__lte': max_price})
+    sort = request.GET.get('sort')
+    if sort == 'price_asc':
+        projects = projects.order_by(F(column).asc(nulls_last=True), '-id')
+    elif sort == 'price_desc':
+        projects = projects.order_by(F(column).desc(nulls_last=True), '-id')
+    return projects
+
+
 def prepare_project_list(projects, request):
     """Prepare project list with images and pricing - optimized with prefetch"""
     project_list = []
     # Prefetch related images to avoid N+1 queries
     projects = projects.prefetch_related('propertyimages_set')
+    code = fx.available_code(session_currency(request))
 
     for p in projects:
         img = p.propertyimages_set.all()
-        price_info = display_price_for_project(p, request)
+        price_info = fx.column_price(p, code)
         project_list.append({
             'project': p,
             'img': img,
@@ -97,14 +125,12 @@ def get_common_context(request):
         'website': get_website_content(),
         'num1': get_random(),
         'num2': get_random(),
-        'chosen_currency': request.session.get("currency", BASE),
+        'chosen_currency': session_currency(request),
         'looking_for': get_looking_for(),
     }
 
 
 def Index(request):
-    chosen = request.session.get("currency", BASE)
-
     # Optimize with select_related and prefetch_related
     featured_proper = ProjectDetails.objects.filter(
         is_featured=True
@@ -241,7 +267,6 @@ def disclaimer(request):
 
 
 def events_single(request, slug):
-    chosen = request.session.get("currency", BASE)
     events = get_object_or_404(EventsAndCampaigns, slug=slug)
 
     # Optimize featured properties query
@@ -270,7 +295,7 @@ def properties(request):
         'city', 'builder'
     ).prefetch_related('propertyimages_set').order_by('-id')
 
-    projects = prepare_project_list(all_proper, request)
+    projects = prepare_project_list(apply_price_filters(all_proper, request), request)
     search_filters = get_search_filters()
     message = get_whatsapp_message()
     meta_data = get_meta_data(_("Properties"))
@@ -296,7 +321,7 @@ def properties_city(request, slug):
         city__slug=slug
     ).select_related('city', 'builder').prefetch_related('propertyimages_set')
 
-    projects = prepare_project_list(all_proper, request)
+    projects = prepare_project_list(apply_price_filters(all_proper, request), request)
     search_filters = get_search_filters()
     message = get_whatsapp_message()
 
@@ -316,7 +341,7 @@ def properties_city(request, slug):
 
 
 def single_property(request, pro_name):
-    chosen = request.session.get("currency", BASE)
+    chosen = fx.available_code(session_currency(request))
 
     # Optimize with select_related and prefetch_related
     project = get_object_or_404(
@@ -344,8 +369,8 @@ def single_property(request, pro_name):
             "[[builder]]", project.builder.name
         ).replace(" ", "%20").replace(",", "%2C").replace(".", "%2E")
 
-    # Convert the main project price
-    price_info = display_price_for_project(project, request)
+    # Prices come from the precomputed per-currency columns
+    price_info = fx.column_price(project, chosen)
 
     broker_whatsapp_href = None
     if project.broker and project.broker.whatsapp_number:
@@ -356,16 +381,9 @@ def single_property(request, pro_name):
     # Convert pricing
     pricing_converted = []
     for pr in pricing:
-        try:
-            price_aed = Decimal(str(pr.price))
-            from .currency import convert_amount, format_money
-            cv = convert_amount(price_aed, request)
-            pr_display = format_money(cv, request)
-        except Exception:
-            pr_display = None
         pricing_converted.append({
             "obj": pr,
-            "price_display": pr_display,
+            "price_display": fx.column_price(pr, chosen)['price_display'],
             "currency_code": chosen,
         })
 
@@ -389,6 +407,7 @@ def single_property(request, pro_name):
     return render(request, 'single.html', data)
 
 
+@rate_limit('search')
 def search_property(request):
     # Build filters dynamically
     _filters = {}
@@ -413,7 +432,7 @@ def search_property(request):
         **_filters
     ).select_related('city', 'builder').prefetch_related('propertyimages_set').order_by('-id')
 
-    projects = prepare_project_list(all_proper, request)
+    projects = prepare_project_list(apply_price_filters(all_proper, request), request)
     search_filters = get_search_filters()
     message = get_whatsapp_message()
 
@@ -428,15 +447,9 @@ def search_property(request):
     return render(request, 'listing.html', data)
 
 
+@rate_limit('send_email', keys=('ip', 'email'))
 @check_honeypot(field_name='check_field')
 def send_email(request):
-    url = 'https://connect.leadrat.com/api/v1/integration/Website'
-    api_key = "NDdmMjA4NGItNWQzZi00ZmJhLTk5MGUtZTY1ZTQwNDc0OGU4"
-    headers = {
-        "API-Key": api_key,
-        "Content-Type": "application/json"
-    }
-
     name = request.POST['name']
     email = request.POST['email']
     phone = request.POST['phone']
@@ -447,92 +460,101 @@ def send_email(request):
     property_id = request.POST.get('property_id')
     subject = request.POST.get('subject')
     ip = get_ip(request)
-    ContactForm.objects.create(
-        name=name, email=email, phone=phone, message=message, subject=subject, ip=ip
-    )
-    email_check = check_email(email)
-    ip_check = check_ip(ip)
-    name_check = check_name(name)
-    word_check = [check_word(word) for word in message.split(' ')]
-    submitted_date = datetime.now().strftime('%Y-%m-%d')
-    submitted_time = datetime.now().strftime('%H:%M:%S')
     project = None
     if property_id:
         project = get_object_or_404(ProjectDetails, id=property_id)
 
-    if ip_check and email_check and name_check and False not in word_check:
-        if num1 + num2 == answer:
-            try:
-                if subject:
-                    subject = str(subject)
-                else:
-                    subject = "New Response from Website by " + str(name)
-                # API call payload (based on available fields)
-                payload_dict = {
-                    "name": name,
-                    "email": email,
-                    "mobile": phone,
-                    "notes": message,
-                    "source": "Website",
-                    "submittedDate": submitted_date,
-                    "submittedTime": submitted_time,
-                }
-
-                if project:
-                    payload_dict.update({
-                        "leadStatus": f"Lead for {project.title}",
-                        "propertyType": f"{project.property_type}, ({project.property_type_2})",
-                        "project": project.title,
-                        "property": project.title,
-                    })
-
-                payload = [payload_dict]
-
-                # Make the API call
-                response = requests.post(url, headers=headers, json=payload)
-
-                email_template = "<table border='1'><tr><th>Name</th><td>" + str(
-                    name) + "</td></tr><tr><th>Email</th><td>" + str(
-                    email) + "</td></tr><tr><th>Mobile No.</th><td>" + str(
-                    phone) + "</td></tr><tr><th>Message</th><td>" + str(message) + "</td></tr></table>"
-                to = ['sales@primeplanetsproperties.com']
-                email_msg = EmailMessage(subject,
-                                         email_template, 'info@planetsproperties.com',
-                                         to,
-                                         reply_to=[email])
-                email_msg.content_subtype = 'html'
-                email_msg.send(fail_silently=False)
-
-                if response.status_code == 200:
-                    messages.success(request, 'Message sent successfully and lead shared!')
-                else:
-                    messages.error(request, f"Failed to share lead: {response.text}")
-            except Exception as e:
-                messages.error(request,
-                               f"Error occurred: {str(e)}. Please Report/Contact sales@planetsproperties.com for more details.'")
+    email_check = check_email(email)
+    ip_check = check_ip(ip)
+    name_check = check_name(name)
+    blocked_words = find_blocked_words(message)
+    blocklisted = not (ip_check and email_check and name_check) or bool(blocked_words)
+    # Scored before anything is queued, so obvious spam never reaches Leadrat or SMTP
+    spam_score = spam.score(name, email, message, ip)
+    passed = not blocklisted and (spam_score is None or spam_score < spam.REJECT_THRESHOLD)
+    accepted = passed and num1 + num2 == answer
+    digest = dedup.submission_hash(email, phone, property_id, message)
+
+    # CRM push and notification email are queued with the submission and delivered by run_outbox
+    with transaction.atomic():
+        # A repeat inside the dedup window is recorded but not dispatched again. The window is
+        # claimed in this transaction, so a save that fails frees it for the visitor's retry.
+        duplicate = accepted and not dedup.first_seen(digest)
+        dispatch = accepted and not duplicate
+        if blocklisted:
+            outcome = "blocked"
+        elif not passed:
+            outcome = "spam"
+        elif not accepted:
+            outcome = "wrong_captcha"
         else:
-            messages.error(request, 'Wrong Answer!')
-    else:
+            outcome = "duplicate" if duplicate else "dispatched"
+        contact = ContactForm.objects.create(
+            name=name, email=email, phone=phone, message=message, subject=subject, ip=ip,
+            country=lookup_country(ip), project=project, source=lead_stats.lead_source(request),
+            crm_status="queued" if dispatch else None, dedup_hash=digest, is_duplicate=duplicate,
+            spam_score=None if spam_score is None else round(spam_score, 4),
+        )
+        lead_stats.record_contact(contact, outcome)
+        if dispatch:
+            if subject:
+                subject = str(subject)
+            else:
+                subject = "New Response from Website by " + str(name)
+            outbox.enqueue("leadrat", outbox.lead_payload(contact, project), contact)
+            outbox.enqueue("email", outbox.notification_payload(contact, subject), contact)
+
+    if not passed:
         messages.error(request, 'Validation failed. Please check your input.')
+    elif num1 + num2 != answer:
+        messages.error(request, 'Wrong Answer!')
+    else:
+        messages.success(request, 'Message sent successfully!')
 
     return redirect(request.META.get('HTTP_REFERER'))
 
 
 @login_required
 def show_form_submissions(request):
-    forms = ContactForm.objects.all().order_by('-id')[:150]
-    data = {'forms': forms, **get_common_context(request)}
+    filters = submissions.clean_filters(request.GET)
+    month = request.GET.get('archive')
+    after, before = request.GET.get('after'), request.GET.get('before')
+    if month:
+        # Archived months are read from their file on demand
+        result = archive.page(month, filters, after=after, before=before)
+    else:
+        result = submissions.page(submissions.filter_submissions(filters), after=after, before=before)
+    query = request.GET.copy()
+    query.pop('after', None)
+    query.pop('before', None)
+    data = {
+        'title': 'Submissions', 'forms': result['rows'], 'filters': filters,
+        'next': result['next'], 'previous': result['previous'], 'query': query.urlencode(),
+        'archive_months': archive.months(), 'archive_month': month,
+    }
     return render(request, 'check_submissions.html', data)
 
 
 @login_required
+def export_submissions(request):
+    """Stream the filtered submissions as CSV or JSONL (?format=csv|jsonl plus the dashboard filters)."""
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in submissions.EXPORT_FORMATS:
+        return HttpResponse('format must be csv or jsonl', status=400)
+    filters = submissions.clean_filters(request.GET)
+    response = StreamingHttpResponse(
+        submissions.export_lines(submissions.filter_submissions(filters), fmt),
+        content_type=f'{submissions.EXPORT_FORMATS[fmt]}; charset=utf-8',
+    )
+    stamp = timezone.localdate().isoformat()
+    response['Content-Disposition'] = f'attachment; filename="submissions-{stamp}.{fmt}"'
+    return response
+
+
+@login_required
+@require_POST
 def block_email(request):
-    if request.method == 'POST':
-        email = request.POST['email']
-        create_blocked_email(email)
-        return True
-    else:
-        return False
+    return JsonResponse(bulk_block('email', [request.POST.get('email', '')]))
 
 
 @login_required
@@ -570,34 +592,39 @@ def meta_details(request):
 
 
 @login_required
+@require_POST
 def block_ip(request):
-    if request.method == 'POST':
-        ip = request.POST['ip']
-        create_blocked_ip(ip)
-        return True
-    else:
-        return False
+    return JsonResponse(bulk_block('ip', [request.POST.get('ip', '')]))
 
 
 @login_required
+@require_POST
 def block_words(request):
-    if request.method == 'POST':
-        words = request.POST['message']
-        for i in words.split(' '):
-            create_blocked_word(i)
-        return True
-    else:
-        return False
+    return JsonResponse(bulk_block('word', request.POST.get('message', '').split()))
 
 
 @login_required
+@require_POST
 def block_name(request):
-    if request.method == 'POST':
-        name = request.POST['name']
-        create_blocked_name(name)
-        return True
+    return JsonResponse(bulk_block('name', [request.POST.get('name', '')]))
+
+
+@login_required
+@require_POST
+def block_bulk(request):
+    """
+    Add a list to one blocklist: POST `kind` (email/ip/word/name) and either an uploaded
+    `file` (CSV or one entry per line) or `entries` text. Returns inserted/skipped/invalid counts.
+    """
+    kind = request.POST.get('kind')
+    if kind not in BLOCKLISTS:
+        return JsonResponse({'error': f"kind must be one of {', '.join(BLOCKLISTS)}"}, status=400)
+    upload = request.FILES.get('file')
+    if upload:
+        text = upload.read().decode('utf-8-sig', errors='replace')
     else:
-        return False
+        text = request.POST.get('entries', '')
+    return JsonResponse(bulk_block(kind, read_entries(text, kind)))
 
 
 def login_function(request):
@@ -666,7 +693,7 @@ def change_password(request):
 def IndexCheck(request):
     amenities = Amenities.objects.all().count()
     properties = ProjectDetails.objects.all().count()
-    data = {'amenities': amenities, 'properties': properties}
+    data = {'amenities': amenities, 'properties': properties, 'lead_trends': lead_stats.trends()}
     return render(request, 'admin_folder/dashboard.html', data)
 
 
@@ -856,13 +883,14 @@ def manage_videos(request):
         if not title or not thumbnail or not video:
             messages.error(request, 'Title, thumbnail, and video file are required.')
             return redirect('/manage-videos')
-        Videos.objects.create(
+        v = Videos.objects.create(
             title=title,
             thumbnail=thumbnail,
             video=video,
             is_active=is_active,
         )
-        messages.success(request, 'Video added successfully.')
+        enqueue_transcode(v.id)
+        messages.success(request, 'Video added successfully. Streaming versions are being prepared.')
         return redirect('/manage-videos')
     videos = Videos.objects.all()
     return render(request, 'admin_folder/manage_videos.html', {'videos': videos})
@@ -882,6 +910,9 @@ def edit_video(request):
         messages.error(request, 'Invalid video data.')
         return redirect('/manage-videos')
     v = Videos.objects.get(id=pk)
+    if video and not reset_renditions(v):
+        messages.error(request, 'This video is still being transcoded. Please replace it once that has finished.')
+        return redirect('/manage-videos')
     v.title = title
     v.is_active = is_active
     if thumbnail:
@@ -889,6 +920,8 @@ def edit_video(request):
     if video:
         v.video = video
     v.save()
+    if video:
+        enqueue_transcode(v.id)
     messages.success(request, 'Video saved successfully.')
     return redirect('/manage-videos')
 
@@ -897,7 +930,11 @@ def edit_video(request):
 def delete_video(request):
     if request.method == 'POST':
         pk = request.POST['id']
-        Videos.objects.get(id=pk).delete()
+        v = Videos.objects.get(id=pk)
+        if not reset_renditions(v):
+            messages.error(request, 'This video is still being transcoded. Please delete it once that has finished.')
+            return redirect('/manage-videos')
+        v.delete()
         messages.success(request, 'Video deleted successfully.')
         return redirect('/manage-videos')
     messages.info(request, 'Invalid Request!')
@@ -1096,6 +1133,78 @@ def delete_associate(request):
         return redirect('/association')
 
 
+# ----- Property form: child rows -----
+def _numbered_rows(request, count_field, fields):
+    """Rows of a repeated form block: {key: POST[f'{prefix}{i}']} for i in 1..POST[count_field]."""
+    rows = []
+    for i in range(1, int(request.POST.get(count_field) or 0) + 1):
+        rows.append({key: request.POST.get(prefix + str(i)) for key, prefix in fields.items()})
+    return rows
+
+
+def _pricing_rows(request):
+    rows = _numbered_rows(request, 'num_of_pricing', {
+        'property': 'property_', 'builtup': 'builtup_area_', 'carpet': 'carpet_area_', 'price': 'basic_pricing_',
+    })
+    return [row for row in rows if row['property']]
+
+
+def _advantage_rows(request):
+    rows = _numbered_rows(request, 'num_of_locations', {'title': 'title_', 'distance': 'distance_'})
+    return [row for row in rows if row['title']]
+
+
+def _floor_rows(request):
+    rows = _numbered_rows(request, 'num_of_floors', {
+        'id': 'floorid_', 'name': 'floor_', 'tag1': 'tag_1_', 'tag2': 'tag_2_', 'tag3': 'tag_3_', 'tag4': 'tag_4_',
+        'description': 'floor_dec_',
+    })
+    for i, row in enumerate(rows, start=1):
+        # Existing floors post 'floor_<n>_<id>'
+        row['id'] = int(row['id'].split('_')[-1]) if row['id'] else None
+        row['img'] = request.FILES.get('floor_img_' + str(i))
+        row['pdf'] = request.FILES.get('floor_pdf_' + str(i))
+    return rows
+
+
+def _amenity_ids(request):
+    # isascii: str.isdigit() also accepts digits such as '²' that int() rejects
+    return [
+        int(key[5:]) for key in request.POST
+        if key.startswith('check') and key[5:].isascii() and key[5:].isdigit() and request.POST.get(key)
+    ]
+
+
+def _move_buffer_images(request):
+    """
+    Claim the images uploaded for this form and return the media paths they will have in properties/.
+    Call inside the transaction that saves the property: the BufferImages rows are deleted with it,
+    and the files are only moved once it commits, so a rollback leaves both where they were.
+    """
+    buffer_id = request.POST.get('buffer_id')
+    buffer_images = BufferImages.objects.filter(buffer_id=buffer_id)
+    paths = []
+    moves = []
+    counter = 0
+    for i in buffer_images:
+        counter += 1
+        extension = str(i.img).split('.')[-1]
+        new_name = os.path.join(base_dir, str('properties/' + str(buffer_id) + str(counter) + '.' + extension))
+        moves.append((os.path.join(base_dir, str(i.img)), new_name))
+        if new_name.split('media/')[-1] == new_name:
+            paths.append(new_name.split('media\\')[-1])
+        else:
+            paths.append(new_name.split('media/')[-1])
+    buffer_images.delete()
+
+    def move_files():
+        for source, dest in moves:
+            shutil.move(source, dest)
+
+    transaction.on_commit(move_files)
+    return paths
+
+
 @login_required
 def add_property(request):
     if request.method == 'POST':
@@ -1151,79 +1260,24 @@ def add_property(request):
         brochure = request.FILES.get('brochure')
 
         is_featured = True if request.POST.get('is_featured') == 'Yes' else False
-        project = ProjectDetails.objects.create(
-            title=title, description=description, video_link=video_link, map_link=map_link, ownership_type=ownership_type,
-            project_area=project_area, project_type=project_type, project_units=project_units,
-            project_buildup=project_buildup, project_price=project_price,
-            project_price_text=project_price_text, project_status=project_status,
-            contact_email=email, contact_phone=phone, contact_whatsapp=whatsapp, is_featured=is_featured,
-            city=city, builder=builder, broker=broker, master_plan=master_plan, location=location, rera_no=rera_no,
-            dld_permit_number=dld_permit_number, possession=possession, property_type=property_type, master_plan_pdf=master_plan_pdf,
-            brochure=brochure, project_status_1=project_status_1, property_id=property_id,
-            meta_keywords=meta_keywords, meta_description=meta_description, meta_title=meta_title,
-            property_type_2=property_type_2, dld_qr_code=dld_qr_code
-        )
-
-        num_of_pricing = request.POST.get('num_of_pricing')
-        for i in range(1, int(num_of_pricing) + 1):
-            propertyy = request.POST.get('property_' + str(i))
-            builtup = request.POST.get('builtup_area_' + str(i))
-            carpet = request.POST.get('carpet_area_' + str(i))
-            price = request.POST.get('basic_pricing_' + str(i))
-            if propertyy:
-                PropertyPricing.objects.create(
-                    project=project, property=propertyy, builtup=builtup, carpet=carpet, price=price
-                )
-
-        num_of_locations = request.POST.get('num_of_locations')
-        for i in range(1, int(num_of_locations) + 1):
-            location_title = request.POST.get('title_' + str(i))
-            distance = request.POST.get('distance_' + str(i))
-            if location_title:
-                PropertyAdvantages.objects.create(
-                    project=project, title=location_title, distance=distance
-                )
-
-        num_of_floors = request.POST.get('num_of_floors')
-        for i in range(1, int(num_of_floors) + 1):
-            name = request.POST.get('floor_' + str(i))
-            tag1 = request.POST.get('tag_1_' + str(i))
-            tag2 = request.POST.get('tag_2_' + str(i))
-            tag3 = request.POST.get('tag_3_' + str(i))
-            tag4 = request.POST.get('tag_4_' + str(i))
-            flor_img = request.FILES.get('floor_img_' + str(i))
-            flor_pdf = request.FILES.get('floor_pdf_' + str(i))
-            des = request.POST.get('floor_dec_' + str(i))
-            if name:
-                PropertyFloors.objects.create(
-                    project=project, name=name, tag1=tag1, tag2=tag2, tag3=tag3, tag4=tag4,
-                    img=flor_img, description=des, pdf=flor_pdf
-                )
-
-        for i in Amenities.objects.all():
-            checkbox = bool(request.POST.get('check' + str(i.id)))
-            if checkbox:
-                PropertyAmenities.objects.create(
-                    project=project, amenity=i
-                )
-
-        buffer_id = request.POST.get('buffer_id')
-        buffer_images = BufferImages.objects.filter(buffer_id=buffer_id)
-        counter = 0
-        for i in buffer_images:
-            counter += 1
-            extension = str(i.img).split('.')[-1]
-            new_name = os.path.join(base_dir, str('properties/' + str(buffer_id) + str(counter) + '.' + extension))
-            shutil.move(os.path.join(base_dir, str(i.img)), new_name)
-            if new_name.split('media/')[-1] == new_name:
-                PropertyImages.objects.create(
-                    project=project, img=new_name.split('media\\')[-1]
-                )
-            else:
-                PropertyImages.objects.create(
-                    project=project, img=new_name.split('media/')[-1]
-                )
-        buffer_images.delete()
+        # One transaction: the property and all its child rows commit together
+        with transaction.atomic():
+            project = ProjectDetails.objects.create(
+                title=title, description=description, video_link=video_link, map_link=map_link, ownership_type=ownership_type,
+                project_area=project_area, project_type=project_type, project_units=project_units,
+                project_buildup=project_buildup, project_price=project_price,
+                project_price_text=project_price_text, project_status=project_status,
+                contact_email=email, contact_phone=phone, contact_whatsapp=whatsapp, is_featured=is_featured,
+                city=city, builder=builder, broker=broker, master_plan=master_plan, location=location, rera_no=rera_no,
+                dld_permit_number=dld_permit_number, possession=possession, property_type=property_type, master_plan_pdf=master_plan_pdf,
+                brochure=brochure, project_status_1=project_status_1, property_id=property_id,
+                meta_keywords=meta_keywords, meta_description=meta_description, meta_title=meta_title,
+                property_type_2=property_type_2, dld_qr_code=dld_qr_code
+            )
+            catalog.save_children(
+                project, pricing=_pricing_rows(request), advantages=_advantage_rows(request),
+                floors=_floor_rows(request), amenity_ids=_amenity_ids(request), images=_move_buffer_images(request),
+            )
         messages.info(request, 'Property Added Successfully.')
         return redirect('/view-properties')
     else:
@@ -1242,9 +1296,25 @@ def add_property(request):
 
 @login_required
 def view_properties(request):
-    projects = ProjectDetails.objects.all()
-    data = {'projects': projects}
-    return render(request, 'admin_folder/view_properties.html', data)
+    # Rows are loaded page by page from properties_table
+    return render(request, 'admin_folder/view_properties.html')
+
+
+@login_required
+def properties_table(request):
+    return JsonResponse(property_table.query(request.GET))
+
+
+@login_required
+def export_catalog(request):
+    """Stream every property with its child rows as JSON Lines or a zip of CSVs (?format=jsonl|zip)."""
+    fmt = request.GET.get('format', 'jsonl')
+    if fmt not in catalog_export.EXPORT_FORMATS:
+        return HttpResponse('format must be jsonl or zip', status=400)
+    response = StreamingHttpResponse(catalog_export.export_chunks(fmt), content_type=catalog_export.EXPORT_FORMATS[fmt])
+    stamp = timezone.localdate().isoformat()
+    response['Content-Disposition'] = f'attachment; filename="catalog-{stamp}.{fmt}"'
+    return response
 
 
 @login_required
@@ -1415,94 +1485,12 @@ def edit_property_details(request, pk):
             project.brochure = brochure
         if dld_qr_code:
             project.dld_qr_code = dld_qr_code
-        project.save()
-
-        PropertyPricing.objects.filter(project=project).delete()
-        num_of_pricing = request.POST.get('num_of_pricing')
-        for i in range(1, int(num_of_pricing) + 1):
-            propertyy = request.POST.get('property_' + str(i))
-            builtup = request.POST.get('builtup_area_' + str(i))
-            carpet = request.POST.get('carpet_area_' + str(i))
-            price = request.POST.get('basic_pricing_' + str(i))
-            if propertyy:
-                PropertyPricing.objects.create(
-                    project=project, property=propertyy, builtup=builtup, carpet=carpet, price=price
-                )
-
-        PropertyAdvantages.objects.filter(project=project).delete()
-        num_of_locations = request.POST.get('num_of_locations')
-        for i in range(1, int(num_of_locations) + 1):
-            location_title = request.POST.get('title_' + str(i))
-            distance = request.POST.get('distance_' + str(i))
-            if location_title:
-                PropertyAdvantages.objects.create(
-                    project=project, title=location_title, distance=distance
-                )
-
-        num_of_floors = request.POST.get('num_of_floors')
-        floor_delete_list = []
-        for i in range(1, int(num_of_floors) + 1):
-            floor = request.POST.get('floorid_' + str(i))
-            if floor:
-                floor = floor.split('_')[-1]
-                floor_delete_list.append(floor)
-            else:
-                floor = False
-            name = request.POST.get('floor_' + str(i))
-            tag1 = request.POST.get('tag_1_' + str(i))
-            tag2 = request.POST.get('tag_2_' + str(i))
-            tag3 = request.POST.get('tag_3_' + str(i))
-            tag4 = request.POST.get('tag_4_' + str(i))
-            des = request.POST.get('floor_dec_' + str(i))
-            flor_img = request.FILES.get('floor_img_' + str(i))
-            flor_pdf = request.FILES.get('floor_pdf_' + str(i))
-            if floor:
-                f = PropertyFloors.objects.get(id=floor)
-                f.name = name
-                f.tag1 = tag1
-                f.tag2 = tag2
-                f.tag3 = tag3
-                f.tag4 = tag4
-                if flor_img:
-                    f.img = flor_img
-                if flor_pdf:
-                    f.pdf = flor_pdf
-                f.description = des
-                f.save()
-            else:
-                if name:
-                    property_floor = PropertyFloors.objects.create(
-                        project=project, name=name, tag1=tag1, tag2=tag2, tag3=tag3, tag4=tag4,
-                        img=flor_img, description=des
-                    )
-                    floor_delete_list.append(property_floor.id)
-        PropertyFloors.objects.filter(project=project).exclude(id__in=floor_delete_list).delete()
-
-        PropertyAmenities.objects.filter(project=project).delete()
-        for i in Amenities.objects.all():
-            checkbox = bool(request.POST.get('check' + str(i.id)))
-            if checkbox:
-                PropertyAmenities.objects.create(
-                    project=project, amenity=i
-                )
-
-        buffer_id = request.POST.get('buffer_id')
-        buffer_images = BufferImages.objects.filter(buffer_id=buffer_id)
-        counter = 0
-        for i in buffer_images:
-            counter += 1
-            extension = str(i.img).split('.')[-1]
-            new_name = os.path.join(base_dir, str('properties/' + str(buffer_id) + str(counter) + '.' + extension))
-            shutil.move(os.path.join(base_dir, str(i.img)), new_name)
-            if new_name.split('media/')[-1] == new_name:
-                PropertyImages.objects.create(
-                    project=project, img=new_name.split('media\\')[-1]
-                )
-            else:
-                PropertyImages.objects.create(
-                    project=project, img=new_name.split('media/')[-1]
-                )
-        buffer_images.delete()
+        with transaction.atomic():
+            project.save()
+            catalog.save_children(
+                project, pricing=_pricing_rows(request), advantages=_advantage_rows(request),
+                floors=_floor_rows(request), amenity_ids=_amenity_ids(request), images=_move_buffer_images(request),
+            )
 
         return redirect('/view-properties')
     else:
@@ -1615,6 +1603,23 @@ def error_handling(request, exception=None):
     return redirect('/')
 
 
+@login_required
+def http_client_stats(request):
+    """Outbound call counters and breaker states of the worker serving this request."""
+    return JsonResponse(http_client.stats())
+
+
+@login_required
+def rate_limit_stats(request):
+    """Requests refused with 429, per rate-limited endpoint (all workers)."""
+    return JsonResponse(throttled_counts())
+
+
+def csrf_token(request):
+    """Fresh CSRF token for forms on statically exported pages."""
+    return JsonResponse({'token': get_token(request)})
+
+
 def sitemap_xml(request):
     urls = []
 
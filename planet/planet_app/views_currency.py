@@ -1,19 +1,71 @@
+from datetime import date, timedelta
+
 from django.http import JsonResponse, HttpResponseRedirect
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
+
+from . import fx_history
+from .fx import BASE_CURRENCY, SUPPORTED_CURRENCIES, set_session_currency, sync_currency_cookie
+from .money import Money
+
 
 @require_POST
 def set_currency(request):
     code = (request.POST.get("currency") or "").upper()
-    SUPPORTED_CURRENCIES = {"AED", "USD", "EUR", "INR"}
-    if code not in SUPPORTED_CURRENCIES:
-        if request.is_ajax():
+    is_ajax = request.headers.get("x-requested-with") == "XMLHttpRequest"
+    if not set_session_currency(request, code):
+        if is_ajax:
             return JsonResponse({"ok": False, "error": "Unsupported currency"}, status=400)
         # fallback: redirect to home
         return HttpResponseRedirect("/")
-    request.session["currency"] = code
-    request.session.modified = True
     # AJAX: return JSON, otherwise redirect
-    if request.headers.get("x-requested-with") == "XMLHttpRequest":
-        return JsonResponse({"ok": True, "currency": code})
+    if is_ajax:
+        return sync_currency_cookie(request, JsonResponse({"ok": True, "currency": code}), code)
     # Non-AJAX: Redirect to referrer or home
-    return HttpResponseRedirect(request.META.get("HTTP_REFERER", "/"))
+    return sync_currency_cookie(request, HttpResponseRedirect(request.META.get("HTTP_REFERER", "/")), code)
+
+
+# ----- Historical rates -----
+MAX_HISTORY_DAYS = 366 * 10
+
+
+def _parse_day(value, default=None):
+    if not value:
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@require_GET
+def fx_rate_on(request):
+    """Rate in effect on ?date=YYYY-MM-DD (today by default) for ?currency=USD."""
+    code = (request.GET.get("currency") or "").upper()
+    day = _parse_day(request.GET.get("date"), date.today())
+    if code not in SUPPORTED_CURRENCIES or day is None:
+        return JsonResponse({"ok": False, "error": "Expected a supported currency and an ISO date"}, status=400)
+    found = fx_history.rate_on(code, day)
+    if found is None:
+        return JsonResponse({"ok": False, "error": "No rate stored on or before that date"}, status=404)
+    as_of, rate = found
+    data = {"ok": True, "currency": code, "date": day.isoformat(), "as_of": as_of.isoformat(), "rate": str(rate)}
+    amount = Money.parse(request.GET.get("amount"), BASE_CURRENCY)
+    if amount is not None:
+        converted = fx_history.convert_on(amount, code, day)
+        data["amount"] = str(converted.to_decimal())
+        data["amount_display"] = converted.format()
+    return JsonResponse(data)
+
+
+@require_GET
+def fx_rate_history(request):
+    """Daily series for ?currency= between ?start= and ?end= (the last year by default)."""
+    code = (request.GET.get("currency") or "").upper()
+    end = _parse_day(request.GET.get("end"), date.today())
+    start = _parse_day(request.GET.get("start"), end and end - timedelta(days=365))
+    if code not in SUPPORTED_CURRENCIES or start is None or end is None or start > end:
+        return JsonResponse({"ok": False, "error": "Expected a supported currency and an ISO date range"}, status=400)
+    if (end - start).days > MAX_HISTORY_DAYS:
+        return JsonResponse({"ok": False, "error": f"Range is limited to {MAX_HISTORY_DAYS} days"}, status=400)
+    points = [[d.isoformat(), str(r)] for d, r in fx_history.rates_between(code, start, end)]
+    return JsonResponse({"ok": True, "currency": code, "start": start.isoformat(), "end": end.isoformat(), "points": points})